@@ -12,6 +12,7 @@ Características:
 - Configuração automática de perfis de launcher
 - Interface moderna com animações suaves
 - Tema dark/light alternável
+- Modo sem interface: python Installer.py --headless --launcher ... --variant ...
 
 Dependências:
 - customtkinter (pip install customtkinter)
@@ -22,18 +23,21 @@ Autor: BLMChoosen
 Data: 2025
 """
 
+import sys
+
+# ==========================================
+# MODO HEADLESS (SEM INTERFACE GRÁFICA)
+# ==========================================
+# Despachado antes de carregar Tkinter/customtkinter para rodar em servidores
+# e imagens de CI sem display (ver install_engine.py)
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    from install_engine import main
+    sys.exit(main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import time
 import threading
-import os
-import zipfile
-import tempfile
-import json
-import datetime
-import sqlite3
-import shutil
-import glob
+import importlib.util
 
 # Verifica e importa bibliotecas necessárias
 try:
@@ -42,16 +46,22 @@ except ImportError:
     messagebox.showerror("Erro", "A biblioteca 'customtkinter' não está instalada.\nExecute: pip install customtkinter")
     exit()
 
-try:
-    import requests
-except ImportError:
+# Apenas verifica a presença do 'requests' (e do restante da rede, sqlite e zip):
+# o motor de instalação só é importado no passo de instalação, para a primeira
+# janela abrir sem esperar esses módulos carregarem
+if importlib.util.find_spec("requests") is None:
     messagebox.showerror("Erro", "A biblioteca 'requests' não está instalada.\nExecute: pip install requests")
     exit()
 
+from progress import PROGRESS_FPS, ProgressBus
+
 # Configuração global do CustomTkinter
 ctk.set_appearance_mode("dark")  # Modes: "System", "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue", "green", "dark-blue"
 
+# Exibe o tempo de cada etapa na tela final da instalação
+SHOW_INSTALL_TIMINGS = True
+
 class ModpackWizard(ctk.CTk):
     """
     Classe principal do instalador wizard do Modpack Minecraft Guerra 2.
@@ -78,48 +88,6 @@ class ModpackWizard(ctk.CTk):
         except:
             pass
 
-        # Centraliza a janela na tela
-        self.center_window()
-        
-        # Ícone da janela (se disponível)
-        try:
-            self.iconbitmap("icon.ico")
-        except:
-            pass
-
-        # ==========================================
-        # CONFIGURAÇÃO DE URLS DE DOWNLOAD
-        # ==========================================
-        # Dicionário contendo URLs de download para cada combinação de launcher e versão
-        # Estrutura: {launcher: {versão: url}}
-        self.DOWNLOAD_URLS = {
-            "tlauncher": {
-                "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
-                "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
-                "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
-            },
-            "sklauncher": {
-                "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
-                "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
-                "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
-            },
-            "modrinth": {
-                "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
-                "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
-                "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
-            },
-            "curseforge": {
-                "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
-                "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
-                "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
-            },
-            "manual": {
-                "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
-                "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
-                "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
-            }
-        }
-
         # ==========================================
         # VARIÁVEIS DE CONTROLE DO WIZARD
         # ==========================================
@@ -130,6 +98,7 @@ class ModpackWizard(ctk.CTk):
         self.var_launcher = tk.StringVar(value="")       # Launcher selecionado
         self.var_version = tk.StringVar(value="full")    # Versão do modpack (full/intermediate/lightweight)
         self.var_install_path = tk.StringVar(value="")   # Caminho de instalação manual
+        self.install_engine = None                        # Motor da última instalação
         
         # Animação
         self.animation_running = False
@@ -335,6 +304,9 @@ class ModpackWizard(ctk.CTk):
         if self.current_step == 4:
             self.current_step += 1
             self.show_step(5)
+            # A thread de instalação só publica no canal; a UI consulta a 20 Hz
+            self.progress_bus = ProgressBus()
+            self.poll_progress()
             threading.Thread(target=self.run_installation_logic, daemon=True).start()
             return
 
@@ -734,450 +706,79 @@ class ModpackWizard(ctk.CTk):
         self.lbl_percentage.pack()
 
     # ==========================================
-    # GERENCIAMENTO DE DIRETÓRIOS E CONFIGURAÇÃO
+    # LÓGICA PRINCIPAL DE INSTALAÇÃO
     # ==========================================
-    
-    def get_version_suffix(self):
-        """
-        Retorna o sufixo do nome baseado na versão selecionada.
-        
-        Returns:
-            str: Sufixo formatado (ex: 'Full', 'Intermediate', 'Lightweight')
-        """
-        version_map = {
-            "full": "Full",
-            "intermediate": "Intermediate",
-            "lightweight": "Lightweight"
-        }
-        return version_map.get(self.var_version.get(), "Full")
-    
-    def get_profile_name(self):
-        """
-        Retorna o nome completo do perfil incluindo a versão.
-        
-        Returns:
-            str: Nome do perfil (ex: 'Minecraft Guerra 2 Full')
-        """
-        return f"Minecraft Guerra 2 {self.get_version_suffix()}"
-    
-    def get_folder_name(self):
+
+    def create_engine(self):
         """
-        Retorna o nome da pasta de instalação incluindo a versão.
-        
+        Cria o motor de instalação com as escolhas feitas no wizard.
+
         Returns:
-            str: Nome da pasta (ex: 'Minecraft Guerra 2 Full')
+            InstallEngine: Motor que publica o progresso no canal da interface
         """
-        return f"Minecraft Guerra 2 {self.get_version_suffix()}"
-    
+        # Importado sob demanda (carrega requests, sqlite3 e zipfile)
+        from install_engine import InstallEngine
+
+        return InstallEngine(
+            self.var_launcher.get(),
+            self.var_version.get(),
+            install_path=self.var_install_path.get(),
+            status_callback=self.set_status
+        )
+
     def get_target_directory(self):
         """
         Determina o diretório de instalação baseado no launcher selecionado.
-        
+
         Returns:
             str: Caminho absoluto do diretório de instalação
         """
-        launcher = self.var_launcher.get()
-        
-        # Se instalação manual, retorna caminho selecionado pelo usuário
-        if "manual" in launcher: 
-            return self.var_install_path.get()
-
-        # Obtém diretório AppData do Windows
-        appdata = os.getenv('APPDATA')
-        minecraft_default = os.path.join(appdata, ".minecraft")
-        
-        # Nome da pasta específico para cada versão
-        folder_name = self.get_folder_name()
-        profile_name = self.get_profile_name()
-
-        # TLauncher: Instala como versão do Minecraft
-        if launcher == "tlauncher":
-            return os.path.join(minecraft_default, "versions", folder_name)
-        
-        # SKLauncher: Usa sistema de instâncias
-        elif launcher == "sklauncher":
-            return os.path.join(minecraft_default, "instances", folder_name)
-        
-        # Modrinth App: Diretório próprio de perfis
-        elif launcher == "modrinth":
-            return os.path.join(appdata, "ModrinthApp", "profiles", profile_name)
+        return self.create_engine().get_target_directory()
 
-        # CurseForge: Usa diretório do perfil de usuário
-        elif launcher == "curseforge":
-            user_profile = os.getenv('USERPROFILE') or os.path.expanduser("~")
-            return os.path.join(user_profile, "curseforge", "minecraft", "Instances", profile_name)
-
-        # Fallback para diretório padrão do Minecraft
-        return minecraft_default
-
-    def configure_sklauncher_profile(self):
-        """
-        Configura perfil do SKLauncher no arquivo launcher_profiles.json.
-        Cria ou atualiza o perfil 'Minecraft Guerra 2' com as configurações apropriadas.
-        
-        Returns:
-            bool: True se configurado com sucesso, False caso contrário
+    def run_installation_logic(self):
         """
-        try:
-            # Localiza arquivo de perfis do Minecraft
-            appdata = os.getenv('APPDATA')
-            minecraft_dir = os.path.join(appdata, ".minecraft")
-            profiles_path = os.path.join(minecraft_dir, "launcher_profiles.json")
-            
-            # Caminho dinâmico onde o modpack foi instalado (inclui versão)
-            game_dir_installed = os.path.join(minecraft_dir, "instances", self.get_folder_name())
-
-            # Lê ou cria arquivo de perfis
-            if not os.path.exists(profiles_path):
-                print("Arquivo launcher_profiles.json não encontrado. Criando um novo.")
-                data = {"profiles": {}}
-            else:
-                with open(profiles_path, 'r', encoding='utf-8') as f:
-                    try:
-                        data = json.load(f)
-                    except json.JSONDecodeError:
-                        data = {"profiles": {}}
-
-            if "profiles" not in data: 
-                data["profiles"] = {}
-
-            # ID único para cada versão do modpack
-            profile_ids = {
-                "Full": "686d1a5248c548dca11bfc1d256b1784",
-                "Intermediate": "786d1a5248c548dca11bfc1d256b1785",
-                "Lightweight": "886d1a5248c548dca11bfc1d256b1786"
-            }
-            profile_id = profile_ids.get(self.get_version_suffix(), "686d1a5248c548dca11bfc1d256b1784")
-            
-            # Cria objeto de perfil com todas as configurações necessárias
-            new_profile = {
-                "name": self.get_profile_name(),  # Nome incluindo versão
-                "gameDir": game_dir_installed,  # Caminho dinâmico
-                "lastVersionId": "1.20.1-forge-47.4.13",  # Versão do Minecraft + Forge
-                "resolution": {
-                    "width": 854,
-                    "height": 480,
-                    "fullscreen": False
-                },
-                "type": "custom",
-                "created": datetime.datetime.now().isoformat(),
-                "lastUsed": datetime.datetime.now().isoformat()
-            }
-
-            # Adiciona/atualiza perfil no dicionário
-            data["profiles"][profile_id] = new_profile
-
-            # Salva arquivo de perfis atualizado
-            with open(profiles_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-                
-            print(f"Perfil SKLauncher configurado em: {profiles_path}")
-            return True
-
-        except Exception as e:
-            print(f"Erro ao configurar perfil SKLauncher: {e}")
-            return False
+        Executa o processo completo de instalação em thread separada.
 
-    def configure_modrinth_profile(self):
-        """
-        Configura perfil do Modrinth App no banco de dados SQLite (app.db).
-        Cria ou atualiza o perfil 'Minecraft Guerra' com as configurações apropriadas.
-        
-        Returns:
-            bool: True se configurado com sucesso, False caso contrário
+        A instalação em si é feita pelo InstallEngine; aqui apenas o resultado
+        é encaminhado para a interface.
         """
         try:
-            # Localiza banco de dados do Modrinth App
-            appdata = os.getenv('APPDATA')
-            db_path = os.path.join(appdata, "ModrinthApp", "app.db")
-            
-            if not os.path.exists(db_path):
-                print("Banco de dados do Modrinth não encontrado.")
-                return False
-
-            # Conecta ao banco de dados SQLite
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Nome do perfil com versão
-            profile_name = self.get_profile_name()
-
-            # Verifica se o perfil já existe
-            cursor.execute("SELECT path FROM profiles WHERE path = ?", (profile_name,))
-            if cursor.fetchone():
-                # Perfil existe - atualiza apenas timestamp de modificação
-                print(f"Perfil Modrinth '{profile_name}' já existe. Atualizando timestamps.")
-                now = int(time.time())
-                cursor.execute("UPDATE profiles SET modified = ? WHERE path = ?", (now, profile_name))
-            else:
-                # Perfil não existe - cria novo
-                print(f"Criando novo perfil Modrinth '{profile_name}'...")
-                now = int(time.time())
-                
-                # Query de inserção com todos os campos necessários
-                query = """
-                    INSERT INTO profiles (
-                        path, install_stage, name, icon_path, game_version, mod_loader, mod_loader_version, 
-                        groups, linked_project_id, linked_version_id, locked, created, modified, last_played, 
-                        submitted_time_played, recent_time_played, override_java_path, override_extra_launch_args, 
-                        override_custom_env_vars, override_mc_memory_max, override_mc_force_fullscreen, 
-                        override_mc_game_resolution_x, override_mc_game_resolution_y, override_hook_pre_launch, 
-                        override_hook_wrapper, override_hook_post_exit, protocol_version, launcher_feature_version
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-                
-                # Valores do perfil
-                values = (
-                    profile_name,          # path
-                    "installed",           # install_stage
-                    profile_name,          # name
-                    None,                  # icon_path
-                    "1.20.1",             # game_version
-                    "forge",              # mod_loader
-                    "47.4.13",             # mod_loader_version
-                    "11",                 # groups
-                    None,                 # linked_project_id
-                    None,                 # linked_version_id
-                    None,                 # locked
-                    now,                  # created
-                    now,                  # modified
-                    None,                 # last_played
-                    0,                    # submitted_time_played
-                    0,                    # recent_time_played
-                    None,                 # override_java_path
-                    0,                    # override_extra_launch_args
-                    0,                    # override_custom_env_vars
-                    None,                 # override_mc_memory_max
-                    None,                 # override_mc_force_fullscreen
-                    None,                 # override_mc_game_resolution_x
-                    None,                 # override_mc_game_resolution_y
-                    None,                 # override_hook_pre_launch
-                    None,                 # override_hook_wrapper
-                    None,                 # override_hook_post_exit
-                    763,                  # protocol_version (1.20.1)
-                    "migrated_launch_hooks"  # launcher_feature_version
-                )
-                cursor.execute(query, values)
-
-            # Salva alterações e fecha conexão
-            conn.commit()
-            conn.close()
-            print(f"Perfil Modrinth configurado em: {db_path}")
-            return True
+            # Mantém o motor para exibir o tempo das etapas na tela final
+            self.install_engine = self.create_engine()
+            self.install_engine.run()
+            # Finaliza com sucesso
+            self.notify_finished(success=True)
 
         except Exception as e:
-            print(f"Erro ao configurar perfil Modrinth: {e}")
-            return False
+            # Tratamento de erros: exibe mensagem e finaliza com falha
+            print(e)
+            self.progress_bus.call(messagebox.showerror, "Erro Fatal", f"{e}")
+            self.notify_finished(success=False)
 
-    # ==========================================
-    # LÓGICA PRINCIPAL DE INSTALAÇÃO
-    # ==========================================
-    
-    def run_installation_logic(self):
-        """
-        Executa o processo completo de instalação em thread separada.
-        
-        Etapas:
-        1. Fecha processos conflitantes (launchers e Minecraft)
-        2. Faz download do modpack
-        3. Extrai arquivos para o diretório apropriado
-        4. Configura perfil do launcher (se aplicável)
-        5. Finaliza e exibe resultado
+    def set_status(self, text, val):
         """
-        try:
-            # ==========================================
-            # PASSO 1: FECHAR PROCESSOS CONFLITANTES
-            # ==========================================
-            self.update_status("Fechando launchers e Minecraft...", 5)
-            kill_list = ["Modrinth App.exe", "minecraft.exe", "CurseForge.exe", "java.exe", "javaw.exe"]
-            for proc in kill_list:
-                # Executa taskkill silenciosamente para cada processo
-                os.system(f'taskkill /F /IM "{proc}" >nul 2>&1')
-            time.sleep(2)  # Aguarda finalização dos processos  # Aguarda finalização dos processos
-
-            version = self.var_version.get()
-            launcher = self.var_launcher.get()
-
-            # ==========================================
-            # PASSO 2: RESOLVER URL DE DOWNLOAD
-            # ==========================================
-            # Normaliza chave do launcher (manual_pirata/manual_original -> manual)
-            launcher_key = "manual" if "manual" in launcher else launcher
-            
-            # Busca URL apropriada no dicionário
-            if launcher_key in self.DOWNLOAD_URLS and version in self.DOWNLOAD_URLS[launcher_key]:
-                url = self.DOWNLOAD_URLS[launcher_key][version]
-            else:
-                # Fallback para caso URL não esteja configurada
-                url = "http://example.com" 
-                if "LINK_" in str(self.DOWNLOAD_URLS.get(launcher_key, {}).get(version, "")):
-                     self.after(0, lambda: messagebox.showerror("Erro", "Links de download não configurados no código!"))
-                     self.finish_installation_ui(success=False)
-                     return
-
-            # ==========================================
-            # MODO SIMULAÇÃO (URLs de placeholder)
-            # ==========================================
-            # Usado para testes quando links reais não estão disponíveis
-            if "LINK_" in url or "example.com" in url:
-                self.update_status("Modo Simulação (Links não reais)...", 50)
-                time.sleep(2)
-                
-                # Cria pasta de destino para SKLauncher funcionar
-                target_dir = self.get_target_directory()
-                if not os.path.exists(target_dir): 
-                    os.makedirs(target_dir)
-                
-                # Configura perfil do launcher (simulação)
-                if launcher == "sklauncher":
-                    self.update_status("Configurando perfil SKLauncher...", 90)
-                    self.configure_sklauncher_profile()
-                elif launcher == "modrinth":
-                    self.update_status("Configurando perfil Modrinth...", 90)
-                    self.configure_modrinth_profile()
-                
-                self.finish_installation_ui(success=True)
-                return
-
-            target_dir = self.get_target_directory()
-
-            # ==========================================
-            # PASSO 3: DOWNLOAD E EXTRAÇÃO DO MODPACK
-            # ==========================================
-            # Usa diretório temporário para download (limpo automaticamente)
-            with tempfile.TemporaryDirectory() as temp_dir:
-                zip_path = os.path.join(temp_dir, "modpack.zip")
-
-                # --- Download ---
-                self.update_status(f"Baixando {version}...", 0)
-                response = requests.get(url, stream=True)
-                total_size = int(response.headers.get('content-length', 0))
-                wrote = 0
-
-                # Escreve arquivo em chunks e atualiza progresso
-                with open(zip_path, 'wb') as f:
-                    for data in response.iter_content(1024):
-                        wrote += len(data)
-                        f.write(data)
-                        # Atualiza barra de progresso a cada ~200KB para não sobrecarregar UI
-                        if total_size > 0 and wrote % (1024*200) == 0:
-                            percent = (wrote / total_size) * 100
-                            self.after(0, lambda p=percent: self.update_status(f"Baixando... {int(p)}%", p))
-
-                # --- Extração ---
-                self.update_status("Verificando instalação...", 100)
-                
-                # Verifica se é atualização (pasta existe e tem conteúdo)
-                is_update = os.path.exists(target_dir) and os.listdir(target_dir)
-                
-                if is_update:
-                    self.update_status("Atualizando modpack...", 100)
-                    # Extrai para pasta temporária
-                    extract_dir = os.path.join(temp_dir, "extracted")
-                    os.makedirs(extract_dir, exist_ok=True)
-                    
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        zip_ref.extractall(extract_dir)
-                    
-                    # 1. Substituir pasta mods
-                    target_mods = os.path.join(target_dir, "mods")
-                    source_mods = os.path.join(extract_dir, "mods")
-                    if os.path.exists(source_mods):
-                        if os.path.exists(target_mods):
-                            shutil.rmtree(target_mods)
-                        shutil.copytree(source_mods, target_mods)
-                        self.update_status("Atualizando mods...", 100)
-                    
-                    # 2. Substituir pasta config
-                    target_config = os.path.join(target_dir, "config")
-                    source_config = os.path.join(extract_dir, "config")
-                    if os.path.exists(source_config):
-                        if os.path.exists(target_config):
-                            shutil.rmtree(target_config)
-                        shutil.copytree(source_config, target_config)
-                        self.update_status("Atualizando configs...", 100)
-                    
-                    # 2.1. Substituir pasta resourcepacks
-                    target_resourcepacks = os.path.join(target_dir, "resourcepacks")
-                    source_resourcepacks = os.path.join(extract_dir, "resourcepacks")
-                    if os.path.exists(source_resourcepacks):
-                        if os.path.exists(target_resourcepacks):
-                            shutil.rmtree(target_resourcepacks)
-                        shutil.copytree(source_resourcepacks, target_resourcepacks)
-                        self.update_status("Atualizando resourcepacks...", 100)
-
-                    # 2.2. Substituir pasta shaderpacks
-                    target_shaderpacks = os.path.join(target_dir, "shaderpacks")
-                    source_shaderpacks = os.path.join(extract_dir, "shaderpacks")
-                    if os.path.exists(source_shaderpacks):
-                        if os.path.exists(target_shaderpacks):
-                            shutil.rmtree(target_shaderpacks)
-                        shutil.copytree(source_shaderpacks, target_shaderpacks)
-                        self.update_status("Atualizando shaderpacks...", 100)
-
-                    # 3. Substituir arquivos específicos
-                    files_to_copy = [
-                        "TLauncherAdditional.json",
-                        "minecraftinstance.json"
-                    ]
-                    
-                    # Adiciona variantes do json principal
-                    json_variants = glob.glob(os.path.join(extract_dir, "Minecraft Guerra 2 *.json"))
-                    for f in json_variants:
-                        files_to_copy.append(os.path.basename(f))
-                        
-                    # Adiciona arquivos SQL (Modrinth)
-                    sql_files = glob.glob(os.path.join(extract_dir, "*.sql"))
-                    for f in sql_files:
-                        files_to_copy.append(os.path.basename(f))
+        Publica o status da instalação (seguro para chamar da thread de trabalho).
 
-                    for filename in files_to_copy:
-                        src_file = os.path.join(extract_dir, filename)
-                        dst_file = os.path.join(target_dir, filename)
-                        if os.path.exists(src_file):
-                            if os.path.exists(dst_file):
-                                os.remove(dst_file)
-                            shutil.copy2(src_file, dst_file)
-                            
-                    self.update_status("Atualização concluída!", 100)
-
-                else:
-                    # Instalação Limpa
-                    self.update_status("Extraindo arquivos...", 100)
-                    if not os.path.exists(target_dir):
-                        os.makedirs(target_dir)
-
-                    # Extrai todos os arquivos do ZIP
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        file_list = zip_ref.namelist()
-                        total_files = len(file_list)
-                        for index, file in enumerate(file_list):
-                            zip_ref.extract(file, target_dir)
-                            # Atualiza status a cada 50 arquivos para não travar a UI
-                            if index % 50 == 0:
-                                percent = (index / total_files) * 100
-                                filename = file.split('/')[-1] if '/' in file else file
-                                self.after(0, lambda p=percent, f=filename: self.update_status(f"Extraindo: {f}", p))
+        Args:
+            text (str): Texto descritivo do status atual
+            val (int): Valor da barra de progresso (0-100)
+        """
+        self.progress_bus.publish(text, val)
 
-            # ==========================================
-            # PASSO 4: CONFIGURAÇÃO PÓS-INSTALAÇÃO
-            # ==========================================
-            # Configura perfil do launcher (SKLauncher e Modrinth)
-            if launcher == "sklauncher":
-                self.update_status("Atualizando perfis do Launcher...", 100)
-                self.configure_sklauncher_profile()
-            elif launcher == "modrinth":
-                self.update_status("Atualizando banco de dados do Modrinth...", 100)
-                self.configure_modrinth_profile()
+    def notify_finished(self, success):
+        """
+        Agenda a tela de resultado na thread da interface e fecha o canal de progresso.
 
-            # Finaliza com sucesso
-            self.finish_installation_ui(success=True)
+        Args:
+            success (bool): True se instalação foi bem-sucedida, False caso contrário
+        """
+        self.progress_bus.call(self.finish_installation_ui, success)
+        self.progress_bus.close()
 
-        except Exception as e:
-            # Tratamento de erros: exibe mensagem e finaliza com falha
-            print(e)
-            self.after(0, lambda err=str(e): messagebox.showerror("Erro Fatal", f"{err}"))
-            self.finish_installation_ui(success=False)
+    def poll_progress(self):
+        """Desenha o status mais recente do canal de progresso (roda na thread da UI)."""
+        if self.progress_bus.poll(self.update_status):
+            self.after(1000 // PROGRESS_FPS, self.poll_progress)
 
     def update_status(self, text, val):
         """
@@ -1209,7 +810,11 @@ class ModpackWizard(ctk.CTk):
         if success:
             self.status_icon.configure(text="✅")
             self.lbl_status_title.configure(text="Instalação Concluída!", text_color="#2ecc71")
-            self.lbl_details.configure(text=f"📁 Instalado em:\n{self.get_target_directory()}")
+            details = f"📁 Instalado em:\n{self.get_target_directory()}"
+            # Tempo de cada etapa (o detalhamento fica em .install-trace.json na instalação)
+            if SHOW_INSTALL_TIMINGS and self.install_engine is not None:
+                details += f"\n\n⏱ {self.install_engine.trace.summary()}"
+            self.lbl_details.configure(text=details)
             self.progress.set(1)
             self.lbl_percentage.configure(text="100%")
             
@@ -0,0 +1,325 @@
+"""
+Cache Local de Arquivos do Modpack
+==================================
+
+Armazena os ZIPs baixados endereçados pelo seu SHA-256, de modo que instalar
+a mesma versão em vários launchers (todos apontam para as mesmas URLs) não
+baixe o arquivo novamente.
+
+- Cada URL guarda o hash do conteúdo e os validadores HTTP (ETag/Last-Modified)
+- Antes de reutilizar um arquivo, o servidor é consultado com uma requisição
+  condicional (If-None-Match/If-Modified-Since); uma resposta 304 dispensa o download
+- URLs já validadas nesta execução não consultam a rede novamente
+- O tamanho total é limitado, removendo os arquivos usados há mais tempo (LRU)
+- Se o servidor publica o checksum do arquivo ('<url>.sha256'), o hash calculado
+  durante o download é conferido antes de o arquivo entrar no cache
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+from downloader import get_cache_dir
+from http_session import REQUEST_TIMEOUT, get_session
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024   # 2GB (cabem as três versões do modpack)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# URLs já validadas nesta execução do instalador: {url: sha256}
+_session_validated = {}
+_session_lock = threading.Lock()
+
+
+def file_sha256(path):
+    """
+    Calcula o SHA-256 de um arquivo lendo-o em blocos.
+
+    Args:
+        path (str): Caminho do arquivo
+
+    Returns:
+        str: Hash em hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def checksum_url_for(url):
+    """
+    Retorna a URL do checksum publicado junto ao arquivo.
+
+    Ex: .../Guerra-2-Full.zip -> .../Guerra-2-Full.zip.sha256
+    """
+    return url + ".sha256"
+
+
+def fetch_published_checksum(url):
+    """
+    Baixa o SHA-256 publicado para o arquivo (formato do 'sha256sum').
+
+    Args:
+        url (str): URL do arquivo
+
+    Returns:
+        str: Hash em hexadecimal minúsculo, ou None se não houver checksum publicado
+    """
+    try:
+        response = get_session().get(checksum_url_for(url), timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Não foi possível obter o checksum de {url}: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+
+    fields = response.text.split()
+    checksum = fields[0].lower() if fields else ""
+    if len(checksum) != 64 or any(c not in "0123456789abcdef" for c in checksum):
+        print(f"Checksum publicado para {url} em formato inválido; ignorando.")
+        return None
+    return checksum
+
+
+def verify_checksum(path, actual, expected, remove=True):
+    """
+    Compara o hash calculado com o esperado, removendo o arquivo se diferirem.
+
+    Args:
+        path (str): Arquivo verificado
+        actual (str): SHA-256 calculado
+        expected (str): SHA-256 esperado (None dispensa a verificação)
+        remove (bool): Remove o arquivo inválido (para não reutilizá-lo depois)
+
+    Raises:
+        IOError: Se os hashes forem diferentes
+    """
+    if expected and actual != expected.lower():
+        if remove and os.path.exists(path):
+            os.remove(path)
+        raise IOError(f"Arquivo corrompido: SHA-256 {actual} difere do publicado {expected}")
+
+
+class ArchiveCache:
+    """
+    Repositório de arquivos endereçado por conteúdo com despejo LRU.
+
+    Estrutura em disco:
+        objects/<sha256>.zip  - Arquivos completos
+        incoming/             - Downloads em andamento (retomáveis)
+        index.json            - URLs -> hash/validadores e metadados dos objetos
+    """
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            root (str): Diretório do cache (padrão: pasta 'archives' do instalador)
+            max_bytes (int): Tamanho máximo ocupado pelos arquivos em cache
+        """
+        self.root = root or get_cache_dir("archives")
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.incoming_dir = os.path.join(self.root, "incoming")
+        self.index_path = os.path.join(self.root, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.incoming_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.index = self._load_index()
+        self.pinned = set()  # Objetos em uso que não podem ser descartados
+
+    # ==========================================
+    # ÍNDICE
+    # ==========================================
+
+    def _load_index(self):
+        """Lê o índice do disco, descartando-o se estiver corrompido."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("urls", {})
+        index.setdefault("objects", {})
+        return index
+
+    def _save_index(self):
+        """Grava o índice de forma atômica."""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def object_path(self, sha256):
+        """Retorna o caminho do arquivo com o hash informado."""
+        return os.path.join(self.objects_dir, f"{sha256}.zip")
+
+    def _touch(self, sha256):
+        """Marca o objeto como usado agora (para o LRU)."""
+        obj = self.index["objects"].get(sha256)
+        if obj is not None:
+            obj["last_access"] = time.time()
+            self._save_index()
+
+    # ==========================================
+    # BUSCA / DOWNLOAD
+    # ==========================================
+
+    def lookup(self, url):
+        """
+        Retorna o arquivo em cache para a URL, revalidando-o com o servidor.
+
+        Args:
+            url (str): URL do arquivo
+
+        Returns:
+            str: Caminho do arquivo em cache, ou None se ausente/desatualizado
+        """
+        with self._lock:
+            entry = self.index["urls"].get(url)
+            if not entry or not os.path.exists(self.object_path(entry["sha256"])):
+                return None
+
+        # Já validado nesta execução: dispensa a rede
+        with _session_lock:
+            validated = _session_validated.get(url) == entry["sha256"]
+
+        if not validated:
+            validated = self._revalidate(url, entry)
+
+        if not validated:
+            return None
+
+        with self._lock:
+            self._touch(entry["sha256"])
+        with _session_lock:
+            _session_validated[url] = entry["sha256"]
+        return self.object_path(entry["sha256"])
+
+    def _revalidate(self, url, entry):
+        """Faz uma requisição condicional; True se o servidor responder 304."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return False
+
+        try:
+            # stream=True: se o arquivo mudou, o corpo não chega a ser lido
+            with get_session().get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                return response.status_code == 304
+        except requests.RequestException as e:
+            print(f"Não foi possível revalidar o cache de {url}: {e}")
+            return False
+
+    def fetch(self, url, downloader, progress_callback=None, expected_sha256=None):
+        """
+        Retorna o caminho local do arquivo da URL, baixando-o apenas se necessário.
+
+        Args:
+            url (str): URL do arquivo
+            downloader (ChunkedDownloader): Motor de download a ser usado
+            progress_callback (callable): Função chamada com (bytes baixados, total)
+            expected_sha256 (str): Checksum publicado que o arquivo deve ter
+
+        Returns:
+            str: Caminho do arquivo dentro do cache
+
+        Raises:
+            IOError: Se o arquivo baixado não corresponder ao checksum
+        """
+        cached = self.lookup(url)
+        if cached and expected_sha256 and cached != self.object_path(expected_sha256.lower()):
+            cached = None  # O checksum publicado mudou: a cópia em cache é de outra versão
+        if cached:
+            print(f"Usando arquivo em cache: {cached}")
+            return cached
+
+        incoming_path = self.incoming_path(url)
+        downloader.download(url, incoming_path, progress_callback=progress_callback)
+        verify_checksum(incoming_path, downloader.sha256, expected_sha256)
+
+        return self.add(url, incoming_path, downloader.remote_info, sha256=downloader.sha256)
+
+    def incoming_path(self, url):
+        """
+        Retorna o caminho onde a URL deve ser baixada antes de entrar no cache.
+
+        O nome é estável por URL para que downloads interrompidos sejam retomados.
+        """
+        url_key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.incoming_dir, f"{url_key}.zip")
+
+    def add(self, url, path, remote_info=None, sha256=None):
+        """
+        Move um arquivo baixado para o cache e o associa à URL.
+
+        Args:
+            url (str): URL de origem
+            path (str): Arquivo baixado (será movido)
+            remote_info (dict): Validadores retornados pelo servidor
+            sha256 (str): Hash já calculado durante o download (evita reler o arquivo)
+
+        Returns:
+            str: Caminho do arquivo dentro do cache
+        """
+        remote_info = remote_info or {}
+        sha256 = sha256 or file_sha256(path)
+        dest = self.object_path(sha256)
+
+        with self._lock:
+            if os.path.exists(dest):
+                os.remove(path)  # Conteúdo idêntico já armazenado
+            else:
+                os.replace(path, dest)
+
+            self.index["objects"][sha256] = {
+                "size": os.path.getsize(dest),
+                "last_access": time.time(),
+            }
+            self.index["urls"][url] = {
+                "sha256": sha256,
+                "etag": remote_info.get("etag"),
+                "last_modified": remote_info.get("last_modified"),
+            }
+            self._evict(keep=sha256)
+            self._save_index()
+
+        with _session_lock:
+            _session_validated[url] = sha256
+        return dest
+
+    def pin(self, path):
+        """
+        Impede que um objeto do cache seja descartado enquanto ainda é lido.
+
+        Args:
+            path (str): Caminho retornado por fetch/add
+        """
+        with self._lock:
+            self.pinned.add(os.path.splitext(os.path.basename(path))[0])
+
+    def _evict(self, keep=None):
+        """Remove os objetos menos usados até o cache caber em max_bytes."""
+        objects = self.index["objects"]
+        total = sum(obj["size"] for obj in objects.values())
+
+        for sha256, obj in sorted(objects.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if sha256 == keep or sha256 in self.pinned:
+                continue
+            path = self.object_path(sha256)
+            if os.path.exists(path):
+                os.remove(path)
+            total -= obj["size"]
+            del objects[sha256]
+            # Remove as URLs que apontavam para o objeto descartado
+            for url in [u for u, e in self.index["urls"].items() if e["sha256"] == sha256]:
+                del self.index["urls"][url]
@@ -0,0 +1,251 @@
+"""
+Instalação em Lote
+==================
+
+Instala várias combinações (launcher, versão) em uma única execução, como nos
+PCs compartilhados de laboratório:
+
+- Os processos conflitantes são fechados uma única vez
+- Cada ZIP distinto é baixado (e verificado) uma única vez pelo cache, mesmo
+  que várias instalações usem o mesmo arquivo (ex: Full no SKLauncher e no
+  Modrinth)
+- Assim que um ZIP fica pronto, as instalações que dependem dele são
+  extraídas em paralelo nos respectivos diretórios enquanto o próximo ZIP
+  ainda é baixado
+- Ao final, os perfis dos launchers são gravados de uma vez (os do Modrinth
+  em uma única transação no banco do App)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from archive_cache import ArchiveCache, fetch_published_checksum, file_sha256, verify_checksum
+from install_engine import (InstallEngine, local_source_path, register_modrinth_profiles,
+                            register_sklauncher_profiles)
+from install_trace import InstallTrace
+from low_memory import is_low_memory_machine, low_memory_notice
+
+BATCH_WORKERS = 3  # Instalações extraídas ao mesmo tempo
+
+
+class BatchInstall:
+    """
+    Executa várias instalações compartilhando os downloads.
+    """
+
+    def __init__(self, targets, install_path="", source=None, mirrors=None, status_callback=None,
+                 close_processes=True, expected_sha256=None, verify_members=False,
+                 dedup=True, transactional=True, low_memory=None, workers=BATCH_WORKERS):
+        """
+        Args:
+            targets (list): Pares (launcher, versão) a instalar
+            install_path (str): Pasta de destino (apenas para o launcher 'manual')
+            source (str): URL HTTP ou ZIP local usado no lugar da URL padrão de cada versão
+            mirrors (list): URLs adicionais do mesmo arquivo (outros servidores)
+            status_callback (callable): Função chamada com (rótulo, texto, valor 0-100)
+            close_processes (bool): Fecha launchers e Minecraft antes de instalar
+            expected_sha256 (str): SHA-256 esperado dos ZIPs (padrão: o publicado)
+            verify_members (bool): Confere o CRC de cada membro do ZIP antes de extrair
+            dedup (bool): Usa o armazenamento compartilhado de arquivos (content_store.py)
+            transactional (bool): Instala cada instância em uma pasta de preparação (staged_install.py)
+            low_memory (bool): Modo de pouca memória (low_memory.py); None ativa sozinho
+                               em máquinas com pouca RAM
+            workers (int): Instalações extraídas ao mesmo tempo (uma no modo de pouca memória)
+        """
+        self.targets = list(dict.fromkeys(targets))  # Remove pares repetidos
+        self.install_path = install_path
+        self.source = source
+        self.mirrors = list(mirrors or [])
+        self.status_callback = status_callback
+        self.close_processes = close_processes
+        self.expected_sha256 = expected_sha256
+        self.verify_members = verify_members
+        self.dedup = dedup
+        self.transactional = transactional
+        self.low_memory = is_low_memory_machine() if low_memory is None else low_memory
+        self.low_memory_auto = low_memory is None and self.low_memory
+        self.workers = 1 if self.low_memory else max(1, workers)
+        self.trace = None
+        self.engines = {}  # Rótulo -> motor das instalações concluídas
+
+    @staticmethod
+    def label(launcher, version):
+        """Rótulo exibido de uma instalação (ex: 'modrinth/full')."""
+        return f"{launcher}/{version}"
+
+    def set_status(self, label, text, val):
+        """Informa o status de uma das instalações (ou do lote, com rótulo 'lote')."""
+        if self.status_callback:
+            self.status_callback(label, text, val)
+
+    def create_engine(self, launcher, version, source=None):
+        """
+        Cria o motor de uma das instalações.
+
+        Args:
+            source (str): ZIP já baixado; None usa a origem configurada
+
+        Returns:
+            InstallEngine: Motor que publica o status com o rótulo da instalação
+        """
+        label = self.label(launcher, version)
+        return InstallEngine(
+            launcher, version,
+            install_path=self.install_path,
+            source=source or self.source,
+            status_callback=lambda text, val: self.set_status(label, text, val),
+            close_processes=False,
+            # O checksum é conferido uma única vez, no download compartilhado
+            expected_sha256=None if source else self.expected_sha256,
+            verify_members=self.verify_members,
+            mirrors=None if source else self.mirrors,
+            dedup=self.dedup,
+            transactional=self.transactional,
+            low_memory=self.low_memory,
+            configure_profile=False,  # Gravados juntos em configure_profiles
+        )
+
+    def plan(self):
+        """
+        Agrupa as instalações pelo arquivo que usam.
+
+        Returns:
+            dict: Tupla de URLs (principal e mirrors) -> lista de pares (launcher, versão)
+
+        Raises:
+            ValueError: Se duas instalações resultarem no mesmo diretório
+        """
+        groups = {}
+        directories = {}
+        for launcher, version in self.targets:
+            engine = self.create_engine(launcher, version)
+            target_dir = os.path.normcase(os.path.abspath(engine.get_target_directory() or ""))
+            if target_dir in directories:
+                raise ValueError(f"{self.label(launcher, version)} e {directories[target_dir]} "
+                                 f"seriam instalados na mesma pasta: {target_dir}")
+            directories[target_dir] = self.label(launcher, version)
+            groups.setdefault(tuple(engine.resolve_urls()), []).append((launcher, version))
+        return groups
+
+    def fetch(self, urls, cache, engine):
+        """
+        Obtém o ZIP de um grupo (baixado uma vez e verificado).
+
+        Args:
+            urls (tuple): URL principal e mirrors
+            cache (ArchiveCache): Cache de arquivos baixados
+            engine (InstallEngine): Motor de uma das instalações do grupo
+
+        Returns:
+            str: Caminho do ZIP local
+        """
+        url = urls[0]
+        local_zip = local_source_path(url)
+        name = os.path.basename(url.split('?')[0])
+
+        with self.trace.phase(f"Download {name}") as phase:
+            if local_zip is not None:
+                if self.expected_sha256:
+                    verify_checksum(local_zip, file_sha256(local_zip), self.expected_sha256, remove=False)
+                return local_zip
+
+            def on_progress(wrote, total_size):
+                if total_size > 0:
+                    self.set_status("lote", f"Baixando {name}... {int(wrote / total_size * 100)}%",
+                                    wrote / total_size * 100)
+
+            checksum = self.expected_sha256 or fetch_published_checksum(url)
+            downloader = engine.create_downloader(list(urls))
+            zip_path = cache.fetch(url, downloader, progress_callback=on_progress, expected_sha256=checksum)
+            # Os próximos downloads não podem descartar o ZIP ainda sendo extraído
+            cache.pin(zip_path)
+            phase.bytes = downloader.remote_info.get("size", 0)
+            phase.args["cache_hit"] = not downloader.remote_info
+            phase.args["resumed_bytes"] = downloader.resumed_bytes
+        return zip_path
+
+    def install(self, launcher, version, zip_path):
+        """
+        Instala uma combinação a partir do ZIP já baixado.
+
+        Returns:
+            str: Diretório de instalação
+        """
+        label = self.label(launcher, version)
+        with self.trace.phase(f"Instalação {label}") as phase:
+            engine = self.create_engine(launcher, version, source=zip_path)
+            target_dir = engine.run()
+            phase.args["target_dir"] = target_dir
+        self.engines[label] = engine
+        return target_dir
+
+    def configure_profiles(self):
+        """
+        Grava os perfis dos launchers das instalações concluídas.
+
+        Returns:
+            dict: Rótulo -> True se o perfil foi configurado
+        """
+        engines = [self.engines[self.label(*target)] for target in self.targets
+                   if self.label(*target) in self.engines]
+        configured = {}
+        # Uma única escrita por launcher para todos os perfis
+        for launcher, status, register in (
+                ("sklauncher", "Atualizando perfis do Launcher...", register_sklauncher_profiles),
+                ("modrinth", "Atualizando banco de dados do Modrinth...", register_modrinth_profiles)):
+            group = [engine for engine in engines if engine.launcher == launcher]
+            if group:
+                self.set_status("lote", status, 100)
+                ok = register(group)
+                configured.update((self.label(engine.launcher, engine.version), ok) for engine in group)
+        return configured
+
+    def run(self):
+        """
+        Executa todas as instalações.
+
+        Uma falha em um download ou em uma instalação não interrompe as demais.
+
+        Returns:
+            dict: Rótulo -> diretório de instalação (str) ou a exceção da falha
+        """
+        self.trace = InstallTrace(targets=[self.label(*target) for target in self.targets])
+        groups = self.plan()
+        if self.low_memory_auto:
+            self.set_status("lote", low_memory_notice(), 0)
+
+        if self.close_processes:
+            self.set_status("lote", "Fechando launchers e Minecraft...", 0)
+            with self.trace.phase("Fechar processos") as phase:
+                phase.args.update(self.create_engine(*self.targets[0]).close_conflicting_processes())
+
+        cache = ArchiveCache()
+        results = {}
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Baixa um arquivo por vez (cada download já usa várias conexões) e
+            # dispara as extrações dele enquanto o próximo é baixado
+            for urls, targets in groups.items():
+                try:
+                    zip_path = self.fetch(urls, cache, self.create_engine(*targets[0]))
+                except Exception as e:
+                    print(f"Erro ao baixar {urls[0]}: {e}")
+                    for target in targets:
+                        results[self.label(*target)] = e
+                    continue
+                for launcher, version in targets:
+                    futures[self.label(launcher, version)] = pool.submit(self.install, launcher, version,
+                                                                         zip_path)
+
+            for label, future in futures.items():
+                try:
+                    results[label] = future.result()
+                except Exception as e:
+                    print(f"Erro ao instalar {label}: {e}")
+                    results[label] = e
+
+        with self.trace.phase("Perfis dos launchers") as phase:
+            phase.args["configured"] = self.configure_profiles()
+
+        self.trace.finish(all(not isinstance(result, Exception) for result in results.values()))
+        return {self.label(*target): results[self.label(*target)] for target in self.targets}
@@ -0,0 +1,114 @@
+"""
+Benchmark: Laço de Download Original x stream_response
+======================================================
+
+Sobe um servidor HTTP local (http.server, em outro processo para não somar
+CPU ao cliente) servindo um arquivo sintético e compara o custo de CPU por MB
+do laço original ('iter_content(1024)' + 'f.write') com o caminho de escrita
+com buffer adaptativo e 'readinto' (downloader.stream_response).
+
+Uso:
+    python benchmarks/bench_download.py
+    python benchmarks/bench_download.py --size-mb 256 --repeat 3
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from downloader import IDENTITY_HEADERS, stream_response  # noqa: E402
+
+
+def free_port():
+    """Retorna uma porta TCP livre em 127.0.0.1."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(directory):
+    """Inicia 'python -m http.server' em um subprocesso e espera ficar pronto."""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1", "--directory", directory],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Servidor HTTP local não iniciou")
+
+
+def download_original(url, dest):
+    """Laço usado originalmente pelo instalador."""
+    response = requests.get(url, stream=True)
+    with open(dest, 'wb') as f:
+        for data in response.iter_content(1024):
+            f.write(data)
+
+
+def download_stream_response(url, dest):
+    """Caminho novo: readinto em buffer reaproveitado com blocos adaptativos."""
+    with requests.get(url, headers=IDENTITY_HEADERS, stream=True) as response:
+        with open(dest, 'wb') as f:
+            f.truncate(int(response.headers.get('content-length', 0)))
+            f.seek(0)
+            stream_response(response, f)
+
+
+def measure(func, url, dest, repeat):
+    """Retorna (melhor tempo de parede, melhor tempo de CPU) em segundos."""
+    best_wall = best_cpu = float('inf')
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func(url, dest)
+        best_wall = min(best_wall, time.perf_counter() - wall_start)
+        best_cpu = min(best_cpu, time.process_time() - cpu_start)
+        os.remove(dest)
+    return best_wall, best_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o custo de CPU por MB dos laços de download.")
+    parser.add_argument("--size-mb", type=int, default=128, help="Tamanho do arquivo servido")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (usa o melhor resultado)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        serve_dir = os.path.join(work_dir, "srv")
+        os.makedirs(serve_dir)
+        with open(os.path.join(serve_dir, "modpack.zip"), 'wb') as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        process, base_url = start_server(serve_dir)
+        try:
+            url = f"{base_url}/modpack.zip"
+            dest = os.path.join(work_dir, "download.zip")
+            results = {
+                "iter_content(1024)": measure(download_original, url, dest, args.repeat),
+                "stream_response": measure(download_stream_response, url, dest, args.repeat),
+            }
+        finally:
+            process.terminate()
+            process.wait()
+
+    for name, (wall, cpu) in results.items():
+        print(f"{name:20s} {args.size_mb / wall:8.1f} MB/s  "
+              f"{cpu * 1000 / args.size_mb:7.2f} ms de CPU por MB")
+
+
+if __name__ == "__main__":
+    main()
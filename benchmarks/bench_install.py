@@ -0,0 +1,492 @@
+"""
+Benchmark: Instalação Completa com Modpacks Sintéticos
+======================================================
+
+Mede o instalador de ponta a ponta, sem depender do servidor real:
+
+1. Gera ZIPs sintéticos com o formato das versões Full, Intermediate e
+   Lightweight (milhares de configs pequenas, algumas centenas de jars e
+   resourcepacks grandes), uma segunda versão de cada (jars e configs
+   alterados, removidos e novos) com manifesto de atualização incremental, e
+   os checksums publicados ('<zip>.sha256')
+2. Serve tudo por um servidor HTTP local (em outro processo) com suporte a
+   Range, banda máxima e latência por requisição configuráveis
+3. Para cada versão executa, cada cenário em um processo novo (para medir o
+   pico de memória de cada um):
+   - install:      instalação limpa (download + extração)
+   - update-delta: atualização pelo manifesto (só os arquivos alterados)
+   - update-zip:   atualização pelo ZIP completo (sem manifesto)
+   e, uma vez, o cenário 'profiles' (perfis do SKLauncher e do Modrinth em
+   arquivos com centenas de perfis)
+4. Grava em JSON o tempo, MB/s, arquivos/s e pico de RSS de cada cenário, com
+   as etapas do trace da instalação, para comparar entre commits (--compare)
+
+Uso:
+    python benchmarks/bench_install.py
+    python benchmarks/bench_install.py --scale 1 --bandwidth-mbps 100 --latency-ms 40
+    python benchmarks/bench_install.py --variants full --output novo.json --compare antigo.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+# Formato de cada versão com --scale 1 (aproximadamente o tamanho real)
+VARIANT_SHAPES = {
+    "full": {"configs": 3000, "jars": 350, "resourcepacks": 3, "resourcepack_mb": 50},
+    "intermediate": {"configs": 2000, "jars": 220, "resourcepacks": 2, "resourcepack_mb": 40},
+    "lightweight": {"configs": 1200, "jars": 120, "resourcepacks": 1, "resourcepack_mb": 30},
+}
+JAR_KB = (32, 2048)          # Tamanho dos jars (pouco compressíveis)
+CONFIG_WORDS = (200, 1600)   # Tamanho das configs (texto compressível)
+
+# Fração da segunda versão que muda
+CHANGED_JARS = 0.05
+REMOVED_JARS = 0.01
+ADDED_JARS = 0.02
+CHANGED_CONFIGS = 0.02
+
+PROFILE_COUNT = 500          # Perfis já existentes nos arquivos dos launchers
+SCENARIOS = ["install", "update-delta", "update-zip"]
+CHUNK_SIZE = 64 * 1024
+
+
+# ==========================================
+# MODPACKS SINTÉTICOS
+# ==========================================
+
+def scaled(value, scale):
+    return max(1, round(value * scale))
+
+
+def synthetic_files(variant, scale, seed=42):
+    """
+    Gera o conteúdo de uma versão do modpack.
+
+    Returns:
+        dict: Caminho relativo -> bytes
+    """
+    shape = VARIANT_SHAPES[variant]
+    rng = random.Random(f"{seed}-{variant}")
+    words = [b"enabled", b"true", b"false", b"radius", b"spawn", b"weight", b"#", b"=", b"\n"]
+    files = {}
+    for index in range(scaled(shape["configs"], scale)):
+        name = f"config/mod_{index % 300:03d}/settings_{index:05d}.toml"
+        files[name] = b" ".join(rng.choice(words) for _ in range(rng.randint(*CONFIG_WORDS)))
+    for index in range(scaled(shape["jars"], scale)):
+        files[f"mods/mod_{index:05d}.jar"] = rng.randbytes(rng.randint(*JAR_KB) * 1024)
+    for index in range(shape["resourcepacks"]):
+        size = int(shape["resourcepack_mb"] * scale * 1024 * 1024)
+        files[f"resourcepacks/pack_{index}.zip"] = rng.randbytes(max(size, 1024))
+    files["options.txt"] = b"renderDistance:12\n"
+    return files
+
+
+def next_version(files, seed=7):
+    """Segunda versão: alguns jars e configs alterados, removidos e novos."""
+    rng = random.Random(seed)
+    files = dict(files)
+    jars = sorted(name for name in files if name.startswith("mods/"))
+    configs = sorted(name for name in files if name.startswith("config/"))
+    for name in rng.sample(jars, scaled(len(jars) * CHANGED_JARS, 1)):
+        files[name] = rng.randbytes(len(files[name]))
+    for name in rng.sample(jars, scaled(len(jars) * REMOVED_JARS, 1)):
+        files.pop(name, None)
+    for index in range(scaled(len(jars) * ADDED_JARS, 1)):
+        files[f"mods/new_mod_{index:05d}.jar"] = rng.randbytes(rng.randint(*JAR_KB) * 1024)
+    for name in rng.sample(configs, scaled(len(configs) * CHANGED_CONFIGS, 1)):
+        files[name] = files[name] + b"\n# alterado\n"
+    return files
+
+
+def write_archive(path, files):
+    """Grava o ZIP (configs comprimidas; jars e resourcepacks armazenados) e o checksum publicado."""
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, data in files.items():
+            compress = zipfile.ZIP_STORED if name.endswith((".jar", ".zip")) else zipfile.ZIP_DEFLATED
+            zf.writestr(name, data, compress_type=compress)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    with open(path + ".sha256", 'w', encoding='utf-8') as f:
+        f.write(f"{digest.hexdigest()}  {os.path.basename(path)}\n")
+
+
+def write_manifest(serve_dir, name, files):
+    """Publica o manifesto e os arquivos soltos da atualização incremental."""
+    from delta_update import is_managed_path
+
+    entries = []
+    for rel_path, data in files.items():
+        if not is_managed_path(rel_path):
+            continue
+        dest = os.path.join(serve_dir, name, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, 'wb') as f:
+            f.write(data)
+        entries.append({"path": rel_path, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()})
+    with open(os.path.join(serve_dir, f"{name}.manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump({"version": "2", "files": entries}, f)
+
+
+def build_variant(serve_dir, variant, scale):
+    """
+    Gera os arquivos servidos de uma versão.
+
+    Returns:
+        dict: Nome dos ZIPs por cenário, tamanho e quantidade de arquivos
+    """
+    files = synthetic_files(variant, scale)
+    updated = next_version(files)
+    write_archive(os.path.join(serve_dir, f"{variant}.zip"), files)
+    write_archive(os.path.join(serve_dir, f"{variant}-v2.zip"), updated)
+    write_manifest(serve_dir, f"{variant}-v2", updated)
+    # Mesma segunda versão sem manifesto: força a atualização pelo ZIP completo
+    write_archive(os.path.join(serve_dir, f"{variant}-v2-zip.zip"), updated)
+    return {
+        "archives": {"install": f"{variant}.zip", "update-delta": f"{variant}-v2.zip",
+                     "update-zip": f"{variant}-v2-zip.zip"},
+        "archive_bytes": os.path.getsize(os.path.join(serve_dir, f"{variant}.zip")),
+        "files": len(files),
+    }
+
+
+# ==========================================
+# SERVIDOR HTTP LOCAL (BANDA E LATÊNCIA LIMITADAS)
+# ==========================================
+
+class Throttle:
+    """Banda máxima compartilhada por todas as conexões (como um link real)."""
+
+    def __init__(self, bytes_per_second):
+        self.rate = bytes_per_second
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._next = max(self._next, now) + size / self.rate
+            wait = self._next - now
+        time.sleep(wait)
+
+
+def serve(directory, port, bandwidth_mbps, latency_ms):
+    """Servidor HTTP com Range, banda e latência (executado em um subprocesso)."""
+    import http.server
+    import socketserver
+
+    throttle = Throttle(bandwidth_mbps * 1024 * 1024 / 8)
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Mantém as conexões (como um CDN)
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def log_message(self, *args):
+            pass
+
+        def send_head(self):
+            time.sleep(latency_ms / 1000)
+            path = self.translate_path(self.path.split('?')[0])
+            if not os.path.isfile(path):
+                self.send_error(404)
+                return None
+            f = open(path, 'rb')
+            size = os.fstat(f.fileno()).st_size
+            start, end = 0, size - 1
+            match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+            if match:
+                start = int(match.group(1))
+                end = min(int(match.group(2)) if match.group(2) else end, end)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", f'"{int(os.path.getmtime(path))}-{size}"')
+            self.end_headers()
+            f.seek(start)
+            self._remaining = end - start + 1
+            return f
+
+        def copyfile(self, source, outputfile):
+            while self._remaining > 0:
+                block = source.read(min(CHUNK_SIZE, self._remaining))
+                if not block:
+                    break
+                throttle.consume(len(block))
+                outputfile.write(block)
+                self._remaining -= len(block)
+
+    class Server(socketserver.ThreadingTCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+
+    with Server(("127.0.0.1", port), Handler) as server:
+        server.serve_forever()
+
+
+def free_port():
+    """Retorna uma porta TCP livre em 127.0.0.1."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(directory, bandwidth_mbps, latency_ms):
+    """Inicia o servidor em um subprocesso e espera ficar pronto."""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", directory, "--port", str(port),
+         "--bandwidth-mbps", str(bandwidth_mbps), "--latency-ms", str(latency_ms)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Servidor HTTP local não iniciou")
+
+
+# ==========================================
+# CENÁRIOS (CADA UM EM UM PROCESSO NOVO)
+# ==========================================
+
+def peak_rss_mb():
+    """Pico de memória residente do processo atual em MB (None se indisponível)."""
+    from low_memory import peak_rss_bytes
+
+    peak = peak_rss_bytes()
+    return round(peak / (1024 * 1024), 1) if peak is not None else None
+
+
+def run_install_scenario(spec):
+    """Instalação ou atualização de uma versão pelo motor do instalador."""
+    from install_engine import InstallEngine
+    from staged_install import rollback
+
+    target_dir = spec["target_dir"]
+    if spec["scenario"] == "update-zip":
+        # A instância está na segunda versão (update-delta): volta para a primeira
+        rollback(target_dir)
+    engine = InstallEngine("manual", spec["variant"], install_path=target_dir, source=spec["url"],
+                           close_processes=False, low_memory=spec.get("low_memory", False))
+    started = time.perf_counter()
+    engine.run()
+    seconds = time.perf_counter() - started
+    return seconds, [dict(phase.stats(), name=phase.name) for phase in engine.trace.phases]
+
+
+def run_profiles_scenario(spec):
+    """Perfis das três versões no SKLauncher e no Modrinth, com arquivos já cheios."""
+    from install_engine import InstallEngine, register_modrinth_profiles, register_sklauncher_profiles
+    from install_trace import InstallTrace
+
+    appdata = os.environ["APPDATA"]
+    profiles_path = os.path.join(appdata, ".minecraft", "launcher_profiles.json")
+    os.makedirs(os.path.dirname(profiles_path), exist_ok=True)
+    with open(profiles_path, 'w', encoding='utf-8') as f:
+        json.dump({"profiles": {f"{index:032x}": {
+            "name": f"Perfil {index}", "type": "custom", "lastVersionId": "1.20.1",
+            "gameDir": os.path.join(appdata, ".minecraft", "instances", f"Perfil {index}"),
+            "created": "2024-01-01T00:00:00", "lastUsed": "2024-01-01T00:00:00",
+        } for index in range(PROFILE_COUNT)}}, f, indent=2)
+
+    db_path = os.path.join(appdata, "ModrinthApp", "app.db")
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    engines = [InstallEngine("sklauncher", variant) for variant in VARIANT_SHAPES]
+    columns = list(engines[0].modrinth_profile())
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"CREATE TABLE profiles ({', '.join(columns)}, PRIMARY KEY (path))")
+    conn.executemany(f"INSERT INTO profiles ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                     [[f"Perfil {index}"] + [None] * (len(columns) - 1) for index in range(PROFILE_COUNT)])
+    conn.commit()
+    conn.close()
+
+    trace = InstallTrace()
+    started = time.perf_counter()
+    # Primeira gravação cria os perfis; a segunda (reinstalação) não deve alterar nada
+    for attempt in ("criar", "repetir"):
+        with trace.phase(f"SKLauncher ({attempt})") as phase:
+            register_sklauncher_profiles(engines)
+            phase.files = len(engines)
+            phase.bytes = os.path.getsize(profiles_path)
+        with trace.phase(f"Modrinth ({attempt})") as phase:
+            register_modrinth_profiles(engines)
+            phase.files = len(engines)
+    seconds = time.perf_counter() - started
+    return seconds, [dict(phase.stats(), name=phase.name) for phase in trace.phases]
+
+
+def run_child(spec_path):
+    """Executa um cenário e grava o resultado ao lado da especificação."""
+    with open(spec_path, encoding='utf-8') as f:
+        spec = json.load(f)
+    if spec["scenario"] == "profiles":
+        seconds, phases = run_profiles_scenario(spec)
+    else:
+        seconds, phases = run_install_scenario(spec)
+    with open(spec["result_path"], 'w', encoding='utf-8') as f:
+        json.dump({"seconds": seconds, "phases": phases, "peak_rss_mb": peak_rss_mb()}, f)
+
+
+def run_scenario(work_dir, spec):
+    """
+    Executa um cenário em um processo novo com pastas do usuário isoladas.
+
+    Returns:
+        dict: seconds, phases e peak_rss_mb
+    """
+    name = f"{spec.get('variant', 'all')}-{spec['scenario']}"
+    spec_path = os.path.join(work_dir, f"{name}.spec.json")
+    spec["result_path"] = os.path.join(work_dir, f"{name}.result.json")
+    with open(spec_path, 'w', encoding='utf-8') as f:
+        json.dump(spec, f)
+
+    env = dict(os.environ)
+    # Cache, armazenamento compartilhado e perfis dos launchers dentro da pasta do benchmark
+    env["LOCALAPPDATA"] = os.path.join(work_dir, "localappdata")
+    env["APPDATA"] = os.path.join(work_dir, "appdata")
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", spec_path],
+                            cwd=REPO_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Cenário {name} falhou:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+    with open(spec["result_path"], encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ==========================================
+# RELATÓRIO
+# ==========================================
+
+def git_commit():
+    """Commit atual do repositório (None fora de um repositório git)."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def print_comparison(results, previous_path):
+    """Compara os tempos com um resultado anterior (--compare)."""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    before = {(r.get("variant"), r["scenario"]): r for r in previous["results"]}
+    print(f"\nComparação com {previous_path} (commit {previous.get('commit')}):")
+    for result in results:
+        old = before.get((result.get("variant"), result["scenario"]))
+        if old is None:
+            continue
+        ratio = old["seconds"] / max(result["seconds"], 1e-6)
+        print(f"  {result.get('variant') or '-':13s} {result['scenario']:13s} "
+              f"{old['seconds']:8.3f}s -> {result['seconds']:8.3f}s  ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede instalação e atualização com modpacks sintéticos.")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANT_SHAPES), default=list(VARIANT_SHAPES),
+                        help="Versões medidas")
+    parser.add_argument("--scale", type=float, default=0.1,
+                        help="Fração do tamanho real dos modpacks (1 = ~550 MB na Full)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0,
+                        help="Banda máxima do servidor local em Mbit/s (0 = sem limite)")
+    parser.add_argument("--latency-ms", type=float, default=0,
+                        help="Latência adicionada a cada requisição HTTP")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Instala no modo de pouca memória (padrão: modo normal, mesmo com pouca RAM)")
+    parser.add_argument("--output", default="bench_install.json", help="Arquivo JSON com os resultados")
+    parser.add_argument("--compare", metavar="JSON", help="Resultado anterior para comparação")
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.bandwidth_mbps, args.latency_ms)
+        return
+    if args.child:
+        run_child(args.child)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        serve_dir = os.path.join(work_dir, "srv")
+        os.makedirs(serve_dir)
+        variants = {}
+        for variant in args.variants:
+            variants[variant] = build_variant(serve_dir, variant, args.scale)
+            print(f"{variant}: {variants[variant]['files']} arquivos, "
+                  f"{variants[variant]['archive_bytes'] / (1024 * 1024):.1f} MB")
+
+        process, base_url = start_server(serve_dir, args.bandwidth_mbps, args.latency_ms)
+        try:
+            for variant, info in variants.items():
+                target_dir = os.path.join(work_dir, "instances", variant)
+                for scenario in SCENARIOS:
+                    url = f"{base_url}/{info['archives'][scenario]}"
+                    result = run_scenario(work_dir, {"scenario": scenario, "variant": variant, "url": url,
+                                                     "target_dir": target_dir, "low_memory": args.low_memory})
+                    seconds = result["seconds"]
+                    results.append(dict(
+                        variant=variant, scenario=scenario, seconds=round(seconds, 4),
+                        # Vazão efetiva: tamanho da versão pelo tempo total do cenário
+                        mb_per_s=round(info["archive_bytes"] / (1024 * 1024) / seconds, 2),
+                        files_per_s=round(info["files"] / seconds, 1),
+                        peak_rss_mb=result["peak_rss_mb"], phases=result["phases"],
+                    ))
+                    print(f"  {variant:13s} {scenario:13s} {seconds:8.3f}s  "
+                          f"{results[-1]['mb_per_s']:8.1f} MB/s  {results[-1]['files_per_s']:9.1f} arquivos/s  "
+                          f"pico {result['peak_rss_mb']} MB")
+        finally:
+            process.terminate()
+            process.wait()
+
+        result = run_scenario(work_dir, {"scenario": "profiles"})
+        results.append(dict(scenario="profiles", seconds=round(result["seconds"], 4),
+                            peak_rss_mb=result["peak_rss_mb"], phases=result["phases"]))
+        print(f"  {'-':13s} {'profiles':13s} {result['seconds']:8.3f}s  pico {result['peak_rss_mb']} MB")
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"scale": args.scale, "bandwidth_mbps": args.bandwidth_mbps, "latency_ms": args.latency_ms,
+                     "variants": args.variants, "low_memory": args.low_memory},
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados gravados em {args.output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
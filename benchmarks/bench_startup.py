@@ -0,0 +1,110 @@
+"""
+Benchmark: Tempo de Importação do Instalador (Partida a Frio)
+=============================================================
+
+Executa 'python -X importtime -c "import Installer"' em processos novos e
+mede o tempo acumulado de importação do módulo principal, que é o que roda
+antes da primeira janela aparecer no executável do PyInstaller.
+
+Também verifica o orçamento de partida:
+- O tempo de importação (melhor de N execuções) deve ficar abaixo de --budget-ms
+- Rede, sqlite e o motor de instalação não podem ser importados na partida
+  (são carregados apenas no passo de instalação)
+
+Sai com código 1 se o orçamento for estourado, para ser usado em CI.
+
+Uso:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --budget-ms 120 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que só devem ser carregados no passo de instalação
+DEFERRED_MODULES = [
+    "requests", "urllib3", "sqlite3", "install_engine", "archive_cache",
+    "downloader", "delta_update", "file_sync", "extractor", "pipeline",
+    "http_session", "mirrors", "install_trace",
+    "processes", "batch_install", "content_store",
+    "instance_index", "staged_install", "modrinth_db", "profile_store",
+    "lazy_zip", "low_memory",
+]
+
+DEFAULT_BUDGET_MS = 120
+
+
+def run_importtime():
+    """
+    Importa o instalador em um processo novo.
+
+    Returns:
+        list: Linhas (self_us, cumulative_us, depth, módulo) da árvore do Installer
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import Installer"],
+        cwd=REPO_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar o instalador:\n{result.stderr}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(self_us), int(cumulative_us), depth, name.strip()))
+
+    # O importtime lista os filhos antes do pai: fica apenas com o que veio
+    # depois da inicialização do interpretador ('site') até o próprio Installer
+    start = 0
+    for index, (_, _, depth, name) in enumerate(entries):
+        if depth == 0 and name == "site":
+            start = index + 1
+    return entries[start:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação do instalador.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições (usa o melhor resultado)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Tempo máximo de importação do Installer")
+    parser.add_argument("--top", type=int, default=10, help="Quantidade de módulos mais lentos exibidos")
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.repeat):
+        entries = run_importtime()
+        total_us = next(cum for _, cum, depth, name in entries if depth == 0 and name == "Installer")
+        if best is None or total_us < best[0]:
+            best = (total_us, entries)
+
+    total_us, entries = best
+    total_ms = total_us / 1000
+    imported = {name for _, _, _, name in entries}
+    loaded_early = [name for name in DEFERRED_MODULES if name in imported]
+
+    print(f"Importação do Installer: {total_ms:.1f} ms (orçamento: {args.budget_ms:.0f} ms)")
+    print("\nMódulos mais lentos (tempo próprio):")
+    for self_us, _, _, name in sorted(entries, reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.2f} ms  {name}")
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"\nFALHOU: importação acima do orçamento ({total_ms:.1f} > {args.budget_ms:.0f} ms)")
+        failed = True
+    if loaded_early:
+        print(f"\nFALHOU: módulos que deveriam ser adiados foram importados: {', '.join(loaded_early)}")
+        failed = True
+    if not failed:
+        print("\nOK: dentro do orçamento de partida")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,466 @@
+"""
+Armazenamento Compartilhado de Arquivos (Deduplicação)
+======================================================
+
+As versões Full, Intermediate e Lightweight compartilham boa parte dos mods e
+configs, e a mesma versão pode estar instalada em vários launchers. Em vez de
+escrever cada cópia por inteiro, cada arquivo do modpack é descompactado uma
+única vez em um armazenamento compartilhado e "instalado" nas instâncias como
+uma operação de metadados:
+
+1. reflink (cópia sob demanda do sistema de arquivos: Btrfs, XFS, APFS) -
+   os blocos são compartilhados, mas cada instância pode alterar o seu arquivo
+2. hardlink - o mesmo arquivo em dois caminhos; usado apenas nas pastas cujos
+   arquivos são sempre substituídos por inteiro (mods, resourcepacks,
+   shaderpacks), nunca editados no lugar como as configs
+3. cópia a partir do armazenamento (sem descompactar de novo)
+
+Os objetos são identificados pelo SHA-256 do conteúdo, calculado enquanto
+o membro é descompactado. O CRC-32 + tamanho do membro do ZIP (a mesma
+identidade usada por file_sync.member_matches) serve apenas para encontrar
+candidatos em refs/: um objeto é reaproveitado sem ler o membro quando já veio
+deste mesmo membro deste mesmo ZIP; vindo de outro ZIP, o membro é
+descompactado em memória e só é ligado se o SHA-256 confirmar (dois arquivos
+diferentes com o mesmo CRC-32 e tamanho nunca compartilham um objeto). A
+instância sempre recebe o arquivo através de um nome temporário seguido de
+'os.replace', como nas demais escritas.
+
+Os objetos ficam ligados às instâncias por hardlink, então o uso (para o
+descarte dos menos usados) é registrado em usage.json, nunca com 'os.utime'
+no objeto: isso mudaria a data de todos os arquivos ligados e invalidaria o
+índice das outras instâncias (instance_index.py).
+
+O armazenamento só é usado quando fica no mesmo volume da instância (links
+entre volumes não existem, e a cópia dobraria a escrita na primeira vez).
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+
+from archive_cache import file_sha256
+from downloader import get_cache_dir
+from file_sync import COPY_BUFFER_SIZE
+
+# Pastas onde os arquivos nunca são editados no lugar (seguras para hardlink)
+HARDLINK_FOLDERS = ["mods", "resourcepacks", "shaderpacks"]
+
+STORE_MAX_BYTES = 4 * 1024 * 1024 * 1024   # Objetos sem uso acima disso são descartados
+PRUNE_GRACE_SECONDS = 3600                 # Objetos usados há menos tempo nunca são descartados
+
+USAGE_FILE_NAME = "usage.json"             # SHA-256 do objeto -> último uso (epoch)
+OBJECT_NAME = re.compile(r"[0-9a-f]{64}")  # Demais nomes em objects/ são de versões antigas
+
+FICLONE = 0x40049409  # ioctl do Linux para reflink
+
+# A instalação em lote usa vários ContentStore no mesmo processo: as gravações
+# de usage.json (ler, juntar, substituir) precisam ser feitas uma por vez
+_usage_lock = threading.Lock()
+
+
+def reflink(src, dst):
+    """
+    Cria dst como reflink de src (blocos compartilhados com cópia sob demanda).
+
+    Raises:
+        OSError: Se o sistema de arquivos ou a plataforma não suportam reflink
+    """
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            try:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            except OSError:
+                d.close()
+                os.remove(dst)
+                raise
+    elif sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+    else:
+        raise OSError("reflink não suportado nesta plataforma")
+
+
+class ContentStore:
+    """
+    Objetos descompactados do modpack, compartilhados entre instâncias.
+    """
+
+    def __init__(self, root=None):
+        """
+        Args:
+            root (str): Diretório do armazenamento (padrão: pasta 'store' do instalador)
+        """
+        self.root = root or get_cache_dir("store")
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.refs_dir = os.path.join(self.root, "refs")
+        self.usage_path = os.path.join(self.root, USAGE_FILE_NAME)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._reflink_ok = True
+        self._hardlink_ok = True
+        self._used = {}  # SHA-256 -> último uso nesta execução (gravado em flush_usage)
+        self._deferred = None  # (ref, sha256, info) aguardando o caminho final do ZIP
+        self.stats = {"reused": 0, "added": 0, "hashed": 0, "reflink": 0, "hardlink": 0, "copy": 0}
+
+    def _count(self, *names):
+        with self._lock:
+            for name in names:
+                self.stats[name] += 1
+
+    def usable_for(self, target_dir):
+        """
+        Verifica se o armazenamento está no mesmo volume da instância.
+
+        Args:
+            target_dir (str): Diretório da instância (precisa existir)
+
+        Returns:
+            bool: True se os arquivos podem ser ligados em vez de copiados
+        """
+        try:
+            return os.stat(self.objects_dir).st_dev == os.stat(target_dir).st_dev
+        except OSError:
+            return False
+
+    def object_path(self, sha256):
+        """
+        Caminho do objeto com um conteúdo.
+
+        Args:
+            sha256 (str): SHA-256 do conteúdo, em hexadecimal
+
+        Returns:
+            str: Caminho em objects/<2 primeiros>/<sha256>
+        """
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def ref_path(self, info):
+        """
+        Caminho da lista de candidatos de um membro do ZIP.
+
+        Args:
+            info (zipfile.ZipInfo): Membro do ZIP
+
+        Returns:
+            str: Caminho em refs/<2 primeiros>/<crc><tamanho>
+        """
+        key = f"{info.CRC:08x}{info.file_size:x}"
+        return os.path.join(self.refs_dir, key[:2], key)
+
+    @staticmethod
+    def source_id(zip_ref, info):
+        """
+        Identifica um membro dentro de um arquivo ZIP específico.
+
+        O ZIP é identificado pelo caminho, tamanho e data de modificação: um ZIP
+        substituído (nova versão no mesmo caminho) é tratado como outro arquivo.
+
+        Returns:
+            str: Identificador, ou None se o arquivo do ZIP não puder ser consultado
+        """
+        path = getattr(zip_ref, "filename", None) or getattr(zip_ref, "path", None)
+        return ContentStore.archive_source_id(path, info)
+
+    @staticmethod
+    def archive_source_id(path, info):
+        """
+        Identifica um membro dentro do arquivo ZIP em 'path' (ver source_id).
+
+        Returns:
+            str: Identificador, ou None se o arquivo do ZIP não puder ser consultado
+        """
+        try:
+            st = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        raw = f"{os.path.realpath(path)}\0{st.st_size}\0{st.st_mtime_ns}\0{info.filename}\0{info.header_offset}"
+        return hashlib.sha1(raw.encode("utf-8", "surrogateescape")).hexdigest()
+
+    @staticmethod
+    def _read_refs(ref):
+        """Lê os pares (sha256, origem) registrados para um CRC-32 + tamanho."""
+        try:
+            with open(ref, encoding="ascii") as f:
+                return [tuple(line.split()) for line in f if len(line.split()) == 2]
+        except (OSError, ValueError):
+            return []
+
+    def _add_ref(self, ref, sha256, source):
+        """Registra que o membro 'source' tem o conteúdo 'sha256'."""
+        os.makedirs(os.path.dirname(ref), exist_ok=True)
+        with self._lock, open(ref, 'a', encoding="ascii") as f:
+            f.write(f"{sha256} {source or '-'}\n")
+
+    def _record_ref(self, ref, sha256, info, source):
+        """Registra o par agora ou, com defer_refs ativo, quando o ZIP estiver no lugar final."""
+        with self._lock:
+            if self._deferred is not None:
+                self._deferred.append((ref, sha256, info))
+                return
+        self._add_ref(ref, sha256, source)
+
+    def defer_refs(self):
+        """
+        Adia o registro das origens até commit_refs.
+
+        Usado quando o ZIP ainda está sendo baixado (instalação em pipeline): o
+        arquivo .part muda de caminho e data ao terminar, e uma origem calculada
+        sobre ele nunca seria reconhecida nas próximas instalações.
+        """
+        with self._lock:
+            self._deferred = []
+
+    def commit_refs(self, archive_path):
+        """
+        Registra as origens adiadas usando o ZIP já no seu caminho final.
+
+        Args:
+            archive_path (str): Caminho final do ZIP (por exemplo, no cache)
+        """
+        with self._lock:
+            deferred, self._deferred = self._deferred or [], None
+        for ref, sha256, info in deferred:
+            self._add_ref(ref, sha256, self.archive_source_id(archive_path, info))
+
+    def discard_refs(self):
+        """Descarta as origens adiadas (o ZIP não chegou ao caminho final)."""
+        with self._lock:
+            self._deferred = None
+
+    def install(self, zip_ref, info, dest, rel_path, verify=False):
+        """
+        Coloca o conteúdo de um membro do ZIP em dest, descompactando-o no
+        armazenamento apenas se ainda não estiver lá.
+
+        Args:
+            zip_ref (zipfile.ZipFile): ZIP aberto (usado se o objeto faltar ou vier de outro ZIP)
+            info (zipfile.ZipInfo): Membro do ZIP
+            dest (str): Caminho final na instância
+            rel_path (str): Caminho relativo à instância, com '/'
+            verify (bool): Confere também o SHA-256 do objeto já armazenado
+
+        Returns:
+            str: Forma usada: 'reflink', 'hardlink' ou 'copy'
+        """
+        ref = self.ref_path(info)
+        # Com registro adiado o ZIP ainda não está no lugar final: nenhuma origem confere
+        source = None if self._deferred is not None else self.source_id(zip_ref, info)
+        refs = self._read_refs(ref)
+        candidates = {sha256 for sha256, _ in refs if os.path.exists(self.object_path(sha256))}
+        known = {sha256 for sha256, origin in refs if source and origin == source}
+
+        sha256 = next((sha for sha in candidates & known
+                       if self._is_intact(self.object_path(sha), info, verify)), None)
+        if sha256 is None and candidates:
+            # Mesmo CRC-32 e tamanho, mas de outro ZIP: confirma pelo SHA-256 sem escrever
+            digest = self._member_sha256(zip_ref, info)
+            self._count("hashed")
+            if digest in candidates and self._is_intact(self.object_path(digest), info, verify):
+                sha256 = digest
+                self._record_ref(ref, sha256, info, source)
+
+        if sha256 is not None:
+            self._count("reused")
+        else:
+            sha256 = self._add(zip_ref, info)
+            self._record_ref(ref, sha256, info, source)
+            self._count("added")
+        with self._lock:
+            self._used[sha256] = time.time()
+
+        hardlink_allowed = rel_path.split('/')[0] in HARDLINK_FOLDERS
+        mode = self._materialize(self.object_path(sha256), dest, hardlink_allowed)
+        self._count(mode)
+        return mode
+
+    @staticmethod
+    def _is_intact(obj, info, verify):
+        """
+        Verifica se o objeto existe e ainda tem o conteúdo do membro.
+
+        Um programa que sobrescreva no lugar um arquivo ligado por hardlink
+        altera o objeto também: com tamanho (ou SHA-256) diferente ele é
+        descartado e descompactado de novo.
+        """
+        try:
+            if os.path.getsize(obj) != info.file_size:
+                os.remove(obj)
+                return False
+        except OSError:
+            return False
+        if verify and file_sha256(obj) != os.path.basename(obj):
+            os.remove(obj)
+            return False
+        return True
+
+    @staticmethod
+    def _member_sha256(zip_ref, info):
+        """Descompacta o membro em blocos só para calcular o SHA-256."""
+        digest = hashlib.sha256()
+        with zip_ref.open(info) as src:
+            for block in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _add(self, zip_ref, info):
+        """
+        Descompacta o membro para o armazenamento (o zipfile confere o CRC).
+
+        Returns:
+            str: SHA-256 do conteúdo (nome do objeto)
+        """
+        # Nome temporário por thread: duas instalações podem trazer o mesmo arquivo
+        tmp_path = os.path.join(self.objects_dir, f"{os.getpid()}.{threading.get_ident()}.tmp")
+        digest = hashlib.sha256()
+        try:
+            with zip_ref.open(info) as src, open(tmp_path, 'wb') as out:
+                for block in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+                    digest.update(block)
+                    out.write(block)
+            obj = self.object_path(digest.hexdigest())
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            os.replace(tmp_path, obj)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return digest.hexdigest()
+
+    def _materialize(self, obj, dest, hardlink_allowed):
+        """Liga (ou copia) o objeto em dest através de um nome temporário."""
+        tmp_path = dest + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            mode = None
+            if self._reflink_ok:
+                try:
+                    reflink(obj, tmp_path)
+                    mode = "reflink"
+                except OSError:
+                    self._reflink_ok = False  # Não tenta de novo a cada arquivo
+            if mode is None and hardlink_allowed and self._hardlink_ok:
+                try:
+                    os.link(obj, tmp_path)
+                    mode = "hardlink"
+                except OSError:
+                    self._hardlink_ok = False
+            if mode is None:
+                shutil.copyfile(obj, tmp_path)
+                mode = "copy"
+            os.replace(tmp_path, dest)
+            return mode
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load_usage(self):
+        """
+        Lê o registro de uso dos objetos.
+
+        Returns:
+            dict: SHA-256 -> último uso (epoch)
+        """
+        try:
+            with open(self.usage_path, encoding='utf-8') as f:
+                usage = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return usage if isinstance(usage, dict) else {}
+
+    def flush_usage(self, removed=()):
+        """
+        Grava em usage.json os objetos usados nesta execução.
+
+        Args:
+            removed (iterable): SHA-256 de objetos descartados (saem do registro)
+        """
+        with self._lock:
+            used, self._used = self._used, {}
+        removed = set(removed)
+        if not used and not removed:
+            return
+        with _usage_lock:
+            usage = self.load_usage()
+            for sha256, last_used in used.items():
+                usage[sha256] = max(last_used, usage.get(sha256, 0))
+            for sha256 in removed:
+                usage.pop(sha256, None)
+            tmp_path = f"{self.usage_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(usage, f)
+                os.replace(tmp_path, self.usage_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def prune(self, max_bytes=STORE_MAX_BYTES):
+        """
+        Descarta os objetos sem uso há mais tempo até o armazenamento caber em max_bytes.
+
+        Objetos ainda ligados a alguma instância por hardlink não ocupam espaço
+        extra e nunca são descartados. Objetos com nomes de versões antigas do
+        armazenamento (CRC-32 + tamanho) não são mais encontrados e são
+        descartados assim que deixam de estar ligados.
+
+        Returns:
+            int: Quantidade de objetos removidos
+        """
+        self.flush_usage()
+        usage = self.load_usage()
+        objects = []
+        legacy = []
+        total = 0
+        now = time.time()
+        for root, _, files in os.walk(self.objects_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                # Recentes podem estar em uso por outra instalação em andamento
+                last_used = max(usage.get(name, 0), st.st_mtime)
+                if now - last_used < PRUNE_GRACE_SECONDS:
+                    continue
+                if name.endswith(".tmp"):
+                    os.remove(path)  # Sobra de uma instalação interrompida
+                    continue
+                if st.st_nlink > 1:
+                    continue
+                if not OBJECT_NAME.fullmatch(name):
+                    legacy.append(path)
+                    continue
+                objects.append((last_used, st.st_size, path))
+                total += st.st_size
+
+        removed = []
+        for path in legacy:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed.append(os.path.basename(path))
+        for _, size, path in sorted(objects):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed.append(os.path.basename(path))
+        self.flush_usage(removed)
+        return len(removed)
@@ -0,0 +1,283 @@
+"""
+Atualização Incremental por Manifesto
+=====================================
+
+Cada versão do modpack pode publicar, ao lado do ZIP, um manifesto JSON com a
+lista de arquivos gerenciados pelo instalador:
+
+    {
+        "version": "2.4.0",
+        "base_url": "https://.../Guerra-2-Full/",
+        "files": [
+            {"path": "mods/exemplo.jar", "size": 123456, "sha256": "..."},
+            ...
+        ]
+    }
+
+Numa atualização, o manifesto é comparado com os arquivos já instalados e
+apenas os arquivos novos ou alterados são baixados individualmente. Arquivos
+das pastas gerenciadas que saíram do manifesto são removidos. Se o manifesto
+não existir, o instalador volta a baixar o ZIP completo.
+"""
+
+import fnmatch
+import hashlib
+import os
+import posixpath
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+
+from archive_cache import file_sha256
+from downloader import stream_response
+from http_session import REQUEST_TIMEOUT, get_session
+
+# ==========================================
+# ARQUIVOS GERENCIADOS PELA ATUALIZAÇÃO
+# ==========================================
+# Pastas substituídas por completo (saves, screenshots etc. nunca são tocados)
+MANAGED_FOLDERS = ["mods", "config", "resourcepacks", "shaderpacks"]
+
+# Arquivos soltos na raiz da instância que também são atualizados
+MANAGED_FILE_PATTERNS = [
+    "TLauncherAdditional.json",
+    "minecraftinstance.json",
+    "Minecraft Guerra 2 *.json",
+    "*.sql",
+]
+
+DELTA_WORKERS = 6
+SHA256_PATTERN = re.compile(r"[0-9a-fA-F]{64}")  # Formato do sha256 de cada arquivo do manifesto
+
+
+def safe_member_path(name):
+    """
+    Normaliza o nome de um membro do ZIP, recusando caminhos perigosos.
+
+    Returns:
+        str: Caminho relativo com '/', ou None se for absoluto ou sair da pasta
+    """
+    normalized = posixpath.normpath(name.replace('\\', '/'))
+    if normalized.startswith(('/', '../')) or normalized in ('.', '..') or ':' in normalized:
+        return None
+    return normalized
+
+
+def is_managed_path(rel_path):
+    """
+    Verifica se um caminho relativo (separado por '/') pertence às pastas ou
+    arquivos gerenciados pela atualização.
+
+    Args:
+        rel_path (str): Caminho relativo à raiz da instância
+
+    Returns:
+        bool: True se o arquivo deve ser atualizado pelo instalador
+    """
+    parts = rel_path.split('/')
+    if len(parts) > 1:
+        return parts[0] in MANAGED_FOLDERS
+    return any(fnmatch.fnmatch(rel_path, pattern) for pattern in MANAGED_FILE_PATTERNS)
+
+
+def manifest_url_for(archive_url):
+    """
+    Retorna a URL do manifesto publicado ao lado do ZIP.
+
+    Ex: '.../Guerra-2-Full.zip' -> '.../Guerra-2-Full.manifest.json'
+    """
+    base, _ = posixpath.splitext(archive_url.split('?')[0])
+    return f"{base}.manifest.json"
+
+
+def iter_managed_files(target_dir):
+    """
+    Percorre os arquivos gerenciados já instalados.
+
+    Yields:
+        tuple: (caminho relativo com '/', caminho absoluto)
+    """
+    if not os.path.isdir(target_dir):
+        return
+    for name in os.listdir(target_dir):
+        path = os.path.join(target_dir, name)
+        if os.path.isfile(path) and is_managed_path(name):
+            yield name, path
+
+    for folder in MANAGED_FOLDERS:
+        folder_path = os.path.join(target_dir, folder)
+        for root, _, files in os.walk(folder_path):
+            for name in files:
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, target_dir).replace(os.sep, '/'), path
+
+
+def valid_manifest_entry(entry):
+    """Verifica o formato de uma entrada do manifesto (path, size inteiro, sha256 hexadecimal)."""
+    return (isinstance(entry, dict)
+            and isinstance(entry.get("path"), str)
+            and type(entry.get("size")) is int and entry["size"] >= 0
+            and isinstance(entry.get("sha256"), str) and SHA256_PATTERN.fullmatch(entry["sha256"]) is not None)
+
+
+class DeltaUpdater:
+    """
+    Aplica uma atualização baixando apenas os arquivos que mudaram.
+    """
+
+    def __init__(self, manifest_url, workers=DELTA_WORKERS):
+        """
+        Args:
+            manifest_url (str): URL do manifesto JSON da versão
+            workers (int): Downloads de arquivos simultâneos
+        """
+        self.manifest_url = manifest_url
+        self.workers = max(1, workers)
+        self.session = get_session()
+        self._lock = threading.Lock()
+        self._downloaded = 0
+        self.stats = {}  # Arquivos baixados/removidos na última atualização aplicada
+
+    def fetch_manifest(self):
+        """
+        Baixa e valida o manifesto.
+
+        Returns:
+            dict: Manifesto, ou None se não estiver disponível
+        """
+        try:
+            response = self.session.get(self.manifest_url, timeout=REQUEST_TIMEOUT)
+            if response.status_code != 200:
+                return None
+            manifest = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"Manifesto indisponível ({self.manifest_url}): {e}")
+            return None
+
+        files = manifest.get("files") if isinstance(manifest, dict) else None
+        if not isinstance(files, list):
+            return None
+        for entry in files:
+            if not valid_manifest_entry(entry):
+                print(f"Manifesto inválido: entrada malformada {str(entry)[:100]}")
+                return None
+            path = entry["path"]
+            # Recusa caminhos absolutos, com '..', '\\', ':' ou fora das pastas gerenciadas
+            if safe_member_path(path) != path or not is_managed_path(path):
+                print(f"Manifesto inválido: caminho não permitido '{path}'")
+                return None
+
+        if not isinstance(manifest.get("base_url"), str) or not manifest["base_url"]:
+            manifest["base_url"] = self.manifest_url[:-len(".manifest.json")] + "/"
+        return manifest
+
+    def plan(self, manifest, target_dir, index=None):
+        """
+        Compara o manifesto com a instalação atual.
+
+        O hash só é calculado quando o tamanho coincide; arquivos com tamanho
+        diferente já são considerados alterados. Com o índice da instância, o
+        hash de arquivos que não mudaram desde a última instalação vem do índice.
+
+        Args:
+            manifest (dict): Manifesto da nova versão
+            target_dir (str): Diretório da instância instalada
+            index (InstanceIndex): Índice de arquivos da instância (opcional)
+
+        Returns:
+            tuple: (entradas do manifesto a baixar, caminhos relativos a remover)
+        """
+        wanted = {entry["path"]: entry for entry in manifest["files"]}
+        installed = dict(iter_managed_files(target_dir))
+
+        to_fetch = []
+        for rel_path, entry in wanted.items():
+            path = installed.get(rel_path)
+            if path is None or os.path.getsize(path) != entry["size"]:
+                to_fetch.append(entry)
+                continue
+            sha256 = index.sha256(rel_path) if index is not None else file_sha256(path)
+            if sha256 != entry["sha256"].lower():
+                to_fetch.append(entry)
+
+        # Como no ZIP completo, arquivos soltos da raiz são apenas substituídos;
+        # somente o conteúdo das pastas gerenciadas é removido
+        to_delete = [rel_path for rel_path in installed
+                     if '/' in rel_path and rel_path not in wanted]
+        return to_fetch, to_delete
+
+    def apply(self, target_dir, progress_callback=None, index=None):
+        """
+        Atualiza a instância usando o manifesto.
+
+        Args:
+            target_dir (str): Diretório da instância instalada
+            progress_callback (callable): Função chamada com (bytes baixados, total)
+            index (InstanceIndex): Índice de arquivos da instância, consultado no
+                                   planejamento e atualizado a cada arquivo
+
+        Returns:
+            bool: True se a atualização foi aplicada; False se o manifesto não
+                  está disponível (o chamador deve usar o ZIP completo)
+        """
+        manifest = self.fetch_manifest()
+        if manifest is None:
+            return False
+
+        to_fetch, to_delete = self.plan(manifest, target_dir, index)
+        total_bytes = sum(entry["size"] for entry in to_fetch)
+        print(f"Atualização incremental: {len(to_fetch)} arquivo(s) ({total_bytes} bytes), "
+              f"{len(to_delete)} removido(s)")
+
+        self._downloaded = 0
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(self._fetch_file, manifest["base_url"], entry, target_dir,
+                                total_bytes, progress_callback, index)
+                    for entry in to_fetch
+                ]
+                for future in futures:
+                    future.result()
+
+        # Só remove arquivos depois que todos os novos foram baixados com sucesso
+        for rel_path in to_delete:
+            os.remove(os.path.join(target_dir, *rel_path.split('/')))
+            if index is not None:
+                index.remove(rel_path)
+
+        self.stats = {"fetched": len(to_fetch), "bytes": total_bytes, "deleted": len(to_delete)}
+        return True
+
+    def _fetch_file(self, base_url, entry, target_dir, total_bytes, progress_callback, index=None):
+        """Baixa um arquivo, confere o SHA-256 e o move para o lugar."""
+        dest = os.path.join(target_dir, *entry["path"].split('/'))
+        tmp_path = dest + ".tmp"
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+        digest = hashlib.sha256()
+        url = base_url + quote(entry["path"])
+        try:
+            with self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                with open(tmp_path, 'wb') as f:
+                    def on_chunk(chunk):
+                        digest.update(chunk)
+                        with self._lock:
+                            self._downloaded += len(chunk)
+                            if progress_callback:
+                                progress_callback(self._downloaded, total_bytes)
+
+                    stream_response(response, f, on_chunk=on_chunk)
+
+            if digest.hexdigest() != entry["sha256"].lower():
+                raise IOError(f"Hash incorreto para {entry['path']}")
+            os.replace(tmp_path, dest)
+            if index is not None:
+                index.record(entry["path"], sha256=entry["sha256"])
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,601 @@
+"""
+Motor de Download do Modpack
+============================
+
+Baixa os arquivos do modpack (150-550 MB) dividindo-os em faixas de bytes
+(HTTP Range) que são buscadas em paralelo e escritas diretamente na posição
+correspondente de um arquivo pré-alocado.
+
+Quando o servidor não anuncia suporte a faixas (Accept-Ranges) ou não informa
+o tamanho do arquivo (Content-Length), o download é feito em um único stream.
+
+Downloads interrompidos podem ser retomados: os bytes ficam em um arquivo
+'.part' dentro do diretório de cache e um arquivo lateral '.part.json' registra
+as faixas já concluídas junto com o ETag/Last-Modified do servidor.
+
+O SHA-256 do arquivo é calculado durante o próprio download (ver
+StreamingHasher), sem uma segunda leitura completa do arquivo no final.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from http_session import REQUEST_TIMEOUT, get_session
+
+# ==========================================
+# CONFIGURAÇÕES PADRÃO
+# ==========================================
+DEFAULT_WORKERS = 8                      # Conexões simultâneas por download
+MIN_RANGE_SIZE = 4 * 1024 * 1024         # Não divide arquivos em faixas menores que 4MB
+MIN_BUFFER_SIZE = 64 * 1024              # Bloco inicial/mínimo lido de cada resposta
+MAX_BUFFER_SIZE = 4 * 1024 * 1024        # Bloco máximo (ajustado conforme a vazão)
+FAST_READ_SECONDS = 0.05                 # Leitura cheia mais rápida que isso: dobra o bloco
+SLOW_READ_SECONDS = 0.25                 # Leitura mais lenta que isso: reduz o bloco
+CHECKPOINT_SIZE = 4 * 1024 * 1024        # Registra progresso no arquivo lateral a cada 4MB
+HASH_READ_SIZE = 1024 * 1024             # Bloco lido do disco ao alcançar faixas já baixadas
+
+# Evita que o servidor comprima a resposta, o que invalidaria os offsets das faixas
+IDENTITY_HEADERS = {"Accept-Encoding": "identity"}
+
+
+# Um buffer por thread, reaproveitado entre respostas (faixas, arquivos do delta)
+_buffers = threading.local()
+
+
+def _thread_buffer():
+    """Retorna o memoryview do buffer de leitura exclusivo da thread atual."""
+    view = getattr(_buffers, "view", None)
+    if view is None:
+        view = memoryview(bytearray(MAX_BUFFER_SIZE))
+        _buffers.view = view
+    return view
+
+
+def stream_response(response, f, limit=None, on_chunk=None):
+    """
+    Copia o corpo de uma resposta HTTP para um arquivo aberto.
+
+    Lê com 'readinto' para um único bytearray reaproveitado (sem criar um
+    objeto bytes por bloco) e ajusta o tamanho do bloco entre 64KB e 4MB
+    conforme a vazão observada: blocos cheios que chegam rápido dobram o
+    tamanho, leituras lentas o reduzem para manter o progresso fluido.
+
+    Args:
+        response (requests.Response): Resposta aberta com stream=True
+        f (file): Arquivo binário aberto para escrita na posição correta
+        limit (int): Máximo de bytes a copiar (None = até o fim da resposta)
+        on_chunk (callable): Função chamada com um memoryview de cada bloco escrito
+                             (válido apenas durante a chamada)
+
+    Returns:
+        int: Quantidade de bytes escritos
+    """
+    encoding = response.headers.get('content-encoding', 'identity').lower()
+    if encoding not in ('', 'identity'):
+        # Corpo comprimido: iter_content descomprime; não dá para usar readinto no raw
+        wrote = 0
+        for data in response.iter_content(MIN_BUFFER_SIZE):
+            if limit is not None:
+                data = data[:limit - wrote]
+            f.write(data)
+            wrote += len(data)
+            if on_chunk:
+                on_chunk(memoryview(data))
+            if limit is not None and wrote >= limit:
+                break
+        return wrote
+
+    view = _thread_buffer()
+    size = MIN_BUFFER_SIZE
+    wrote = 0
+    raw = response.raw
+
+    while limit is None or wrote < limit:
+        want = size if limit is None else min(size, limit - wrote)
+        started = time.perf_counter()
+        count = raw.readinto(view[:want])
+        if not count:
+            break
+        elapsed = time.perf_counter() - started
+
+        chunk = view[:count]
+        f.write(chunk)
+        wrote += count
+        if on_chunk:
+            on_chunk(chunk)
+
+        # Ajusta o bloco à vazão observada
+        if count == want and elapsed < FAST_READ_SECONDS and size < MAX_BUFFER_SIZE:
+            size *= 2
+        elif elapsed > SLOW_READ_SECONDS and size > MIN_BUFFER_SIZE:
+            size //= 2
+
+    return wrote
+
+
+def get_cache_dir(name="downloads"):
+    """
+    Retorna um diretório persistente do instalador.
+
+    Args:
+        name (str): Subpasta desejada (ex: 'downloads', 'archives')
+
+    Returns:
+        str: Caminho do diretório de cache (criado se não existir)
+    """
+    base = os.getenv('LOCALAPPDATA') or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = os.path.join(base, "MinecraftGuerra2Installer", name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+class StreamingHasher:
+    """
+    SHA-256 calculado à medida que os bytes chegam, em ordem de offset.
+
+    No download em faixas os blocos chegam fora de ordem: apenas a faixa que
+    está na fronteira do hash (a primeira ainda não incorporada) é alimentada
+    direto da memória. Quando ela termina, as faixas seguintes já concluídas
+    são lidas de volta do '.part' (ainda no cache de páginas do sistema) até a
+    próxima lacuna, e a faixa que estiver sendo baixada ali assume a fronteira.
+    """
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+        self.position = 0  # Bytes [0, position) já incorporados ao hash
+        self._lock = threading.Lock()
+
+    def update(self, offset, chunk):
+        """
+        Incorpora o bloco se ele começar exatamente onde o hash parou.
+
+        Args:
+            offset (int): Offset do bloco no arquivo
+            chunk (bytes): Conteúdo do bloco
+
+        Returns:
+            bool: True se o bloco foi incorporado
+        """
+        with self._lock:
+            if offset != self.position:
+                return False
+            self._digest.update(chunk)
+            self.position += len(chunk)
+            return True
+
+    def catch_up(self, path, end):
+        """
+        Incorpora os bytes [position, end) lendo-os do arquivo.
+
+        Args:
+            path (str): Arquivo já escrito até end
+            end (int): Offset (exclusivo) até onde os bytes estão completos
+        """
+        with self._lock:
+            if self.position >= end:
+                return
+            with open(path, 'rb') as f:
+                f.seek(self.position)
+                while self.position < end:
+                    block = f.read(min(HASH_READ_SIZE, end - self.position))
+                    if not block:
+                        raise IOError(f"Arquivo terminou antes do esperado ao calcular o hash: {path}")
+                    self._digest.update(block)
+                    self.position += len(block)
+
+    def hexdigest(self):
+        """Retorna o hash dos bytes incorporados até agora."""
+        with self._lock:
+            return self._digest.hexdigest()
+
+
+class DownloadState:
+    """
+    Estado persistente de um download parcial.
+
+    Guarda, em um arquivo JSON ao lado do '.part', as faixas de bytes já
+    escritas em disco e os validadores (ETag/Last-Modified) do arquivo remoto.
+    As faixas são semiabertas: [início, fim).
+    """
+
+    def __init__(self, part_path):
+        """
+        Args:
+            part_path (str): Caminho do arquivo '.part'
+        """
+        self.part_path = part_path
+        self.path = part_path + ".json"
+        self.info = {}
+        self.completed = []
+        self.on_change = None  # Chamado (sem argumentos) sempre que uma faixa é concluída
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Carrega o estado salvo. Retorna False se não houver estado válido."""
+        if not os.path.exists(self.path) or not os.path.exists(self.part_path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.info = data.get("remote", {})
+            self.completed = [tuple(r) for r in data.get("completed", [])]
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def matches(self, info):
+        """Verifica se o arquivo remoto ainda é o mesmo do download parcial."""
+        if not self.info or self.info.get("size") != info.get("size"):
+            return False
+        if info.get("etag") or self.info.get("etag"):
+            return self.info.get("etag") == info.get("etag")
+        if info.get("last_modified") or self.info.get("last_modified"):
+            return self.info.get("last_modified") == info.get("last_modified")
+        return False  # Sem validadores não há como garantir que é o mesmo arquivo
+
+    def reset(self, info):
+        """Descarta o progresso e associa o estado a um novo arquivo remoto."""
+        self.info = dict(info)
+        self.completed = []
+        self.save()
+
+    def mark(self, start, end):
+        """Registra a faixa [start, end) como concluída e persiste o estado."""
+        if end <= start:
+            return
+        with self._lock:
+            merged = []
+            for r_start, r_end in sorted(self.completed + [(start, end)]):
+                if merged and r_start <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], r_end))
+                else:
+                    merged.append((r_start, r_end))
+            self.completed = merged
+            self.save()
+        if self.on_change:
+            self.on_change()
+
+    def completed_bytes(self):
+        """Retorna o total de bytes já baixados."""
+        return sum(end - start for start, end in self.completed)
+
+    def missing(self, total_size, start=0):
+        """
+        Calcula as faixas que ainda faltam baixar.
+
+        Args:
+            total_size (int): Fim (exclusivo) do trecho considerado
+            start (int): Início do trecho considerado
+
+        Returns:
+            list: Lista de tuplas (início, fim) semiabertas
+        """
+        gaps = []
+        position = start
+        for r_start, r_end in self.completed:
+            if r_end <= position:
+                continue
+            if r_start > position:
+                gaps.append((position, min(r_start, total_size)))
+            position = max(position, r_end)
+            if position >= total_size:
+                break
+        if position < total_size:
+            gaps.append((position, total_size))
+        return gaps
+
+    def contiguous_end(self):
+        """Retorna até onde o arquivo está completo a partir do byte 0."""
+        if self.completed and self.completed[0][0] == 0:
+            return self.completed[0][1]
+        return 0
+
+    def covers(self, start, end):
+        """Verifica se todo o trecho [start, end) já foi baixado."""
+        for r_start, r_end in self.completed:
+            if r_start <= start and end <= r_end:
+                return True
+            if r_start > start:
+                break
+        return False
+
+    def save(self):
+        """Grava o estado de forma atômica (arquivo temporário + rename)."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"remote": self.info, "completed": self.completed}, f)
+        os.replace(tmp_path, self.path)
+
+    def discard(self):
+        """Remove o arquivo de estado."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ChunkedDownloader:
+    """
+    Baixa um arquivo usando várias conexões HTTP simultâneas.
+
+    Cada thread do pool recebe uma faixa de bytes e a escreve diretamente no
+    seu offset do arquivo '.part', que é pré-alocado com o tamanho final. O
+    progresso é registrado em um DownloadState para permitir retomada.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, min_range_size=MIN_RANGE_SIZE, preallocate=True):
+        """
+        Args:
+            workers (int): Número máximo de faixas baixadas ao mesmo tempo
+            min_range_size (int): Tamanho mínimo (bytes) de cada faixa
+            preallocate (bool): No download em stream único, reserva o tamanho
+                                informado pelo Content-Length antes de escrever
+        """
+        self.workers = max(1, workers)
+        self.min_range_size = max(1, min_range_size)
+        self.preallocate = preallocate
+        self._lock = threading.Lock()
+        self._downloaded = 0
+        self.remote_info = {}  # Resultado do último probe (tamanho, ETag, Last-Modified)
+        self.sha256 = None     # SHA-256 do último arquivo baixado (calculado no download)
+        self.resumed_bytes = 0  # Bytes aproveitados de um download parcial (registrados no trace)
+        self._hasher = None
+
+    def probe(self, url):
+        """
+        Descobre tamanho, suporte a faixas e validadores do arquivo remoto.
+
+        Args:
+            url (str): URL do arquivo
+
+        Returns:
+            dict: Chaves 'size' (0 se desconhecido), 'accepts_ranges',
+                  'etag' e 'last_modified'
+        """
+        try:
+            response = get_session().head(url, allow_redirects=True, headers=IDENTITY_HEADERS,
+                                          timeout=REQUEST_TIMEOUT)
+            if response.ok:
+                info = self._remote_info(response, int(response.headers.get('content-length', 0)))
+                info["accepts_ranges"] = response.headers.get('accept-ranges', '').lower() == 'bytes'
+                if info["size"] > 0 and info["accepts_ranges"]:
+                    return info
+        except requests.RequestException:
+            pass
+
+        # Alguns servidores não respondem HEAD corretamente: testa com um GET de 1 byte
+        headers = dict(IDENTITY_HEADERS, Range="bytes=0-0")
+        with get_session().get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            content_range = response.headers.get('content-range', '')
+            total = content_range.rsplit('/', 1)[-1]
+            if response.status_code == 206 and total.isdigit():
+                info = self._remote_info(response, int(total))
+                info["accepts_ranges"] = True
+            else:
+                info = self._remote_info(response, int(response.headers.get('content-length', 0)))
+                info["accepts_ranges"] = False
+            return info
+
+    @staticmethod
+    def _remote_info(response, size):
+        """Extrai tamanho e validadores de uma resposta HTTP."""
+        return {
+            "size": size,
+            "etag": response.headers.get('etag'),
+            "last_modified": response.headers.get('last-modified'),
+        }
+
+    def split_ranges(self, gaps):
+        """
+        Subdivide as faixas pendentes para distribuí-las entre as threads.
+
+        Args:
+            gaps (list): Faixas semiabertas (início, fim) que faltam baixar
+
+        Returns:
+            list: Faixas semiabertas (início, fim) com no máximo ~workers itens
+        """
+        total_missing = sum(end - start for start, end in gaps)
+        piece = max(self.min_range_size, -(-total_missing // self.workers))
+        ranges = []
+        for gap_start, gap_end in gaps:
+            for start in range(gap_start, gap_end, piece):
+                ranges.append((start, min(start + piece, gap_end)))
+        return ranges
+
+    def download(self, url, dest_path, progress_callback=None):
+        """
+        Baixa o arquivo para dest_path, retomando um download anterior se houver.
+
+        Os bytes são escritos em 'dest_path.part' e o arquivo só é renomeado
+        para dest_path depois de completo.
+
+        Args:
+            url (str): URL do arquivo
+            dest_path (str): Caminho do arquivo de destino
+            progress_callback (callable): Função chamada com (bytes baixados, total)
+
+        Returns:
+            int: Quantidade de bytes do arquivo final
+        """
+        state = self.prepare(url, dest_path)
+        if state is None:
+            part_path = dest_path + ".part"
+            wrote = self._download_single(url, part_path, self.remote_info["size"], progress_callback)
+            os.replace(part_path, dest_path)
+            self.sha256 = self._hasher.hexdigest()
+            return wrote
+
+        total_size = state.info["size"]
+        self.fetch_ranges(url, state, state.missing(total_size), progress_callback)
+        self.finish(state, dest_path)
+        return total_size
+
+    def prepare(self, url, dest_path):
+        """
+        Consulta o servidor e prepara o arquivo '.part' para download em faixas.
+
+        Se existir um download parcial do mesmo arquivo remoto ele é retomado;
+        caso contrário o '.part' é pré-alocado com o tamanho final.
+
+        Args:
+            url (str): URL do arquivo
+            dest_path (str): Caminho do arquivo de destino
+
+        Returns:
+            DownloadState: Estado do download, ou None se o servidor não aceita faixas
+        """
+        state = DownloadState(dest_path + ".part")
+        info = self.probe(url)
+        self.remote_info = info
+        self.sha256 = None
+        self.resumed_bytes = 0
+        self._hasher = StreamingHasher()
+        total_size = info["size"]
+
+        if not info["accepts_ranges"] or total_size <= 0:
+            state.discard()
+            return None
+
+        # Retoma apenas se o arquivo remoto não mudou desde o download parcial
+        if state.load() and state.matches(info) and os.path.getsize(state.part_path) == total_size:
+            # Registrada no trace pelo chamador; o progresso já parte dos bytes baixados
+            self.resumed_bytes = state.completed_bytes()
+        else:
+            # Pré-aloca o arquivo para que cada faixa escreva no seu próprio offset
+            with open(state.part_path, 'wb') as f:
+                f.truncate(total_size)
+            state.reset(info)
+
+        self._downloaded = state.completed_bytes()
+        return state
+
+    def fetch_ranges(self, url, state, gaps, progress_callback=None):
+        """
+        Baixa em paralelo as faixas informadas para o arquivo '.part'.
+
+        Args:
+            url (str): URL do arquivo
+            state (DownloadState): Estado retornado por prepare()
+            gaps (list): Faixas semiabertas (início, fim) a baixar
+            progress_callback (callable): Função chamada com (bytes baixados, total)
+        """
+        ranges = self.split_ranges(gaps)
+        if not ranges:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(ranges))) as pool:
+            futures = [
+                pool.submit(self._download_range, url, state.part_path, start, end,
+                            state.info["size"], state, progress_callback)
+                for start, end in ranges
+            ]
+            # result() propaga a primeira exceção ocorrida em qualquer faixa
+            for future in futures:
+                future.result()
+
+    def finish(self, state, dest_path):
+        """Conclui o hash, move o '.part' completo para dest_path e remove o estado."""
+        self._hasher.catch_up(state.part_path, state.info["size"])
+        self.sha256 = self._hasher.hexdigest()
+        os.replace(state.part_path, dest_path)
+        state.discard()
+
+    def _download_range(self, url, part_path, start, end, total_size, state, progress_callback,
+                        info=None, chunk_hook=None, timeout=REQUEST_TIMEOUT):
+        """
+        Baixa a faixa [start, end) e a escreve no offset correspondente.
+
+        Args:
+            info (dict): Validadores do servidor consultado (padrão: os do estado)
+            chunk_hook (callable): Chamado com o tamanho de cada bloco; pode lançar
+                                   uma exceção para abortar a faixa
+            timeout (tuple): Timeouts (conexão, leitura) da requisição
+        """
+        info = info or state.info
+        headers = dict(IDENTITY_HEADERS, Range=f"bytes={start}-{end - 1}")
+        # If-Range garante que a resposta parcial pertence à mesma versão do arquivo
+        etag = info.get("etag")
+        validator = etag if etag and not etag.startswith("W/") else info.get("last_modified")
+        if validator:
+            headers["If-Range"] = validator
+
+        position = start
+        checkpoint = start
+
+        with get_session().get(url, headers=headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise IOError(f"Servidor ignorou a faixa {start}-{end - 1} (HTTP {response.status_code})")
+
+            with open(part_path, 'r+b') as f:
+                f.seek(start)
+
+                def on_chunk(chunk):
+                    nonlocal position, checkpoint
+                    # Se esta faixa está na fronteira do hash, o bloco entra direto da memória
+                    self._hasher.update(position, chunk)
+                    position += len(chunk)
+                    self._report(len(chunk), total_size, progress_callback)
+
+                    # Persiste o progresso periodicamente para permitir retomada
+                    if position - checkpoint >= CHECKPOINT_SIZE:
+                        f.flush()
+                        state.mark(checkpoint, position)
+                        checkpoint = position
+                        self._advance_hash(state)
+
+                    if chunk_hook:
+                        chunk_hook(len(chunk))
+
+                try:
+                    # limit: nunca escreve além da faixa
+                    stream_response(response, f, limit=end - start, on_chunk=on_chunk)
+                finally:
+                    # Mesmo se a conexão cair, o que já foi escrito fica registrado
+                    f.flush()
+                    state.mark(checkpoint, position)
+                self._advance_hash(state)
+
+        if position != end:
+            raise IOError(f"Faixa {start}-{end - 1} incompleta: {position - start} de {end - start} bytes")
+
+    def _advance_hash(self, state):
+        """Incorpora ao hash as faixas concluídas logo após a fronteira atual."""
+        self._hasher.catch_up(state.part_path, state.contiguous_end())
+
+    def _download_single(self, url, dest_path, total_size, progress_callback):
+        """Fallback: baixa o arquivo inteiro em um único stream."""
+        self._downloaded = 0
+        self._hasher = StreamingHasher()
+        with get_session().get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            total_size = total_size or int(response.headers.get('content-length', 0))
+
+            with open(dest_path, 'wb') as f:
+                # Reservar o espaço de uma vez reduz a fragmentação do arquivo
+                if self.preallocate and total_size > 0:
+                    f.truncate(total_size)
+                    f.seek(0)
+                def on_chunk(chunk):
+                    # Stream único: os blocos chegam em ordem e todos entram no hash
+                    self._hasher.update(self._hasher.position, chunk)
+                    self._report(len(chunk), total_size, progress_callback)
+
+                wrote = stream_response(response, f, on_chunk=on_chunk)
+                if wrote != total_size:
+                    f.truncate(wrote)
+
+        return wrote
+
+    def _report(self, size, total_size, progress_callback):
+        """Acumula o progresso de todas as faixas e notifica o callback."""
+        with self._lock:
+            self._downloaded += size
+            if progress_callback:
+                progress_callback(self._downloaded, total_size)
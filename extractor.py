@@ -0,0 +1,335 @@
+"""
+Extração Paralela do Modpack
+============================
+
+Descompacta o ZIP do modpack usando várias threads. Cada thread abre o seu
+próprio handle do ZipFile (o objeto não é seguro para uso concorrente) e
+descompacta um lote de membros por vez; a descompressão do zlib e a escrita
+em disco liberam o GIL, então as threads trabalham de fato em paralelo.
+
+Todas as pastas são criadas antes da extração começar, e o progresso de todas
+as threads é agregado em um único callback.
+
+A mesma divisão em lotes serve para validar o CRC de todos os membros (verify)
+antes de qualquer arquivo ser escrito no destino.
+
+Com um ContentStore (content_store.py), cada membro é descompactado apenas se
+ainda não estiver no armazenamento compartilhado e ligado na instância.
+
+No modo de pouca memória (lazy=True) o ZIP é lido com lazy_zip.LazyZip: os
+membros vêm do diretório central sob demanda, as pastas são criadas à medida
+que aparecem e no máximo dois lotes por thread ficam em andamento, então a
+memória usada não cresce com a quantidade de arquivos do modpack.
+"""
+
+import os
+import shutil
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from file_sync import COPY_BUFFER_SIZE, safe_member_path
+from lazy_zip import LazyZip
+
+DEFAULT_EXTRACT_WORKERS = min(8, (os.cpu_count() or 2) * 2)
+BATCH_MAX_FILES = 64                    # Máximo de membros por lote
+BATCH_MAX_BYTES = 16 * 1024 * 1024      # Máximo de bytes descompactados por lote
+LAZY_BUFFER_SIZE = 256 * 1024           # Bloco de cópia no modo de pouca memória
+LAZY_BATCHES_PER_WORKER = 2             # Lotes em andamento por thread no modo de pouca memória
+
+
+class ParallelExtractor:
+    """
+    Extrai membros de um ZIP em paralelo para um diretório.
+    """
+
+    def __init__(self, workers=DEFAULT_EXTRACT_WORKERS, store=None, lazy=False):
+        """
+        Args:
+            workers (int): Número de threads de extração
+            store (ContentStore): Armazenamento compartilhado (None extrai direto)
+            lazy (bool): Modo de pouca memória (diretório central lido sob demanda)
+        """
+        self.workers = max(1, workers)
+        self.store = store
+        self.lazy = lazy
+        self.buffer_size = LAZY_BUFFER_SIZE if lazy else COPY_BUFFER_SIZE
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._handles = []
+        self._done = 0
+
+    def extract_all(self, zip_path, target_dir, progress_callback=None, members=None):
+        """
+        Extrai o ZIP (ou apenas os membros informados) para target_dir.
+
+        Args:
+            zip_path (str): Caminho do arquivo ZIP
+            target_dir (str): Diretório de destino
+            progress_callback (callable): Função chamada com (extraídos, total, nome)
+            members (list): Nomes dos membros a extrair (padrão: todos)
+
+        Returns:
+            int: Quantidade de arquivos extraídos
+        """
+        if self.lazy:
+            with LazyZip(zip_path) as zip_ref:
+                infos = zip_ref.infolist()
+                wanted = set(members) if members is not None else None
+                self._done = 0
+                return self._run_bounded(self.extract_batch, zip_path,
+                                         self._iter_files(infos, target_dir, wanted),
+                                         self._count_files(infos, wanted), progress_callback)[0]
+
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            infos = zip_ref.infolist()
+        if members is not None:
+            wanted = set(members)
+            infos = [info for info in infos if info.filename in wanted]
+
+        files = self.prepare(infos, target_dir)
+        total = len(files)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(self.extract_batch, zip_path, batch, total, progress_callback)
+                    for batch in self.make_batches(files)
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            self.close()
+
+        return total
+
+    def verify(self, zip_path, progress_callback=None):
+        """
+        Descompacta todos os membros em memória, em paralelo, conferindo o CRC-32.
+
+        Nada é escrito em disco: serve para rejeitar um ZIP corrompido antes de
+        tocar no diretório de instalação.
+
+        Args:
+            zip_path (str): Caminho do arquivo ZIP
+            progress_callback (callable): Função chamada com (verificados, total, nome)
+
+        Returns:
+            int: Quantidade de arquivos verificados
+
+        Raises:
+            zipfile.BadZipFile: Se algum membro estiver corrompido
+        """
+        self._done = 0
+        if self.lazy:
+            with LazyZip(zip_path) as zip_ref:
+                infos = zip_ref.infolist()
+                files = ((info, None) for info in infos if not info.is_dir())
+                total = sum(1 for info in infos if not info.is_dir())
+                results = self._run_bounded(self.verify_batch, zip_path, files, total, progress_callback)[1]
+            bad = [name for names in results for name in names]
+        else:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                files = [(info, None) for info in zip_ref.infolist() if not info.is_dir()]
+
+            total = len(files)
+            try:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    futures = [
+                        pool.submit(self.verify_batch, zip_path, batch, total, progress_callback)
+                        for batch in self.make_batches(files)
+                    ]
+                    bad = [name for future in futures for name in future.result()]
+            finally:
+                self.close()
+
+        if bad:
+            raise zipfile.BadZipFile(f"{len(bad)} arquivo(s) corrompido(s) no ZIP: {', '.join(bad[:5])}")
+        return total
+
+    def verify_batch(self, zip_path, batch, total, progress_callback=None):
+        """
+        Lê até o fim cada membro do lote (o zipfile confere o CRC ao terminar).
+
+        Returns:
+            list: Nomes dos membros com CRC ou dados inválidos
+        """
+        zip_ref = self._zip_handle(zip_path)
+        bad = []
+        for info, _ in batch:
+            try:
+                with zip_ref.open(info) as src:
+                    while src.read(self.buffer_size):
+                        pass
+            except (zipfile.BadZipFile, zlib.error, EOFError):
+                bad.append(info.filename)
+
+        with self._lock:
+            self._done += len(batch)
+            if progress_callback:
+                progress_callback(self._done, total, batch[-1][0].filename)
+        return bad
+
+    def prepare(self, infos, target_dir):
+        """
+        Resolve os caminhos de destino, cria todas as pastas de uma vez e
+        zera o contador de progresso.
+
+        Args:
+            infos (list): Membros do ZIP (zipfile.ZipInfo)
+            target_dir (str): Diretório de destino
+
+        Returns:
+            list: Tuplas (ZipInfo, caminho de destino) apenas dos arquivos
+        """
+        files = []
+        folders = {target_dir}
+        for info in infos:
+            rel_path = safe_member_path(info.filename)
+            if not rel_path:
+                print(f"Ignorando membro com caminho inválido: {info.filename}")
+                continue
+            dest = os.path.join(target_dir, *rel_path.split('/'))
+            if info.is_dir():
+                folders.add(dest)
+            else:
+                folders.add(os.path.dirname(dest))
+                files.append((info, dest))
+        for folder in sorted(folders):
+            os.makedirs(folder, exist_ok=True)
+        self._done = 0
+        return files
+
+    def _iter_files(self, infos, target_dir, wanted=None):
+        """
+        Resolve o destino de cada membro à medida que o diretório central é
+        lido, criando as pastas conforme aparecem (modo de pouca memória).
+
+        Yields:
+            tuple: (ZipInfo, caminho de destino) apenas dos arquivos
+        """
+        folders = set()
+        for info in infos:
+            if wanted is not None and info.filename not in wanted:
+                continue
+            rel_path = safe_member_path(info.filename)
+            if not rel_path:
+                print(f"Ignorando membro com caminho inválido: {info.filename}")
+                continue
+            dest = os.path.join(target_dir, *rel_path.split('/'))
+            folder = dest if info.is_dir() else os.path.dirname(dest)
+            if folder not in folders:
+                os.makedirs(folder, exist_ok=True)
+                folders.add(folder)
+            if not info.is_dir():
+                yield info, dest
+
+    @staticmethod
+    def _count_files(infos, wanted=None):
+        """
+        Conta os arquivos que _iter_files vai produzir (total do progresso).
+
+        Uma passada a mais pelo diretório central, sem guardar os membros.
+        """
+        return sum(1 for info in infos
+                   if not info.is_dir() and (wanted is None or info.filename in wanted)
+                   and safe_member_path(info.filename))
+
+    def _run_bounded(self, func, zip_path, files, total, progress_callback):
+        """
+        Envia os lotes às threads à medida que são formados, com no máximo
+        LAZY_BATCHES_PER_WORKER lotes em andamento por thread.
+
+        Returns:
+            tuple: (quantidade de arquivos, resultados de cada lote)
+        """
+        slots = threading.BoundedSemaphore(self.workers * LAZY_BATCHES_PER_WORKER)
+        count = 0
+        results = []
+        pending = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for batch in self.make_batches(files):
+                    slots.acquire()
+                    future = pool.submit(func, zip_path, batch, total, progress_callback)
+                    future.add_done_callback(lambda _: slots.release())
+                    pending.append(future)
+                    count += len(batch)
+                    # Recolhe os lotes concluídos (um erro interrompe a extração cedo)
+                    finished = [f for f in pending if f.done()]
+                    pending = [f for f in pending if f not in finished]
+                    results.extend(f.result() for f in finished)
+                results.extend(f.result() for f in pending)
+        finally:
+            self.close()
+        return count, results
+
+    def close(self):
+        """Fecha os handles do ZIP abertos pelas threads."""
+        with self._lock:
+            for handle in self._handles:
+                handle.close()
+            self._handles = []
+        self._local = threading.local()
+
+    @staticmethod
+    def make_batches(files):
+        """
+        Agrupa os membros em lotes limitados por quantidade e tamanho.
+
+        Arquivos grandes (resourcepacks, jars) ficam em lotes próprios para
+        que não atrasem uma única thread com centenas de configs pequenas.
+        """
+        batch = []
+        batch_bytes = 0
+        for info, dest in files:
+            if batch and (len(batch) >= BATCH_MAX_FILES or batch_bytes + info.file_size > BATCH_MAX_BYTES):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append((info, dest))
+            batch_bytes += info.file_size
+        if batch:
+            yield batch
+
+    def _zip_handle(self, zip_path):
+        """Retorna o ZipFile exclusivo da thread atual, abrindo-o na primeira vez."""
+        handle = getattr(self._local, "zip_ref", None)
+        if handle is None:
+            # LazyZip só lê o fim do arquivo; o ZipFile carrega o diretório central
+            handle = (LazyZip if self.lazy else zipfile.ZipFile)(zip_path, 'r')
+            self._local.zip_ref = handle
+            with self._lock:
+                self._handles.append(handle)
+        return handle
+
+    def extract_batch(self, zip_path, batch, total, progress_callback=None):
+        """
+        Descompacta um lote de membros usando o handle da thread atual.
+
+        Args:
+            zip_path (str): Caminho do arquivo ZIP
+            batch (list): Tuplas (ZipInfo, caminho de destino)
+            total (int): Total de arquivos da extração (para o progresso)
+            progress_callback (callable): Função chamada com (extraídos, total, nome)
+        """
+        zip_ref = self._zip_handle(zip_path)
+        for info, dest in batch:
+            if self.store is not None:
+                self.store.install(zip_ref, info, dest, safe_member_path(info.filename))
+                continue
+            # Nome temporário + 'os.replace': nunca escreve através de um hardlink
+            # (na preparação transacional os arquivos são links da instância em uso)
+            tmp_path = dest + ".tmp"
+            try:
+                with zip_ref.open(info) as src, open(tmp_path, 'wb') as out:
+                    shutil.copyfileobj(src, out, self.buffer_size)
+                os.replace(tmp_path, dest)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        with self._lock:
+            self._done += len(batch)
+            if progress_callback:
+                progress_callback(self._done, total, batch[-1][0].filename)
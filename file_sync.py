@@ -0,0 +1,279 @@
+"""
+Sincronização Incremental de Arquivos
+=====================================
+
+As atualizações sincronizam a instância direto a partir do ZIP do modpack
+(sync_from_zip), sem extrair tudo para uma pasta intermediária: apenas os
+membros gerenciados novos ou alterados (tamanho + CRC-32, ou o índice da
+instância) são escritos, e arquivos que saíram das pastas gerenciadas são
+removidos.
+
+As funções de pasta para pasta (sync_directory/sync_file) ficam como
+alternativa da instalação transacional: quando uma entrada da instância não
+pode ser renomeada (ex: pasta aberta no Explorer), staged_install.py aplica
+a preparação sobre ela arquivo por arquivo. Cada arquivo é comparado com o
+destino (tamanho, data de modificação e, se necessário, SHA-256) e somente
+arquivos novos ou alterados são escritos.
+
+As escritas usam um nome temporário seguido de 'os.replace', de modo que um
+arquivo parcialmente copiado nunca fica visível no lugar do original.
+"""
+
+import os
+import shutil
+import zlib
+
+from archive_cache import file_sha256
+from delta_update import MANAGED_FOLDERS, is_managed_path, safe_member_path
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def files_match(src, dst):
+    """
+    Verifica se dst já tem o mesmo conteúdo de src.
+
+    A comparação é feita do teste mais barato para o mais caro: tamanho,
+    data de modificação e, por fim, SHA-256 dos dois arquivos.
+
+    Args:
+        src (str): Arquivo de origem
+        dst (str): Arquivo de destino
+
+    Returns:
+        bool: True se o destino pode ser mantido como está
+    """
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src)
+
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    # copy2 preserva a data: mesma data exata indica cópia anterior do mesmo arquivo
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    return file_sha256(src) == file_sha256(dst)
+
+
+def atomic_copy(src, dst):
+    """
+    Copia src para dst (com metadados) através de um arquivo temporário.
+
+    Args:
+        src (str): Arquivo de origem
+        dst (str): Arquivo de destino
+    """
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp_path = dst + ".tmp"
+    try:
+        shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def sync_file(src, dst):
+    """
+    Copia src para dst apenas se o conteúdo for diferente.
+
+    Returns:
+        bool: True se o arquivo foi escrito
+    """
+    if files_match(src, dst):
+        return False
+    atomic_copy(src, dst)
+    return True
+
+
+def sync_directory(source_dir, target_dir):
+    """
+    Deixa target_dir idêntico a source_dir escrevendo o mínimo possível.
+
+    Args:
+        source_dir (str): Pasta com o conteúdo novo
+        target_dir (str): Pasta a ser atualizada
+
+    Returns:
+        dict: Contadores 'copied', 'skipped' e 'deleted'
+    """
+    stats = {"copied": 0, "skipped": 0, "deleted": 0}
+    source_files = set()
+
+    # 1. Copia arquivos novos ou alterados
+    for root, _, files in os.walk(source_dir):
+        rel_root = os.path.relpath(root, source_dir)
+        for name in files:
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            source_files.add(rel_path)
+            if sync_file(os.path.join(source_dir, rel_path), os.path.join(target_dir, rel_path)):
+                stats["copied"] += 1
+            else:
+                stats["skipped"] += 1
+
+    # 2. Remove arquivos (e pastas vazias) que não existem mais na origem
+    for root, dirs, files in os.walk(target_dir, topdown=False):
+        rel_root = os.path.relpath(root, target_dir)
+        for name in files:
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            if rel_path not in source_files:
+                os.remove(os.path.join(root, name))
+                stats["deleted"] += 1
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            if not os.listdir(dir_path) and not os.path.isdir(os.path.join(source_dir, rel_root, name)):
+                os.rmdir(dir_path)
+
+    return stats
+
+
+# ==========================================
+# SINCRONIZAÇÃO DIRETA A PARTIR DO ZIP
+# ==========================================
+
+def file_crc32(path):
+    """Calcula o CRC-32 de um arquivo (mesmo algoritmo usado pelo ZIP)."""
+    crc = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+def member_matches(info, dst):
+    """
+    Verifica se dst já tem o conteúdo do membro do ZIP (tamanho + CRC-32).
+
+    Args:
+        info (zipfile.ZipInfo): Membro do ZIP
+        dst (str): Arquivo de destino
+
+    Returns:
+        bool: True se o destino pode ser mantido como está
+    """
+    try:
+        if os.path.getsize(dst) != info.file_size:
+            return False
+    except OSError:
+        return False
+    return file_crc32(dst) == info.CRC
+
+
+def extract_member_atomic(zip_ref, info, dst):
+    """
+    Descompacta um membro direto para dst através de um arquivo temporário.
+
+    Args:
+        zip_ref (zipfile.ZipFile): ZIP aberto
+        info (zipfile.ZipInfo): Membro a extrair
+        dst (str): Caminho final do arquivo
+    """
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp_path = dst + ".tmp"
+    try:
+        with zip_ref.open(info) as src, open(tmp_path, 'wb') as out:
+            shutil.copyfileobj(src, out, COPY_BUFFER_SIZE)
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def managed_member_path(info):
+    """
+    Caminho relativo de um membro do ZIP que é arquivo gerenciado.
+
+    Returns:
+        str: Caminho com '/', ou None para pastas, caminhos inválidos e
+             arquivos que a atualização não toca
+    """
+    rel_path = safe_member_path(info.filename)
+    if not rel_path or info.is_dir() or not is_managed_path(rel_path):
+        return None
+    return rel_path
+
+
+def sync_from_zip(zip_ref, target_dir, progress_callback=None, store=None, index=None):
+    """
+    Atualiza os arquivos gerenciados da instância direto a partir do ZIP.
+
+    Apenas membros permitidos (pastas mods, config, resourcepacks, shaderpacks
+    e os arquivos da raiz em MANAGED_FILE_PATTERNS) são considerados. Membros
+    idênticos ao que já está em disco não são reescritos, e arquivos das
+    pastas gerenciadas presentes no ZIP que não existem mais nele são removidos.
+
+    Os membros são processados na ordem do diretório central, sem montar uma
+    lista (com um lazy_zip.LazyZip, nada do diretório fica na memória); com
+    progress_callback, uma primeira passada conta os arquivos gerenciados.
+
+    Args:
+        zip_ref (zipfile.ZipFile): ZIP do modpack aberto (ou lazy_zip.LazyZip)
+        target_dir (str): Diretório da instância
+        progress_callback (callable): Função chamada com (processados, total, nome),
+                                      contando apenas os arquivos gerenciados
+        store (ContentStore): Armazenamento compartilhado (os membros alterados
+                              são ligados a partir dele em vez de descompactados)
+        index (InstanceIndex): Índice da instância: compara pelo CRC-32 guardado
+                               (sem reler arquivos que não mudaram) e registra
+                               cada arquivo escrito ou removido
+
+    Returns:
+        dict: Contadores 'copied', 'skipped' e 'deleted'
+    """
+    stats = {"copied": 0, "skipped": 0, "deleted": 0}
+    infos = zip_ref.infolist()
+    total = sum(1 for info in infos if managed_member_path(info)) if progress_callback else 0
+
+    # 1. Extrai membros novos ou alterados
+    wanted = set()
+    done = 0
+    for info in infos:
+        rel_path = managed_member_path(info)
+        if not rel_path:
+            continue
+        wanted.add(rel_path)
+        done += 1
+        dst = os.path.join(target_dir, *rel_path.split('/'))
+        if index is not None:
+            unchanged = index.matches_member(rel_path, info)
+        else:
+            unchanged = member_matches(info, dst)
+
+        if unchanged:
+            stats["skipped"] += 1
+        else:
+            if store is not None:
+                os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+                # Na atualização só passam os arquivos alterados: confere o CRC do objeto
+                store.install(zip_ref, info, dst, rel_path, verify=True)
+            else:
+                extract_member_atomic(zip_ref, info, dst)
+            if index is not None:
+                index.record(rel_path, crc32=info.CRC)
+            stats["copied"] += 1
+        if progress_callback:
+            progress_callback(done, total, rel_path)
+
+    # 2. Remove arquivos que saíram das pastas gerenciadas (só das que vieram no ZIP)
+    folders_in_zip = {rel_path.split('/')[0] for rel_path in wanted if '/' in rel_path}
+    for folder in MANAGED_FOLDERS:
+        if folder not in folders_in_zip:
+            continue
+        folder_path = os.path.join(target_dir, folder)
+        for root, dirs, files in os.walk(folder_path, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                rel_path = os.path.relpath(path, target_dir).replace(os.sep, '/')
+                if rel_path not in wanted:
+                    os.remove(path)
+                    stats["deleted"] += 1
+                    if index is not None:
+                        index.remove(rel_path)
+            for name in dirs:
+                dir_path = os.path.join(root, name)
+                if not os.listdir(dir_path):
+                    os.rmdir(dir_path)
+
+    return stats
@@ -0,0 +1,185 @@
+"""
+Sessão HTTP Compartilhada do Instalador
+=======================================
+
+Todas as requisições do instalador (probe, faixas do download, mirrors,
+manifesto, arquivos do delta, checksum e revalidação do cache) passam por uma
+única requests.Session configurada para:
+
+- Reaproveitar conexões (keep-alive) em um pool limitado por servidor; quando
+  o pool está cheio a thread espera uma conexão livre em vez de abrir outra
+- Aplicar timeouts de conexão e de leitura em toda requisição, para que um
+  socket travado nunca prenda a instalação
+- Repetir falhas de conexão e respostas 429/5xx com espera exponencial e
+  jitter (respeitando Retry-After)
+- Contar requisições, conexões novas x reaproveitadas e tentativas repetidas
+"""
+
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# ==========================================
+# CONFIGURAÇÕES PADRÃO
+# ==========================================
+REQUEST_TIMEOUT = (10, 60)               # (conexão, leitura) em segundos
+POOL_MAXSIZE = 16                        # Conexões mantidas por servidor
+POOL_HOSTS = 8                           # Servidores com pool mantido (mirrors)
+MAX_RETRIES = 4                          # Tentativas extras por requisição
+BACKOFF_FACTOR = 0.5                     # Espera base: 0.5s, 1s, 2s, 4s...
+BACKOFF_MAX = 20                         # Espera máxima entre tentativas (segundos)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class SessionMetrics:
+    """
+    Contadores de uso da sessão (seguros para várias threads).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connection_uses = 0   # Conexões tiradas do pool (uma por tentativa)
+        self.new_connections = 0
+        self.retries = 0
+
+    def add(self, name, amount=1):
+        """Incrementa o contador informado."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        """
+        Retorna os contadores atuais.
+
+        Returns:
+            dict: requests, new_connections, reused_connections e retries
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.connection_uses - self.new_connections,
+                "retries": self.retries,
+            }
+
+
+class JitterRetry(Retry):
+    """
+    Retry com espera exponencial sorteada entre 50% e 100% do valor base.
+
+    O Retry é imutável (cada tentativa cria uma nova instância com new()), por
+    isso as métricas ficam em uma subclasse criada por sessão.
+    """
+
+    metrics = None
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff * random.uniform(0.5, 1.0)
+
+    def increment(self, *args, **kwargs):
+        if self.metrics is not None:
+            self.metrics.add("retries")
+        return super().increment(*args, **kwargs)
+
+
+class InstallerAdapter(HTTPAdapter):
+    """
+    HTTPAdapter com timeout padrão e contagem de conexões novas e reaproveitadas.
+    """
+
+    def __init__(self, metrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        metrics = self.metrics
+
+        def counting(pool_class):
+            class CountingPool(pool_class):
+                def _get_conn(self, *args, **kwargs):
+                    # Devolve uma conexão ociosa ou chama _new_conn para abrir outra
+                    metrics.add("connection_uses")
+                    return super()._get_conn(*args, **kwargs)
+
+                def _new_conn(self):
+                    metrics.add("new_connections")
+                    return super()._new_conn()
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool),
+            "https": counting(HTTPSConnectionPool),
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        self.metrics.add("requests")
+        return super().send(request, timeout=timeout or REQUEST_TIMEOUT, **kwargs)
+
+
+def create_session(pool_maxsize=POOL_MAXSIZE, max_retries=MAX_RETRIES, metrics=None):
+    """
+    Cria uma sessão configurada (pool, timeouts, repetição e métricas).
+
+    Args:
+        pool_maxsize (int): Conexões mantidas por servidor
+        max_retries (int): Tentativas extras para falhas de conexão e 429/5xx
+        metrics (SessionMetrics): Contadores a usar (padrão: novos)
+
+    Returns:
+        requests.Session: Sessão com o atributo 'metrics' (SessionMetrics)
+    """
+    metrics = metrics or SessionMetrics()
+    retry_class = type("SessionRetry", (JitterRetry,), {"metrics": metrics})
+    retry = retry_class(
+        total=max_retries,
+        connect=max_retries,
+        # Erros até o cabeçalho (ex: conexão keep-alive já fechada pelo servidor);
+        # falhas no meio do corpo são tratadas pela retomada das faixas
+        read=2,
+        status=max_retries,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_max=BACKOFF_MAX,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Devolve a última resposta; raise_for_status decide
+    )
+
+    adapter = InstallerAdapter(metrics, pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize,
+                               pool_block=True, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.metrics = metrics
+    return session
+
+
+_metrics = SessionMetrics()
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(max_retries=MAX_RETRIES):
+    """
+    Retorna a sessão compartilhada por todo o instalador (criada no primeiro uso).
+
+    Args:
+        max_retries (int): Política de repetição; cada valor tem sua própria
+                           sessão, mas todas somam nas mesmas métricas
+
+    Returns:
+        requests.Session: Sessão configurada
+    """
+    with _sessions_lock:
+        session = _sessions.get(max_retries)
+        if session is None:
+            session = create_session(max_retries=max_retries, metrics=_metrics)
+            _sessions[max_retries] = session
+        return session
@@ -0,0 +1,1272 @@
+"""
+Motor de Instalação (sem Interface Gráfica)
+===========================================
+
+Toda a lógica de instalação do modpack, independente do Tkinter: resolve a
+URL e o diretório de destino, baixa/extrai (ou atualiza) os arquivos e
+configura o perfil do launcher. O progresso é informado por uma função
+'status_callback(texto, valor)', de modo que o mesmo motor atende:
+
+- A janela do instalador (ModpackWizard), que publica no ProgressBus
+- A linha de comando '--headless', para instalações automatizadas
+  (laboratórios, imagens de CI) e para medir o caminho crítico sem a GUI
+
+A origem pode ser a URL padrão da versão, outra URL HTTP ou um ZIP local.
+
+Uso:
+    python Installer.py --headless --launcher manual --variant lightweight --target ./instancia
+    python install_engine.py --launcher sklauncher --variant full --json
+    python install_engine.py --launcher manual --target ./inst --source ./Guerra-2-Light.zip
+
+    # Lote: cada ZIP distinto é baixado uma vez (ver batch_install.py)
+    python install_engine.py --launcher sklauncher --launcher modrinth --variant full --variant lightweight
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import zipfile
+from urllib.parse import unquote, urlparse
+
+from archive_cache import ArchiveCache, fetch_published_checksum, file_sha256, verify_checksum
+from content_store import ContentStore
+from delta_update import DeltaUpdater, is_managed_path, manifest_url_for
+from downloader import ChunkedDownloader, get_cache_dir
+from extractor import ParallelExtractor
+from file_sync import safe_member_path, sync_from_zip
+from http_session import REQUEST_TIMEOUT, get_session
+from install_trace import TRACE_FILE_NAME, InstallTrace
+from instance_index import INDEX_FILE_NAME, InstanceIndex
+from lazy_zip import LazyZip
+from low_memory import (ESTIMATED_EXPANSION, LOW_MEMORY_WORKERS, ResourceMonitor, check_free_space,
+                        is_low_memory_machine, low_memory_notice)
+from mirrors import MirrorDownloader
+from modrinth_db import ModrinthDatabase
+from pipeline import PipelinedInstall
+from processes import CLOSE_TIMEOUT, get_process_manager
+from profile_store import PROFILES_FILE_NAME, ProfileStore
+from staged_install import StagedInstall, rollback
+
+# ==========================================
+# CONFIGURAÇÃO DE URLS DE DOWNLOAD
+# ==========================================
+# Dicionário contendo URLs de download para cada combinação de launcher e versão
+# Estrutura: {launcher: {versão: url}}
+# Cada versão aceita também uma lista de mirrors do mesmo arquivo: o download é
+# repartido entre eles conforme a velocidade (ver mirrors.py). A primeira URL da
+# lista identifica o arquivo no cache e no manifesto de atualização.
+DOWNLOAD_URLS = {
+    "tlauncher": {
+        "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
+        "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
+        "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
+    },
+    "sklauncher": {
+        "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
+        "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
+        "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
+    },
+    "modrinth": {
+        "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
+        "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
+        "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
+    },
+    "curseforge": {
+        "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
+        "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
+        "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
+    },
+    "manual": {
+        "full": "https://api.bloodmoonbr.com/downloads/Guerra-2-Full.zip",
+        "intermediate": "https://api.bloodmoonbr.com/downloads/Guerra-2-Intermediate.zip",
+        "lightweight": "https://api.bloodmoonbr.com/downloads/Guerra-2-Light.zip"
+    }
+}
+
+LAUNCHERS = ["tlauncher", "sklauncher", "modrinth", "curseforge", "manual"]
+VARIANTS = ["full", "intermediate", "lightweight"]
+
+# Arquivos do próprio instalador dentro da instância (trace e índice de arquivos)
+INSTALLER_FILES = {TRACE_FILE_NAME, INDEX_FILE_NAME, INDEX_FILE_NAME + "-journal"}
+
+# Processos que travam arquivos da instância durante a instalação
+KILL_LIST = ["Modrinth App.exe", "minecraft.exe", "CurseForge.exe", "java.exe", "javaw.exe"]
+
+
+def get_appdata_dir():
+    """
+    Retorna o diretório AppData do Windows (ou a pasta do usuário fora dele).
+
+    Returns:
+        str: Caminho base das pastas dos launchers
+    """
+    return os.getenv('APPDATA') or os.path.expanduser("~")
+
+
+def register_sklauncher_profiles(engines):
+    """
+    Cria ou atualiza os perfis de várias instalações no launcher_profiles.json
+    em uma única leitura e escrita (ver profile_store.py).
+
+    Args:
+        engines (list): Motores (InstallEngine) cujos perfis serão gravados
+
+    Returns:
+        bool: True se configurado com sucesso, False caso contrário
+    """
+    try:
+        # Localiza arquivo de perfis do Minecraft
+        profiles_path = os.path.join(get_appdata_dir(), ".minecraft", PROFILES_FILE_NAME)
+        changed = ProfileStore(profiles_path).upsert(dict(engine.sklauncher_profile() for engine in engines))
+        if changed:
+            print(f"{len(changed)} perfil(is) SKLauncher configurado(s) em: {profiles_path}")
+        else:
+            print(f"Perfis SKLauncher já atualizados em: {profiles_path}")
+        return True
+
+    except Exception as e:
+        print(f"Erro ao configurar perfil SKLauncher: {e}")
+        return False
+
+
+def register_modrinth_profiles(engines):
+    """
+    Cria ou atualiza os perfis de várias instalações no banco do Modrinth App
+    em uma única transação (perfis existentes só têm o timestamp atualizado).
+
+    Args:
+        engines (list): Motores (InstallEngine) cujos perfis serão gravados
+
+    Returns:
+        bool: True se configurado com sucesso, False caso contrário
+    """
+    try:
+        # Localiza banco de dados do Modrinth App
+        db_path = os.path.join(get_appdata_dir(), "ModrinthApp", "app.db")
+        if not os.path.exists(db_path):
+            print("Banco de dados do Modrinth não encontrado.")
+            return False
+
+        now = int(time.time())
+        written = ModrinthDatabase(db_path).upsert_profiles([engine.modrinth_profile(now) for engine in engines])
+        print(f"{written} perfil(is) Modrinth configurado(s) em: {db_path}")
+        return True
+
+    except Exception as e:
+        print(f"Erro ao configurar perfil Modrinth: {e}")
+        return False
+
+
+def local_source_path(source):
+    """
+    Retorna o caminho local da origem, se ela for um arquivo e não uma URL HTTP.
+
+    Args:
+        source (str): Caminho, URL 'file://' ou URL HTTP
+
+    Returns:
+        str: Caminho do arquivo local, ou None para URLs HTTP
+    """
+    if source.startswith("file://"):
+        return unquote(urlparse(source).path)
+    if urlparse(source).scheme in ("http", "https"):
+        return None
+    return source
+
+
+def has_installation(target_dir):
+    """
+    Verifica se a pasta já contém uma instalação (arquivos além dos do próprio instalador).
+
+    Args:
+        target_dir (str): Diretório da instância
+
+    Returns:
+        bool: True se a instalação deve ser tratada como atualização
+    """
+    try:
+        return any(name not in INSTALLER_FILES for name in os.listdir(target_dir))
+    except OSError:
+        return False
+
+
+def clear_directory(path):
+    """Remove todo o conteúdo de uma pasta, mantendo a própria pasta."""
+    if not os.path.isdir(path):
+        return
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            os.remove(entry.path)
+
+
+class InstallEngine:
+    """
+    Executa a instalação do modpack para um launcher e versão.
+    """
+
+    _profile_lock = threading.Lock()  # Serializa a escrita dos perfis dos launchers
+
+    def __init__(self, launcher, version="full", install_path="", source=None,
+                 status_callback=None, close_processes=True, expected_sha256=None,
+                 verify_members=False, mirrors=None, trace_path=None, dedup=True,
+                 transactional=True, configure_profile=True, low_memory=None):
+        """
+        Args:
+            launcher (str): Launcher de destino (ex: 'sklauncher', 'manual_pirata')
+            version (str): Versão do modpack (full/intermediate/lightweight)
+            install_path (str): Pasta de instalação (apenas para instalação manual)
+            source (str): URL ou ZIP local que substitui a URL padrão da versão
+            status_callback (callable): Função chamada com (texto, valor 0-100)
+            close_processes (bool): Fecha launchers e Minecraft antes de instalar
+            expected_sha256 (str): SHA-256 do ZIP (padrão: o publicado em '<url>.sha256')
+            verify_members (bool): Confere o CRC de todos os membros antes de
+                                   escrever no diretório de instalação
+            mirrors (list): URLs adicionais do mesmo arquivo (outros servidores)
+            trace_path (str): Onde gravar o trace das etapas (padrão: na instalação)
+            dedup (bool): Liga arquivos do armazenamento compartilhado (content_store.py)
+                          em vez de descompactar cada cópia
+            transactional (bool): Instala em uma pasta de preparação e troca no final,
+                                  guardando a geração anterior (staged_install.py)
+            configure_profile (bool): Cria o perfil do launcher ao final (False quando
+                                      a instalação em lote grava todos os perfis juntos)
+            low_memory (bool): Modo de pouca memória (low_memory.py); None ativa
+                               sozinho em máquinas com pouca RAM
+        """
+        self.launcher = launcher
+        self.version = version
+        self.install_path = install_path
+        self.source = source
+        self.status_callback = status_callback
+        self.close_processes = close_processes
+        self.expected_sha256 = expected_sha256
+        self.verify_members = verify_members
+        self.mirrors = list(mirrors or [])
+        self.trace_path = trace_path
+        self.dedup = dedup
+        self.transactional = transactional
+        self.configure_profile = configure_profile
+        self.low_memory = is_low_memory_machine() if low_memory is None else low_memory
+        self.low_memory_auto = low_memory is None and self.low_memory  # Ativado sem ser pedido
+        self.store = None       # ContentStore usado na última execução
+        self.index = None       # InstanceIndex aberto na última execução
+        self.trace = None       # InstallTrace da última execução de run()
+        self.trace_file = None  # Onde o trace foi gravado
+
+    def set_status(self, text, val):
+        """
+        Informa o status atual da instalação.
+
+        Args:
+            text (str): Texto descritivo do status atual
+            val (int): Valor da barra de progresso (0-100)
+        """
+        if self.status_callback:
+            self.status_callback(text, val)
+
+    # ==========================================
+    # GERENCIAMENTO DE DIRETÓRIOS E CONFIGURAÇÃO
+    # ==========================================
+
+    def get_version_suffix(self):
+        """
+        Retorna o sufixo do nome baseado na versão selecionada.
+        
+        Returns:
+            str: Sufixo formatado (ex: 'Full', 'Intermediate', 'Lightweight')
+        """
+        version_map = {
+            "full": "Full",
+            "intermediate": "Intermediate",
+            "lightweight": "Lightweight"
+        }
+        return version_map.get(self.version, "Full")
+    
+    def get_profile_name(self):
+        """
+        Retorna o nome completo do perfil incluindo a versão.
+        
+        Returns:
+            str: Nome do perfil (ex: 'Minecraft Guerra 2 Full')
+        """
+        return f"Minecraft Guerra 2 {self.get_version_suffix()}"
+    
+    def get_folder_name(self):
+        """
+        Retorna o nome da pasta de instalação incluindo a versão.
+        
+        Returns:
+            str: Nome da pasta (ex: 'Minecraft Guerra 2 Full')
+        """
+        return f"Minecraft Guerra 2 {self.get_version_suffix()}"
+    
+    def get_target_directory(self):
+        """
+        Determina o diretório de instalação baseado no launcher selecionado.
+        
+        Returns:
+            str: Caminho absoluto do diretório de instalação
+        """
+        launcher = self.launcher
+        
+        # Se instalação manual, retorna caminho selecionado pelo usuário
+        if "manual" in launcher: 
+            return self.install_path
+
+        # Obtém diretório AppData do Windows (pasta do usuário em outros sistemas)
+        appdata = get_appdata_dir()
+        minecraft_default = os.path.join(appdata, ".minecraft")
+        
+        # Nome da pasta específico para cada versão
+        folder_name = self.get_folder_name()
+        profile_name = self.get_profile_name()
+
+        # TLauncher: Instala como versão do Minecraft
+        if launcher == "tlauncher":
+            return os.path.join(minecraft_default, "versions", folder_name)
+        
+        # SKLauncher: Usa sistema de instâncias
+        elif launcher == "sklauncher":
+            return os.path.join(minecraft_default, "instances", folder_name)
+        
+        # Modrinth App: Diretório próprio de perfis
+        elif launcher == "modrinth":
+            return os.path.join(appdata, "ModrinthApp", "profiles", profile_name)
+
+        # CurseForge: Usa diretório do perfil de usuário
+        elif launcher == "curseforge":
+            user_profile = os.getenv('USERPROFILE') or os.path.expanduser("~")
+            return os.path.join(user_profile, "curseforge", "minecraft", "Instances", profile_name)
+
+        # Fallback para diretório padrão do Minecraft
+        return minecraft_default
+
+    def sklauncher_profile(self):
+        """
+        Perfil 'Minecraft Guerra 2' no launcher_profiles.json do SKLauncher.
+
+        Returns:
+            tuple: (ID do perfil, perfil)
+        """
+        minecraft_dir = os.path.join(get_appdata_dir(), ".minecraft")
+        # Caminho dinâmico onde o modpack foi instalado (inclui versão)
+        game_dir_installed = os.path.join(minecraft_dir, "instances", self.get_folder_name())
+
+        # ID único para cada versão do modpack
+        profile_ids = {
+            "Full": "686d1a5248c548dca11bfc1d256b1784",
+            "Intermediate": "786d1a5248c548dca11bfc1d256b1785",
+            "Lightweight": "886d1a5248c548dca11bfc1d256b1786"
+        }
+        profile_id = profile_ids.get(self.get_version_suffix(), "686d1a5248c548dca11bfc1d256b1784")
+
+        # Cria objeto de perfil com todas as configurações necessárias
+        now = datetime.datetime.now().isoformat()
+        return profile_id, {
+            "name": self.get_profile_name(),  # Nome incluindo versão
+            "gameDir": game_dir_installed,  # Caminho dinâmico
+            "lastVersionId": "1.20.1-forge-47.4.13",  # Versão do Minecraft + Forge
+            "resolution": {
+                "width": 854,
+                "height": 480,
+                "fullscreen": False
+            },
+            "type": "custom",
+            "created": now,
+            "lastUsed": now
+        }
+
+    def configure_sklauncher_profile(self):
+        """
+        Configura perfil do SKLauncher no arquivo launcher_profiles.json.
+        Cria ou atualiza o perfil 'Minecraft Guerra 2' com as configurações apropriadas.
+        
+        Returns:
+            bool: True se configurado com sucesso, False caso contrário
+        """
+        return register_sklauncher_profiles([self])
+
+    def modrinth_profile(self, now=None):
+        """
+        Valores do perfil 'Minecraft Guerra' na tabela 'profiles' do Modrinth App.
+
+        Args:
+            now (int): Timestamp de criação/modificação (padrão: agora)
+
+        Returns:
+            dict: Coluna -> valor
+        """
+        now = int(time.time()) if now is None else now
+        profile_name = self.get_profile_name()
+        return {
+            "path": profile_name,
+            "install_stage": "installed",
+            "name": profile_name,
+            "icon_path": None,
+            "game_version": "1.20.1",
+            "mod_loader": "forge",
+            "mod_loader_version": "47.4.13",
+            "groups": "11",
+            "linked_project_id": None,
+            "linked_version_id": None,
+            "locked": None,
+            "created": now,
+            "modified": now,
+            "last_played": None,
+            "submitted_time_played": 0,
+            "recent_time_played": 0,
+            "override_java_path": None,
+            "override_extra_launch_args": 0,
+            "override_custom_env_vars": 0,
+            "override_mc_memory_max": None,
+            "override_mc_force_fullscreen": None,
+            "override_mc_game_resolution_x": None,
+            "override_mc_game_resolution_y": None,
+            "override_hook_pre_launch": None,
+            "override_hook_wrapper": None,
+            "override_hook_post_exit": None,
+            "protocol_version": 763,  # 1.20.1
+            "launcher_feature_version": "migrated_launch_hooks",
+        }
+
+    def configure_modrinth_profile(self):
+        """
+        Configura perfil do Modrinth App no banco de dados SQLite (app.db).
+        Cria ou atualiza o perfil 'Minecraft Guerra' com as configurações apropriadas.
+        
+        Returns:
+            bool: True se configurado com sucesso, False caso contrário
+        """
+        return register_modrinth_profiles([self])
+
+    # ==========================================
+    # LÓGICA PRINCIPAL DE INSTALAÇÃO
+    # ==========================================
+
+    def resolve_urls(self):
+        """
+        Retorna a origem do modpack e seus mirrors.
+
+        Returns:
+            list: URLs HTTP (ou um caminho de ZIP local); a primeira é a principal,
+                  que é a informada em 'source' ou a URL padrão da versão
+        """
+        if self.source:
+            return [self.source] + self.mirrors
+
+        # Normaliza chave do launcher (manual_pirata/manual_original -> manual)
+        launcher_key = "manual" if "manual" in self.launcher else self.launcher
+
+        # Busca URL (ou lista de mirrors) apropriada no dicionário
+        entry = DOWNLOAD_URLS.get(launcher_key, {}).get(self.version)
+        if entry is None:
+            # Fallback para caso URL não esteja configurada
+            return ["http://example.com"]
+        urls = [entry] if isinstance(entry, str) else list(entry)
+        if any("LINK_" in url for url in urls):
+            raise ValueError("Links de download não configurados no código!")
+        return urls + self.mirrors
+
+    def create_downloader(self, urls):
+        """
+        Cria o motor de download: em faixas de um servidor, ou repartido entre mirrors.
+
+        Args:
+            urls (list): URL principal seguida dos mirrors
+
+        Returns:
+            ChunkedDownloader: Motor de download
+        """
+        # No modo de pouca memória: menos conexões (cada uma tem um buffer de até 4MB)
+        kwargs = {"workers": LOW_MEMORY_WORKERS} if self.low_memory else {}
+        if len(set(urls)) > 1:
+            return MirrorDownloader(urls, **kwargs)
+        return ChunkedDownloader(**kwargs)
+
+    def create_extractor(self, target_dir=None):
+        """
+        Cria o extrator do ZIP.
+
+        Args:
+            target_dir (str): Instância de destino (None: só verificação, sem armazenamento)
+
+        Returns:
+            ParallelExtractor: Extrator (sob demanda e com menos threads no modo de pouca memória)
+        """
+        store = self.create_store(target_dir) if target_dir else None
+        if self.low_memory:
+            return ParallelExtractor(workers=LOW_MEMORY_WORKERS, store=store, lazy=True)
+        return ParallelExtractor(store=store)
+
+    def open_archive(self, zip_path):
+        """
+        Abre o ZIP do modpack para leitura.
+
+        Returns:
+            zipfile.ZipFile: ZIP aberto (LazyZip, com a mesma interface, no modo de pouca memória)
+        """
+        if self.low_memory:
+            return LazyZip(zip_path)
+        return zipfile.ZipFile(zip_path, 'r')
+
+    def check_disk_space(self, target_dir):
+        """
+        Confere se há espaço livre para o download e os arquivos extraídos.
+
+        Com o ZIP já disponível (local ou em cache) o espaço é exato: soma dos
+        membros que ainda não estão na instância com o mesmo tamanho. Sem ele,
+        usa o tamanho informado pelo servidor.
+
+        Returns:
+            dict: Bytes a baixar e a extrair, e o espaço conferido por volume
+
+        Raises:
+            IOError: Se não houver espaço suficiente
+        """
+        url = self.resolve_urls()[0]
+        zip_path = local_source_path(url)
+        if zip_path is None:
+            zip_path = ArchiveCache().lookup(url)
+
+        if zip_path is not None:
+            download_bytes = 0
+            extract_bytes = 0
+            with LazyZip(zip_path) as zip_ref:
+                for info in zip_ref.infolist():
+                    rel_path = safe_member_path(info.filename)
+                    if not rel_path or info.is_dir():
+                        continue
+                    dest = os.path.join(target_dir, *rel_path.split('/'))
+                    try:
+                        if os.path.getsize(dest) == info.file_size:
+                            continue  # Provavelmente inalterado (é ligado, não copiado)
+                    except OSError:
+                        pass
+                    extract_bytes += info.file_size
+        else:
+            try:
+                response = get_session().head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+                download_bytes = int(response.headers.get("content-length", 0))
+            except Exception as e:
+                print(f"Não foi possível consultar o tamanho do download: {e}")
+                download_bytes = 0
+            if not download_bytes:
+                return {"checked": False}
+            extract_bytes = int(download_bytes * ESTIMATED_EXPANSION)
+
+        volumes = check_free_space([(get_cache_dir("archives"), download_bytes), (target_dir, extract_bytes)])
+        return {"download_bytes": download_bytes, "extract_bytes": extract_bytes,
+                "free_bytes": {v["path"]: v["free"] for v in volumes.values()}}
+
+    def close_conflicting_processes(self):
+        """
+        Fecha launchers e Minecraft, que travam arquivos da instância.
+
+        Os processos são listados uma vez, encerrados juntos e a espera dura
+        apenas até saírem de fato (nenhuma, se nada estava aberto).
+
+        Returns:
+            dict: Resultado de ProcessManager.close (vazio se o sistema não for suportado)
+        """
+        manager = get_process_manager()
+        if manager is None:
+            return {}
+        return manager.close(KILL_LIST, timeout=CLOSE_TIMEOUT)
+
+    def run(self):
+        """
+        Executa o processo completo de instalação.
+
+        Etapas:
+        1. Fecha processos conflitantes (launchers e Minecraft)
+        2. Faz download do modpack
+        3. Extrai arquivos para o diretório apropriado
+        4. Configura perfil do launcher (se aplicável)
+
+        Cada etapa é medida em self.trace, salvo ao final (mesmo em caso de
+        falha) em '.install-trace.json' dentro do diretório de instalação.
+
+        No modo transacional (staged_install.py) as etapas 2 e 3 acontecem em
+        uma pasta de preparação, cujas entradas gerenciadas substituem as da
+        instância apenas no final; uma falha descarta a preparação e a
+        instância continua como estava.
+
+        Returns:
+            str: Diretório onde o modpack foi instalado
+
+        Raises:
+            Exception: Qualquer falha de download, extração ou escrita em disco
+        """
+        self.trace = InstallTrace(launcher=self.launcher, version=self.version, source=self.source,
+                                  low_memory=self.low_memory, low_memory_auto=self.low_memory_auto)
+        target_dir = None
+        success = False
+        transaction = None
+        monitor = None
+        try:
+            target_dir = self.get_target_directory()
+            if not target_dir:
+                raise ValueError("Diretório de instalação não informado.")
+
+            # Modo de pouca memória: recusa antes de começar se o disco não comporta
+            # a instalação, e acompanha o pico de memória e de disco temporário
+            if self.low_memory:
+                if self.low_memory_auto:
+                    self.set_status(low_memory_notice(), 0)
+                self.set_status("Verificando espaço em disco...", 0)
+                with self.trace.phase("Espaço em disco") as phase:
+                    phase.args.update(self.check_disk_space(target_dir))
+                monitor = ResourceMonitor([target_dir, get_cache_dir()]).start()
+
+            # Modo transacional: instala em uma pasta de preparação e só troca no final
+            # (só as entradas gerenciadas; os arquivos do usuário ficam onde estão)
+            work_dir = target_dir
+            if self.transactional:
+                transaction = StagedInstall(target_dir)
+                with self.trace.phase("Preparar transação") as phase:
+                    work_dir = transaction.begin()
+                    phase.files = transaction.stats["linked"] + transaction.stats["copied"]
+                    phase.args.update(transaction.stats)
+                if work_dir is None:
+                    self.set_status("Sistema de arquivos sem hardlinks: instalando direto na pasta "
+                                    "(sem geração anterior para rollback)", 0)
+                    work_dir = target_dir
+                    transaction = None
+
+            # Depois do begin: uma troca interrompida já foi desfeita na instância em uso
+            self._run(work_dir, has_installation(target_dir))
+            self.close_index()  # O índice precisa estar fechado antes da troca de pastas
+
+            if transaction is not None:
+                self.set_status("Aplicando instalação...", 100)
+                with self.trace.phase("Trocar pastas") as phase:
+                    phase.args["mode"] = transaction.commit()
+            success = True
+            return target_dir
+        except BaseException:
+            self.close_index()
+            if transaction is not None:
+                # A instância em uso não foi alterada: descarta só a preparação
+                transaction.abort()
+            raise
+        finally:
+            resources = {"resources": monitor.stop()} if monitor is not None else {}
+            self.trace.finish(success, http=get_session().metrics.snapshot(), **resources)
+            self.save_trace(target_dir)
+
+    def save_trace(self, target_dir):
+        """
+        Grava o trace da instalação junto dela (ou no caminho em trace_path).
+
+        Args:
+            target_dir (str): Diretório de instalação (pode não existir em caso de falha)
+        """
+        path = self.trace_path
+        if path is None:
+            if not target_dir or not os.path.isdir(target_dir):
+                return
+            path = os.path.join(target_dir, TRACE_FILE_NAME)
+        try:
+            self.trace.save(path)
+            self.trace_file = path
+            print(f"Trace da instalação: {path}")
+        except OSError as e:
+            print(f"Não foi possível gravar o trace da instalação: {e}")
+
+    def _run(self, target_dir, is_update):
+        """
+        Etapas da instalação (ver run).
+
+        Args:
+            target_dir (str): Onde instalar (a instância ou a pasta de preparação)
+            is_update (bool): Se a instância em uso já tem uma instalação (a
+                              preparação só recebe as entradas gerenciadas)
+        """
+        trace = self.trace
+
+        # ==========================================
+        # PASSO 1: FECHAR PROCESSOS CONFLITANTES
+        # ==========================================
+        if self.close_processes:
+            self.set_status("Fechando launchers e Minecraft...", 5)
+            with trace.phase("Fechar processos") as phase:
+                phase.args.update(self.close_conflicting_processes())
+
+        version = self.version
+
+        # ==========================================
+        # PASSO 2: RESOLVER URL DE DOWNLOAD
+        # ==========================================
+        urls = self.resolve_urls()
+        url = urls[0]
+
+        # ==========================================
+        # MODO SIMULAÇÃO (URLs de placeholder)
+        # ==========================================
+        # Usado para testes quando links reais não estão disponíveis
+        if "LINK_" in url or "example.com" in url:
+            self.set_status("Modo Simulação (Links não reais)...", 50)
+            time.sleep(2)
+
+            # Cria pasta de destino para SKLauncher funcionar
+            if not os.path.exists(target_dir):
+                os.makedirs(target_dir)
+
+            self.configure_launcher_profile()
+            return
+
+        local_zip = local_source_path(url)
+
+        last_percent = [-1]
+
+        def on_download_progress(wrote, total_size):
+            # Atualiza o status apenas quando a porcentagem inteira muda
+            if total_size <= 0:
+                return
+            percent = int((wrote / total_size) * 100)
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.set_status(f"Baixando... {percent}%", percent)
+
+        # ==========================================
+        # PASSO 3: ATUALIZAÇÃO INCREMENTAL (MANIFESTO)
+        # ==========================================
+        # Se a versão publica um manifesto, baixa apenas os arquivos alterados
+        applied_delta = False
+        if is_update and local_zip is None:
+            self.set_status("Verificando arquivos alterados...", 0)
+            with trace.phase("Atualização incremental") as phase:
+                updater = DeltaUpdater(manifest_url_for(url),
+                                       **({"workers": LOW_MEMORY_WORKERS} if self.low_memory else {}))
+                applied_delta = updater.apply(target_dir, progress_callback=on_download_progress,
+                                              index=self.open_index(target_dir))
+                phase.bytes = updater.stats.get("bytes", 0)
+                phase.files = updater.stats.get("fetched", 0)
+                phase.args.update(applied=applied_delta, deleted=updater.stats.get("deleted", 0))
+                self.record_index_stats(phase)
+            if applied_delta:
+                self.set_status("Atualização concluída!", 100)
+
+        # ==========================================
+        # PASSO 3.1: DOWNLOAD E EXTRAÇÃO DO MODPACK
+        # ==========================================
+        if not applied_delta:
+            cache = ArchiveCache() if local_zip is None else None
+
+            # Checksum esperado do ZIP: conferido com o hash calculado durante o download
+            checksum = self.expected_sha256
+            if checksum is None and local_zip is None:
+                checksum = fetch_published_checksum(url)
+
+            if is_update:
+                # --- Download (faixas paralelas, com fallback para stream único) ---
+                if local_zip is None:
+                    self.set_status(f"Baixando {version}...", 0)
+                    # Reutiliza o arquivo em cache se o servidor confirmar que não mudou (304);
+                    # caso contrário baixa (retomando downloads interrompidos) e armazena
+                    zip_path = self.download(url, urls, cache, checksum, on_download_progress)
+                else:
+                    zip_path = local_zip
+                    self.verify_local_source(zip_path, checksum)
+                self.verify_archive(zip_path)
+
+                self.set_status("Atualizando modpack...", 100)
+
+                def on_sync_progress(done, total, rel_path):
+                    # Atualiza status a cada 50 arquivos para não travar a UI
+                    if done % 50 == 0 or done == total:
+                        self.set_status(f"Atualizando: {rel_path}", (done / total) * 100)
+
+                # Extrai direto do ZIP para a instância apenas os arquivos gerenciados
+                # (mods, config, resourcepacks, shaderpacks e jsons/sql da raiz) que
+                # mudaram, sem pasta intermediária; cada arquivo é escrito com nome
+                # temporário e renomeado, e os que saíram do modpack são removidos
+                with trace.phase("Sincronização") as phase:
+                    with self.open_archive(zip_path) as zip_ref:
+                        stats = sync_from_zip(zip_ref, target_dir, progress_callback=on_sync_progress,
+                                              store=self.create_store(target_dir),
+                                              index=self.open_index(target_dir))
+                    phase.files = stats["copied"]
+                    phase.args.update(stats)
+                    self.record_store_stats(phase)
+                    self.record_index_stats(phase)
+                print(f"Atualização: {stats}")
+
+                self.set_status("Atualização concluída!", 100)
+
+            else:
+                # Instalação Limpa
+                # Sem ZIP em cache: baixa e extrai ao mesmo tempo, extraindo cada
+                # arquivo assim que seus bytes chegam (requer suporte a Range).
+                # A verificação de CRC exige o ZIP completo antes, então dispensa o pipeline;
+                # o modo de pouca memória também (o pipeline mantém todos os membros pendentes)
+                zip_path = local_zip
+                extracted = False
+                if (zip_path is None and not self.verify_members and not self.low_memory
+                        and cache.lookup(url) is None):
+                    self.set_status(f"Baixando e extraindo {version}...", 0)
+                    with trace.phase("Download + extração") as phase:
+                        os.makedirs(target_dir, exist_ok=True)
+                        extractor = self.create_extractor(target_dir)
+                        downloader = self.create_downloader(urls)
+                        pipeline = PipelinedInstall(downloader, extractor)
+                        try:
+                            zip_path = pipeline.run(url, cache, target_dir,
+                                                    download_callback=on_download_progress,
+                                                    expected_sha256=checksum)
+                        except Exception:
+                            # A pasta estava vazia: não deixa uma instalação parcial ou corrompida
+                            clear_directory(target_dir)
+                            raise
+                        extracted = zip_path is not None
+                        if extracted:
+                            phase.bytes = os.path.getsize(zip_path)
+                            phase.files = pipeline.files_extracted
+                            self.record_store_stats(phase)
+                        phase.args["pipelined"] = extracted
+                        phase.args["resumed_bytes"] = downloader.resumed_bytes
+
+                if not extracted:
+                    # --- Download (stream único ou arquivo já em cache) ---
+                    if zip_path is None:
+                        self.set_status(f"Baixando {version}...", 0)
+                        zip_path = self.download(url, urls, cache, checksum, on_download_progress)
+                    else:
+                        self.verify_local_source(zip_path, checksum)
+                    self.verify_archive(zip_path)
+
+                    if not os.path.exists(target_dir):
+                        os.makedirs(target_dir)
+
+                    self.set_status("Extraindo arquivos...", 100)
+                    last_extract = [0]
+
+                    def on_extract_progress(done, total_files, file):
+                        # Atualiza status a cada 50 arquivos para não travar a UI
+                        if done - last_extract[0] >= 50 or done == total_files:
+                            last_extract[0] = done
+                            percent = (done / total_files) * 100
+                            filename = file.split('/')[-1] if '/' in file else file
+                            self.set_status(f"Extraindo: {filename}", percent)
+
+                    # Extrai todos os arquivos do ZIP em paralelo (um handle do ZIP por thread);
+                    # arquivos já presentes no armazenamento compartilhado são apenas ligados
+                    with trace.phase("Extração") as phase:
+                        extractor = self.create_extractor(target_dir)
+                        phase.files = extractor.extract_all(zip_path, target_dir,
+                                                            progress_callback=on_extract_progress)
+                        phase.bytes = os.path.getsize(zip_path)
+                        self.record_store_stats(phase)
+
+                # Registra os arquivos extraídos no índice da instância (só 'stat';
+                # o CRC-32 vem do ZIP), para a próxima atualização não relê-los
+                index = self.open_index(target_dir)
+                if index is not None:
+                    with self.open_archive(zip_path) as zip_ref:
+                        index.record_members(zip_ref.infolist())
+
+        # ==========================================
+        # PASSO 4: CONFIGURAÇÃO PÓS-INSTALAÇÃO
+        # ==========================================
+        self.configure_launcher_profile()
+
+        if self.store is not None:
+            try:
+                self.store.prune()
+            except OSError as e:
+                print(f"Não foi possível limpar o armazenamento compartilhado: {e}")
+
+        print(f"Conexões HTTP: {get_session().metrics.snapshot()}")
+
+    def create_store(self, target_dir):
+        """
+        Abre o armazenamento compartilhado de arquivos, se puder ser usado na instância.
+
+        Args:
+            target_dir (str): Diretório da instância (já criado)
+
+        Returns:
+            ContentStore: Armazenamento, ou None (desativado, em outro volume ou inacessível)
+        """
+        if not self.dedup:
+            return None
+        try:
+            store = ContentStore()
+        except OSError as e:
+            print(f"Armazenamento compartilhado indisponível: {e}")
+            return None
+        if not store.usable_for(target_dir):
+            print("Armazenamento compartilhado em outro volume: extraindo sem deduplicação.")
+            return None
+        self.store = store
+        return store
+
+    def open_index(self, target_dir):
+        """
+        Abre (uma vez por execução) o índice de arquivos da instância.
+
+        Args:
+            target_dir (str): Diretório da instância (já criado)
+
+        Returns:
+            InstanceIndex: Índice, ou None se não puder ser aberto (a instalação
+                           continua, apenas relendo os arquivos para compará-los)
+        """
+        if self.index is None:
+            try:
+                self.index = InstanceIndex(target_dir)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Índice da instância indisponível: {e}")
+        return self.index
+
+    def close_index(self):
+        """Grava e fecha o índice de arquivos da instância, se aberto."""
+        if self.index is None:
+            return
+        try:
+            self.index.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Não foi possível gravar o índice da instância: {e}")
+        self.index = None
+
+    def record_index_stats(self, phase):
+        """Registra na etapa quantos arquivos precisaram ser relidos (fora do índice)."""
+        if self.index is not None:
+            phase.args["rehashed"] = self.index.rehashed
+
+    def verify_installation(self, progress_callback=None):
+        """
+        Confere os arquivos gerenciados da instância com o ZIP da versão.
+
+        Os hashes atuais vêm do índice da instância (apenas arquivos que mudaram
+        desde a última instalação são relidos); o ZIP é obtido pelo cache.
+
+        Args:
+            progress_callback (callable): Função chamada com (bytes baixados, total)
+
+        Returns:
+            dict: 'ok' (quantidade), 'missing' e 'modified' (caminhos relativos)
+                  e 'rehashed' (arquivos relidos)
+
+        Raises:
+            FileNotFoundError: Se não houver instalação no diretório de destino
+        """
+        target_dir = self.get_target_directory()
+        if not target_dir or not has_installation(target_dir):
+            raise FileNotFoundError(f"Nenhuma instalação encontrada em: {target_dir}")
+
+        urls = self.resolve_urls()
+        url = urls[0]
+        zip_path = local_source_path(url)
+        if zip_path is None:
+            checksum = self.expected_sha256 or fetch_published_checksum(url)
+            zip_path = ArchiveCache().fetch(url, self.create_downloader(urls),
+                                            progress_callback=progress_callback, expected_sha256=checksum)
+        result = {"ok": 0, "missing": [], "modified": []}
+        index = InstanceIndex(target_dir)
+        try:
+            with self.open_archive(zip_path) as zip_ref:
+                infos = zip_ref.infolist()
+            for info in infos:
+                rel_path = safe_member_path(info.filename)
+                if not rel_path or info.is_dir() or not is_managed_path(rel_path):
+                    continue
+                if index.matches_member(rel_path, info):
+                    result["ok"] += 1
+                elif os.path.exists(os.path.join(target_dir, *rel_path.split('/'))):
+                    result["modified"].append(rel_path)
+                else:
+                    result["missing"].append(rel_path)
+        finally:
+            index.close()
+        result["rehashed"] = index.rehashed
+        return result
+
+    def record_store_stats(self, phase):
+        """Registra na etapa quantos arquivos vieram do armazenamento compartilhado."""
+        if self.store is not None:
+            phase.args["store"] = dict(self.store.stats)
+
+    def download(self, url, urls, cache, checksum, progress_callback):
+        """
+        Obtém o ZIP pelo cache (baixando-o se necessário), medindo a etapa.
+
+        Returns:
+            str: Caminho do ZIP no cache
+        """
+        with self.trace.phase("Download") as phase:
+            downloader = self.create_downloader(urls)
+            zip_path = cache.fetch(url, downloader, progress_callback=progress_callback,
+                                   expected_sha256=checksum)
+            # remote_info só é preenchido quando houve download (não em acerto do cache)
+            phase.bytes = downloader.remote_info.get("size", 0)
+            phase.args["cache_hit"] = not downloader.remote_info
+            phase.args["resumed_bytes"] = downloader.resumed_bytes
+        return zip_path
+
+    def verify_local_source(self, zip_path, checksum):
+        """Confere o checksum de um ZIP local (o arquivo do usuário não é removido)."""
+        if checksum:
+            self.set_status("Verificando checksum do arquivo...", 0)
+            with self.trace.phase("Checksum") as phase:
+                verify_checksum(zip_path, file_sha256(zip_path), checksum, remove=False)
+                phase.bytes = os.path.getsize(zip_path)
+
+    def verify_archive(self, zip_path):
+        """Confere em paralelo o CRC de todos os membros do ZIP, se habilitado."""
+        if not self.verify_members:
+            return
+
+        def on_verify_progress(done, total_files, file):
+            if done == total_files or done % 200 == 0:
+                self.set_status("Verificando integridade dos arquivos...", (done / total_files) * 100)
+
+        self.set_status("Verificando integridade dos arquivos...", 0)
+        with self.trace.phase("Verificação CRC") as phase:
+            phase.files = self.create_extractor().verify(zip_path, progress_callback=on_verify_progress)
+            phase.bytes = os.path.getsize(zip_path)
+
+    def configure_launcher_profile(self):
+        """Configura o perfil do launcher (SKLauncher e Modrinth)."""
+        if not self.configure_profile:
+            return
+        # Instalações em lote rodam em paralelo, mas o arquivo de perfis e o
+        # banco do Modrinth são compartilhados: um configurador por vez
+        with self._profile_lock:
+            self._configure_launcher_profile()
+
+    def _configure_launcher_profile(self):
+        if self.launcher == "sklauncher":
+            self.set_status("Atualizando perfis do Launcher...", 100)
+            with self.trace.phase("Perfil do launcher") as phase:
+                phase.args["configured"] = self.configure_sklauncher_profile()
+        elif self.launcher == "modrinth":
+            self.set_status("Atualizando banco de dados do Modrinth...", 100)
+            with self.trace.phase("Perfil do launcher") as phase:
+                phase.args["configured"] = self.configure_modrinth_profile()
+
+
+# ==========================================
+# LINHA DE COMANDO (MODO HEADLESS)
+# ==========================================
+
+def build_parser():
+    """Cria o parser de argumentos do modo headless."""
+    parser = argparse.ArgumentParser(
+        prog="Installer.py --headless",
+        description="Instala o modpack Minecraft Guerra 2 sem interface gráfica."
+    )
+    parser.add_argument("--launcher", required=True, action="append", choices=LAUNCHERS,
+                        help="Launcher de destino (pode repetir: instalação em lote)")
+    parser.add_argument("--variant", action="append", choices=VARIANTS,
+                        help="Versão do modpack (padrão: full; pode repetir: instalação em lote)")
+    parser.add_argument("--target", default="",
+                        help="Pasta de instalação (obrigatória para o launcher 'manual')")
+    parser.add_argument("--source",
+                        help="URL HTTP ou ZIP local usado no lugar da URL padrão da versão")
+    parser.add_argument("--mirror", action="append", default=[], metavar="URL",
+                        help="Outro servidor com o mesmo arquivo (pode repetir)")
+    parser.add_argument("--sha256",
+                        help="SHA-256 esperado do ZIP (padrão: o publicado em '<url>.sha256')")
+    parser.add_argument("--verify-members", action="store_true",
+                        help="Confere o CRC de todos os arquivos do ZIP antes de instalar")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Escreve cada arquivo na instância em vez de ligá-lo ao armazenamento compartilhado")
+    parser.add_argument("--no-transaction", action="store_true",
+                        help="Altera a instância no lugar em vez de instalar em uma pasta de preparação")
+    parser.add_argument("--low-memory", action="store_const", const=True, default=None,
+                        help="Modo de pouca memória (padrão: automático em máquinas com até 4 GB de RAM)")
+    parser.add_argument("--no-low-memory", dest="low_memory", action="store_const", const=False,
+                        help="Nunca usa o modo de pouca memória")
+    parser.add_argument("--verify", action="store_true",
+                        help="Apenas confere os arquivos da instalação existente com o modpack")
+    parser.add_argument("--rollback", action="store_true",
+                        help="Volta a instância para a geração anterior (repetir desfaz o rollback)")
+    parser.add_argument("--no-close-processes", action="store_true",
+                        help="Não fecha launchers e Minecraft antes de instalar")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help=f"Onde gravar o trace das etapas (padrão: {TRACE_FILE_NAME} na instalação)")
+    parser.add_argument("--json", action="store_true",
+                        help="Emite os eventos de progresso como linhas JSON")
+    return parser
+
+
+def main(argv=None):
+    """
+    Ponto de entrada do modo headless.
+
+    Args:
+        argv (list): Argumentos da linha de comando (padrão: sys.argv[1:])
+
+    Returns:
+        int: Código de saída (0 em caso de sucesso)
+    """
+    args = build_parser().parse_args(argv)
+    if "manual" in args.launcher and not args.target:
+        build_parser().error("--target é obrigatório para o launcher 'manual'")
+
+    out = sys.stdout
+
+    def emit(text, **event):
+        # Em modo JSON cada evento é uma linha completa e autodescritiva
+        print(json.dumps(event, ensure_ascii=False) if args.json else text, file=out, flush=True)
+
+    if not args.json:
+        return run_command(args, emit)
+    # Mensagens de log do motor (print) vão para o stderr: o stdout fica só com os eventos JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        return run_command(args, emit)
+
+
+def run_command(args, emit):
+    """
+    Executa a instalação, verificação ou rollback pedidos na linha de comando.
+
+    Args:
+        args (argparse.Namespace): Argumentos da linha de comando
+        emit (callable): Função que escreve uma linha de saída/evento
+
+    Returns:
+        int: Código de saída (0 em caso de sucesso)
+    """
+    variants = args.variant or ["full"]
+
+    # Mais de uma combinação (launcher, versão): instalação em lote
+    targets = [(launcher, variant) for launcher in args.launcher for variant in variants]
+    if len(set(targets)) > 1:
+        if args.verify or args.rollback:
+            build_parser().error("--verify e --rollback tratam uma instalação por vez")
+        return run_batch(args, targets, emit)
+
+    def on_status(text, value):
+        emit(f"[{int(value):3d}%] {text}", event="progress", status=text, value=value)
+
+    engine = InstallEngine(args.launcher[0], variants[0], install_path=args.target, source=args.source,
+                           status_callback=on_status, close_processes=not args.no_close_processes,
+                           expected_sha256=args.sha256, verify_members=args.verify_members,
+                           mirrors=args.mirror, trace_path=args.trace, dedup=not args.no_dedup,
+                           transactional=not args.no_transaction, low_memory=args.low_memory)
+    if args.verify:
+        return run_verify(engine, emit)
+    if args.rollback:
+        return run_rollback(engine, emit)
+
+    started = time.perf_counter()
+    try:
+        target_dir = engine.run()
+    except Exception as e:
+        emit(f"Erro: {e}", event="finished", success=False, error=str(e), trace=engine.trace_file)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    emit(engine.trace.summary(), event="phases",
+         phases=[dict(phase.stats(), name=phase.name) for phase in engine.trace.phases])
+    emit(f"Instalado em {target_dir} ({elapsed:.1f}s)", event="finished", success=True,
+         target_dir=target_dir, seconds=round(elapsed, 3), http=get_session().metrics.snapshot(),
+         trace=engine.trace_file, low_memory=engine.low_memory, low_memory_auto=engine.low_memory_auto,
+         resources=engine.trace.result.get("resources"))
+    return 0
+
+
+def run_verify(engine, emit):
+    """
+    Confere a instalação existente (--verify).
+
+    Returns:
+        int: Código de saída (0 se todos os arquivos conferem)
+    """
+    started = time.perf_counter()
+    try:
+        result = engine.verify_installation()
+    except Exception as e:
+        emit(f"Erro: {e}", event="verified", success=False, error=str(e))
+        return 1
+
+    elapsed = time.perf_counter() - started
+    for rel_path in result["missing"]:
+        emit(f"Ausente: {rel_path}", event="file", status="missing", path=rel_path)
+    for rel_path in result["modified"]:
+        emit(f"Alterado: {rel_path}", event="file", status="modified", path=rel_path)
+    success = not result["missing"] and not result["modified"]
+    emit(f"{result['ok']} arquivo(s) corretos, {len(result['missing'])} ausente(s), "
+         f"{len(result['modified'])} alterado(s) ({elapsed:.2f}s, {result['rehashed']} relido(s))",
+         event="verified", success=success, seconds=round(elapsed, 3), ok=result["ok"],
+         missing=len(result["missing"]), modified=len(result["modified"]), rehashed=result["rehashed"])
+    return 0 if success else 1
+
+
+def run_rollback(engine, emit):
+    """
+    Troca a instância pela geração anterior (--rollback).
+
+    Returns:
+        int: Código de saída (0 em caso de sucesso)
+    """
+    target_dir = engine.get_target_directory()
+    started = time.perf_counter()
+    try:
+        rollback(target_dir)
+    except Exception as e:
+        emit(f"Erro: {e}", event="rollback", success=False, error=str(e))
+        return 1
+
+    elapsed = time.perf_counter() - started
+    emit(f"Geração anterior restaurada em {target_dir} ({elapsed:.2f}s)", event="rollback", success=True,
+         target_dir=target_dir, seconds=round(elapsed, 3))
+    return 0
+
+
+def run_batch(args, targets, emit):
+    """
+    Instala várias combinações em lote (ver batch_install.py).
+
+    Args:
+        args (argparse.Namespace): Argumentos da linha de comando
+        targets (list): Pares (launcher, versão)
+        emit (callable): Função que escreve uma linha de saída/evento
+
+    Returns:
+        int: Código de saída (0 se todas as instalações tiveram sucesso)
+    """
+    from batch_install import BatchInstall
+
+    def on_status(label, text, value):
+        emit(f"[{int(value):3d}%] {label}: {text}", event="progress", target=label, status=text,
+             value=value)
+
+    batch = BatchInstall(targets, install_path=args.target, source=args.source, mirrors=args.mirror,
+                         status_callback=on_status, close_processes=not args.no_close_processes,
+                         expected_sha256=args.sha256, verify_members=args.verify_members,
+                         dedup=not args.no_dedup, transactional=not args.no_transaction,
+                         low_memory=args.low_memory)
+    try:
+        results = batch.run()
+    except Exception as e:
+        emit(f"Erro: {e}", event="finished", success=False, error=str(e))
+        return 1
+
+    if args.trace:
+        batch.trace.save(args.trace)
+
+    failed = {label: str(result) for label, result in results.items() if isinstance(result, Exception)}
+    installed = {label: result for label, result in results.items() if label not in failed}
+    for label, target_dir in installed.items():
+        emit(f"Instalado {label} em {target_dir}", event="installed", target=label, target_dir=target_dir)
+    for label, error in failed.items():
+        emit(f"Falhou {label}: {error}", event="failed", target=label, error=error)
+
+    emit(batch.trace.summary(), event="finished", success=not failed, installed=installed, failed=failed,
+         seconds=batch.trace.result["total_seconds"], http=get_session().metrics.snapshot())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
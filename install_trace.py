@@ -0,0 +1,175 @@
+"""
+Medição das Etapas da Instalação
+================================
+
+Registra o tempo de parede de cada etapa da instalação (fechar processos,
+download, verificação, extração, perfil do launcher...) junto com bytes e
+arquivos processados, para descobrir onde uma instalação lenta gasta tempo.
+
+O resultado é salvo no formato Trace Event do Chrome (abre em
+chrome://tracing ou https://ui.perfetto.dev), com os totais e as métricas
+HTTP em 'otherData'; o arquivo fica junto da instalação (.install-trace.json)
+para que possa ser anexado a relatos de usuários.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+
+TRACE_FILE_NAME = ".install-trace.json"
+
+
+class Phase:
+    """
+    Uma etapa medida. 'bytes' e 'files' podem ser preenchidos dentro do bloco.
+    """
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = dict(args)
+        self.bytes = 0
+        self.files = 0
+        self.start = time.perf_counter()
+        self.end = None
+        self.thread = threading.get_ident()
+
+    @property
+    def seconds(self):
+        """Duração da etapa (até agora, se ainda estiver em andamento)."""
+        return (self.end or time.perf_counter()) - self.start
+
+    def stats(self):
+        """
+        Retorna duração, volumes e vazões da etapa.
+
+        Returns:
+            dict: seconds, bytes, files, mb_per_s e files_per_s (os dois
+                  últimos apenas quando houver volume)
+        """
+        seconds = self.seconds
+        stats = dict(self.args, seconds=round(seconds, 4))
+        if self.bytes:
+            stats["bytes"] = self.bytes
+            stats["mb_per_s"] = round(self.bytes / (1024 * 1024) / max(seconds, 1e-6), 2)
+        if self.files:
+            stats["files"] = self.files
+            stats["files_per_s"] = round(self.files / max(seconds, 1e-6), 1)
+        return stats
+
+
+class InstallTrace:
+    """
+    Coleção das etapas de uma instalação.
+    """
+
+    def __init__(self, **metadata):
+        """
+        Args:
+            **metadata: Dados da instalação (launcher, versão, origem...)
+        """
+        self.metadata = metadata
+        self.phases = []
+        self.origin = time.perf_counter()
+        self.started_at = datetime.datetime.now().isoformat()
+        self.result = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name, **args):
+        """
+        Mede o bloco 'with' como uma etapa.
+
+        Args:
+            name (str): Nome exibido da etapa
+            **args: Dados adicionais registrados com a etapa
+
+        Yields:
+            Phase: Etapa em andamento (para preencher bytes/files)
+        """
+        phase = Phase(name, args)
+        try:
+            yield phase
+        except Exception as e:
+            phase.args["error"] = str(e)
+            raise
+        finally:
+            phase.end = time.perf_counter()
+            with self._lock:
+                self.phases.append(phase)
+
+    def finish(self, success, **extra):
+        """
+        Registra o resultado da instalação.
+
+        Args:
+            success (bool): Se a instalação terminou com sucesso
+            **extra: Dados finais (ex: métricas HTTP)
+        """
+        self.result = dict(extra, success=success,
+                           total_seconds=round(time.perf_counter() - self.origin, 4))
+
+    def to_chrome_trace(self):
+        """
+        Converte as etapas para o formato Trace Event do Chrome.
+
+        Returns:
+            dict: Objeto JSON com 'traceEvents' e 'otherData'
+        """
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                   "args": {"name": "Instalador Minecraft Guerra 2"}}]
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p.start)
+        for phase in phases:
+            events.append({
+                "name": phase.name,
+                "cat": "install",
+                "ph": "X",
+                "ts": round((phase.start - self.origin) * 1e6),
+                "dur": round(phase.seconds * 1e6),
+                "pid": pid,
+                "tid": phase.thread,
+                "args": phase.stats(),
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": dict(self.metadata, started_at=self.started_at, **self.result),
+        }
+
+    def save(self, path):
+        """Grava o trace em JSON de forma atômica."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def summary(self):
+        """
+        Resumo de uma linha para a tela final.
+
+        Returns:
+            str: Ex: 'Download 12.3s (45.1 MB/s) · Extração 4.0s · Total 17.2s'
+        """
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p.start)
+        parts = []
+        for phase in phases:
+            if phase.seconds < 0.05:
+                continue
+            text = f"{phase.name} {phase.seconds:.1f}s"
+            stats = phase.stats()
+            if "mb_per_s" in stats:
+                text += f" ({stats['mb_per_s']:.1f} MB/s)"
+            parts.append(text)
+        total = self.result.get("total_seconds", time.perf_counter() - self.origin)
+        parts.append(f"Total {total:.1f}s")
+        resources = self.result.get("resources")
+        if resources:
+            if resources.get("peak_rss_mb") is not None:
+                parts.append(f"RAM {resources['peak_rss_mb']:.0f} MB")
+            parts.append(f"Disco temporário {resources['temp_disk_mb']:.0f} MB")
+        return " · ".join(parts)
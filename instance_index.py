@@ -0,0 +1,226 @@
+"""
+Índice de Arquivos da Instância
+===============================
+
+Guarda, dentro da própria instância (.install-index.db, SQLite), o tamanho,
+a data de modificação e os hashes (SHA-256 e CRC-32) de cada arquivo escrito
+pelo instalador.
+
+Para saber se um arquivo mudou basta um 'os.stat': se tamanho e data de
+modificação (em ns) continuam iguais ao registrado, os hashes guardados são
+usados; somente arquivos alterados são lidos e recalculados. Assim o
+planejamento das atualizações (delta_update, file_sync) e a verificação da
+instalação (InstallEngine.verify_installation) rodam em milissegundos em vez
+de ler milhares de arquivos.
+
+O índice é atualizado incrementalmente: cada arquivo baixado, extraído ou
+removido pelo instalador é registrado (os hashes vêm do ZIP ou do manifesto,
+sem reler o arquivo).
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+
+from file_sync import safe_member_path
+
+INDEX_FILE_NAME = ".install-index.db"
+INDEX_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digests(path):
+    """
+    Calcula SHA-256 e CRC-32 de um arquivo em uma única leitura.
+
+    Returns:
+        tuple: (sha256 em hexadecimal, crc32)
+    """
+    digest = hashlib.sha256()
+    crc = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+            crc = zlib.crc32(block, crc)
+    return digest.hexdigest(), crc
+
+
+class InstanceIndex:
+    """
+    Índice persistente caminho -> (tamanho, data de modificação, hashes).
+
+    Seguro para uso por várias threads; as alterações são gravadas em flush/close.
+    """
+
+    def __init__(self, target_dir):
+        """
+        Args:
+            target_dir (str): Diretório da instância (precisa existir)
+        """
+        self.target_dir = target_dir
+        self.path = os.path.join(target_dir, INDEX_FILE_NAME)
+        self._lock = threading.Lock()
+        self._dirty = {}    # Caminho -> linha a gravar (None = remover)
+        self.rehashed = 0   # Arquivos lidos por terem mudado ou não estarem no índice
+        self.conn = self._connect()
+        self.entries = {
+            row[0]: row[1:]
+            for row in self.conn.execute("SELECT path, size, mtime_ns, sha256, crc32 FROM files")
+        }
+
+    def _connect(self):
+        """Abre o banco, recriando-o se estiver corrompido ou em outra versão."""
+        conn = None
+        for attempt in range(2):
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS files")
+                    conn.execute("""
+                        CREATE TABLE files (
+                            path TEXT PRIMARY KEY,
+                            size INTEGER NOT NULL,
+                            mtime_ns INTEGER NOT NULL,
+                            sha256 TEXT,
+                            crc32 INTEGER
+                        ) WITHOUT ROWID
+                    """)
+                    conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+                    conn.commit()
+                return conn
+            except sqlite3.DatabaseError as e:
+                if attempt:
+                    raise
+                print(f"Índice da instância inválido, recriando: {e}")
+                if conn is not None:
+                    conn.close()
+                os.remove(self.path)
+
+    def _abs_path(self, rel_path):
+        return os.path.join(self.target_dir, *rel_path.split('/'))
+
+    def _store(self, rel_path, row):
+        with self._lock:
+            if row is None:
+                self.entries.pop(rel_path, None)
+            else:
+                self.entries[rel_path] = row
+            self._dirty[rel_path] = row
+
+    # ==========================================
+    # CONSULTA
+    # ==========================================
+
+    def digests(self, rel_path, need_sha256=True):
+        """
+        Retorna os hashes atuais de um arquivo da instância.
+
+        Usa os valores do índice quando tamanho e data de modificação não
+        mudaram; caso contrário relê o arquivo e atualiza o índice.
+
+        Args:
+            rel_path (str): Caminho relativo à instância, com '/'
+            need_sha256 (bool): False aceita uma entrada que só tem o CRC-32
+
+        Returns:
+            tuple: (tamanho, sha256, crc32), ou None se o arquivo não existe
+        """
+        path = self._abs_path(rel_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            if rel_path in self.entries:
+                self._store(rel_path, None)
+            return None
+
+        entry = self.entries.get(rel_path)
+        if entry is not None:
+            size, mtime_ns, sha256, crc32 = entry
+            if (size == st.st_size and mtime_ns == st.st_mtime_ns and crc32 is not None
+                    and (sha256 or not need_sha256)):
+                return size, sha256, crc32
+
+        sha256, crc32 = file_digests(path)
+        with self._lock:
+            self.rehashed += 1
+        self._store(rel_path, (st.st_size, st.st_mtime_ns, sha256, crc32))
+        return st.st_size, sha256, crc32
+
+    def sha256(self, rel_path):
+        """SHA-256 atual do arquivo (ou None se não existir)."""
+        result = self.digests(rel_path)
+        return result[1] if result else None
+
+    def matches_member(self, rel_path, info):
+        """
+        Verifica se o arquivo da instância tem o conteúdo do membro do ZIP.
+
+        Args:
+            rel_path (str): Caminho relativo à instância, com '/'
+            info (zipfile.ZipInfo): Membro do ZIP
+
+        Returns:
+            bool: True se tamanho e CRC-32 coincidem
+        """
+        result = self.digests(rel_path, need_sha256=False)
+        return result is not None and result[0] == info.file_size and result[2] == info.CRC
+
+    # ==========================================
+    # REGISTRO
+    # ==========================================
+
+    def record(self, rel_path, sha256=None, crc32=None):
+        """
+        Registra um arquivo recém-escrito pelo instalador com os hashes já conhecidos.
+
+        Args:
+            rel_path (str): Caminho relativo à instância, com '/'
+            sha256 (str): SHA-256 do conteúdo (ex: do manifesto)
+            crc32 (int): CRC-32 do conteúdo (ex: do ZIP)
+        """
+        try:
+            st = os.stat(self._abs_path(rel_path))
+        except OSError:
+            self._store(rel_path, None)
+            return
+        self._store(rel_path, (st.st_size, st.st_mtime_ns, sha256.lower() if sha256 else None, crc32))
+
+    def record_members(self, infos):
+        """
+        Registra os membros de um ZIP recém-extraídos na instância (só 'stat').
+
+        Args:
+            infos (list): Membros do ZIP (zipfile.ZipInfo) já extraídos
+        """
+        for info in infos:
+            rel_path = safe_member_path(info.filename)
+            if rel_path and not info.is_dir():
+                self.record(rel_path, crc32=info.CRC)
+
+    def remove(self, rel_path):
+        """Remove um arquivo apagado pelo instalador do índice."""
+        self._store(rel_path, None)
+
+    def flush(self):
+        """Grava as alterações pendentes em uma única transação."""
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = {}
+        if not dirty:
+            return
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?",
+                                  [(p,) for p, row in dirty.items() if row is None])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, crc32) VALUES (?, ?, ?, ?, ?)",
+                [(p,) + row for p, row in dirty.items() if row is not None]
+            )
+
+    def close(self):
+        """Grava as alterações e fecha o banco."""
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
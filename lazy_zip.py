@@ -0,0 +1,258 @@
+"""
+Leitura de ZIP sem Carregar o Diretório Central
+===============================================
+
+O 'zipfile.ZipFile' lê o diretório central inteiro ao abrir o arquivo e mantém
+na memória um ZipInfo por membro (lista + dicionário por nome) - e o extrator
+paralelo abre um ZipFile por thread. No modo de pouca memória o ZIP é lido
+por este módulo:
+
+- LazyZip.infolist() percorre o diretório central sob demanda, com um buffer
+  de leitura pequeno, devolvendo um membro por vez (nada fica guardado)
+- LazyZip.open() descompacta o membro em blocos limitados (deflate/stored,
+  os métodos usados pelo modpack), conferindo tamanho e CRC-32 ao final
+
+A interface é a mesma usada do ZipFile pelo resto do instalador
+(infolist/open/close), então extrator, sincronização e armazenamento
+compartilhado funcionam sem mudanças.
+"""
+
+import os
+import struct
+import zipfile
+import zlib
+
+CD_READ_BUFFER = 64 * 1024     # Buffer da leitura sequencial do diretório central
+INPUT_CHUNK_SIZE = 64 * 1024   # Bytes comprimidos lidos do disco por vez
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+CENTRAL_STRUCT = struct.Struct("<4s4B4HL2L5H2L")
+LOCAL_SIGNATURE = b"PK\x03\x04"
+LOCAL_STRUCT = struct.Struct("<4s5HL2L2H")
+
+ZIP64_EXTRA_ID = 0x0001
+UTF8_FLAG = 0x800
+ENCRYPTED_FLAG = 0x1
+SUPPORTED_METHODS = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+
+def read_end_record(f):
+    """
+    Lê o fim do diretório central (EOCD, ou o registro ZIP64).
+
+    Returns:
+        tuple: (offset do diretório central, quantidade de membros)
+
+    Raises:
+        zipfile.BadZipFile: Se o arquivo não for um ZIP válido
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    tail_start = max(0, size - EOCD_STRUCT.size - 0xFFFF)  # EOCD + comentário máximo
+    f.seek(tail_start)
+    tail = f.read()
+    eocd_pos = tail.rfind(EOCD_SIGNATURE)
+    if eocd_pos < 0 or len(tail) - eocd_pos < EOCD_STRUCT.size:
+        raise zipfile.BadZipFile("Fim do diretório central não encontrado")
+    eocd = EOCD_STRUCT.unpack_from(tail, eocd_pos)
+    count, cd_offset = eocd[4], eocd[6]
+
+    locator_pos = eocd_pos - ZIP64_LOCATOR_STRUCT.size
+    if locator_pos >= 0 and tail[locator_pos:locator_pos + 4] == ZIP64_LOCATOR_SIGNATURE:
+        f.seek(ZIP64_LOCATOR_STRUCT.unpack_from(tail, locator_pos)[2])
+        record = ZIP64_EOCD_STRUCT.unpack(f.read(ZIP64_EOCD_STRUCT.size))
+        count, cd_offset = record[7], record[9]
+    return cd_offset, count
+
+
+def apply_zip64_extra(info):
+    """Substitui os campos de 32 bits saturados pelos valores do extra ZIP64."""
+    extra = info.extra
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<2H", extra, pos)
+        if header_id == ZIP64_EXTRA_ID:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, pos + 4))
+            # Só aparecem, nesta ordem, os campos que estão saturados
+            if info.file_size == 0xFFFFFFFF:
+                info.file_size = next(values)
+            if info.compress_size == 0xFFFFFFFF:
+                info.compress_size = next(values)
+            if info.header_offset == 0xFFFFFFFF:
+                info.header_offset = next(values)
+            return
+        pos += 4 + length
+
+
+class CentralDirectory:
+    """
+    Membros do ZIP percorridos sob demanda (tem len, mas não é uma lista).
+    """
+
+    def __init__(self, path, offset, count):
+        self.path = path
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        with open(self.path, 'rb', buffering=CD_READ_BUFFER) as f:
+            f.seek(self.offset)
+            for _ in range(self.count):
+                header = f.read(CENTRAL_STRUCT.size)
+                if len(header) != CENTRAL_STRUCT.size or header[:4] != CENTRAL_SIGNATURE:
+                    raise zipfile.BadZipFile("Diretório central corrompido")
+                fields = CENTRAL_STRUCT.unpack(header)
+                flags, method = fields[5], fields[6]
+                name_length, extra_length, comment_length = fields[12], fields[13], fields[14]
+                raw_name = f.read(name_length)
+                extra = f.read(extra_length)
+                f.seek(comment_length, os.SEEK_CUR)
+
+                info = zipfile.ZipInfo(raw_name.decode("utf-8" if flags & UTF8_FLAG else "cp437"))
+                info.flag_bits = flags
+                info.compress_type = method
+                info.CRC = fields[9]
+                info.compress_size = fields[10]
+                info.file_size = fields[11]
+                info.external_attr = fields[17]
+                info.header_offset = fields[18]
+                info.extra = extra
+                apply_zip64_extra(info)
+                yield info
+
+
+class MemberReader:
+    """
+    Leitor de um membro do ZIP com memória limitada (até 'size' bytes por read).
+    """
+
+    def __init__(self, path, info):
+        if info.flag_bits & ENCRYPTED_FLAG:
+            raise NotImplementedError(f"Membro criptografado não suportado: {info.filename}")
+        if info.compress_type not in SUPPORTED_METHODS:
+            raise NotImplementedError(f"Método de compressão {info.compress_type} não suportado "
+                                      f"no modo de pouca memória: {info.filename}")
+        self.info = info
+        self._f = open(path, 'rb', buffering=0)
+        try:
+            self._f.seek(info.header_offset)
+            header = self._f.read(LOCAL_STRUCT.size)
+            if len(header) != LOCAL_STRUCT.size or header[:4] != LOCAL_SIGNATURE:
+                raise zipfile.BadZipFile(f"Cabeçalho local inválido: {info.filename}")
+            fields = LOCAL_STRUCT.unpack(header)
+            self._f.seek(fields[9] + fields[10], os.SEEK_CUR)  # Nome e extra
+        except BaseException:
+            self._f.close()
+            raise
+        self._remaining_input = info.compress_size
+        self._decompressor = zlib.decompressobj(-15) if info.compress_type == zipfile.ZIP_DEFLATED else None
+        self._pending = b""
+        self._produced = 0
+        self._crc = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._f.close()
+
+    def _read_input(self, size):
+        data = self._f.read(min(size, self._remaining_input))
+        if not data and self._remaining_input:
+            raise zipfile.BadZipFile(f"Arquivo truncado: {self.info.filename}")
+        self._remaining_input -= len(data)
+        return data
+
+    def _read_raw(self, size):
+        if self._decompressor is None:
+            return self._read_input(size)
+        while not self._decompressor.eof:
+            if not self._pending:
+                if not self._remaining_input:
+                    break
+                self._pending = self._read_input(INPUT_CHUNK_SIZE)
+            # max_length limita a saída; o que sobrar da entrada fica em unconsumed_tail
+            data = self._decompressor.decompress(self._pending, size)
+            self._pending = self._decompressor.unconsumed_tail
+            if data:
+                return data
+        return b""
+
+    def read(self, size=-1):
+        """
+        Lê até 'size' bytes descompactados (o restante do membro se size < 0).
+
+        Raises:
+            zipfile.BadZipFile: Se o membro estiver truncado ou com CRC inválido
+        """
+        remaining = self.info.file_size - self._produced
+        if size is None or size < 0:
+            size = remaining
+        size = min(size, remaining)
+        if size <= 0:
+            return b""
+        try:
+            data = self._read_raw(size)
+        except zlib.error as e:
+            raise zipfile.BadZipFile(f"Dados corrompidos em {self.info.filename}: {e}")
+        if not data:
+            raise zipfile.BadZipFile(f"Arquivo truncado: {self.info.filename}")
+        self._produced += len(data)
+        self._crc = zlib.crc32(data, self._crc)
+        if self._produced == self.info.file_size and self._crc != self.info.CRC:
+            raise zipfile.BadZipFile(f"CRC-32 inválido: {self.info.filename}")
+        return data
+
+
+class LazyZip:
+    """
+    ZIP somente leitura que não mantém o diretório central na memória.
+    """
+
+    def __init__(self, path, mode='r'):
+        """
+        Args:
+            path (str): Caminho do ZIP
+            mode (str): Apenas 'r' (compatível com zipfile.ZipFile)
+        """
+        if mode != 'r':
+            raise ValueError("LazyZip é somente leitura")
+        self.path = path
+        with open(path, 'rb') as f:
+            self._cd_offset, self._count = read_end_record(f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def infolist(self):
+        """Membros do ZIP, percorridos sob demanda a cada iteração."""
+        return CentralDirectory(self.path, self._cd_offset, self._count)
+
+    def open(self, info):
+        """
+        Abre um membro para leitura em blocos.
+
+        Args:
+            info (zipfile.ZipInfo): Membro obtido de infolist()
+
+        Returns:
+            MemberReader: Leitor do membro (usar com 'with')
+        """
+        return MemberReader(self.path, info)
+
+    def close(self):
+        """Nada a liberar: cada leitura abre e fecha o próprio arquivo."""
@@ -0,0 +1,213 @@
+"""
+Modo de Pouca Memória
+=====================
+
+A versão Lightweight existe para PCs fracos, mas o instalador em si usava
+memória e disco de sobra: um diretório central do ZIP por thread de extração,
+8 conexões com buffers de até 4MB, download e extração simultâneos. Em
+máquinas com 4GB de RAM (com o Windows e o navegador abertos) isso faz o
+sistema paginar durante a instalação.
+
+No modo de pouca memória (ativado sozinho em máquinas com até
+LOW_MEMORY_RAM de RAM, ou com --low-memory; --no-low-memory desativa) o
+InstallEngine:
+
+- Lê o ZIP com lazy_zip.LazyZip (diretório central percorrido sob demanda,
+  descompactação em blocos limitados)
+- Usa LOW_MEMORY_WORKERS threads/conexões e limita os lotes em andamento
+- Baixa e depois extrai (sem o pipeline, que mantém todos os membros pendentes)
+- Confere antes de começar se há espaço livre para o ZIP e os arquivos
+  extraídos, recusando a instalação em vez de encher o disco no meio
+- Registra no trace o pico de memória (RSS) e o pico de disco temporário
+"""
+
+import os
+import shutil
+import sys
+import threading
+
+LOW_MEMORY_RAM = 4 * 1024 * 1024 * 1024   # Até isso de RAM o modo é ativado sozinho
+LOW_MEMORY_WORKERS = 2                    # Threads de extração e conexões de download
+DISK_MARGIN = 1.1                         # Folga sobre o espaço calculado
+ESTIMATED_EXPANSION = 1.15                # Extraído/comprimido quando o ZIP ainda não foi lido
+MONITOR_INTERVAL = 0.25                   # Intervalo de amostragem do disco (segundos)
+
+
+def total_memory_bytes():
+    """
+    Memória física total da máquina.
+
+    Returns:
+        int: Bytes de RAM, ou None se não for possível descobrir
+    """
+    if os.name == "nt":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong)] + [
+                (name, ctypes.c_ulonglong) for name in (
+                    "ullTotalPhys", "ullAvailPhys", "ullTotalPageFile", "ullAvailPageFile",
+                    "ullTotalVirtual", "ullAvailVirtual", "ullAvailExtendedVirtual")]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys
+        return None
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def is_low_memory_machine():
+    """Verifica se a máquina tem pouca RAM (o modo é ativado sozinho)."""
+    total = total_memory_bytes()
+    return total is not None and total <= LOW_MEMORY_RAM
+
+
+def low_memory_notice():
+    """Mensagem de status quando o modo é ativado sozinho (com a RAM detectada)."""
+    total = total_memory_bytes() or 0
+    return f"Pouca RAM detectada ({total / (1024 ** 3):.1f} GB): usando o modo de pouca memória"
+
+
+def peak_rss_bytes():
+    """
+    Pico de memória residente do processo atual.
+
+    Returns:
+        int: Bytes, ou None se não for possível descobrir
+    """
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                    "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def existing_parent(path):
+    """Primeira pasta existente no caminho (o destino pode ainda não existir)."""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def volume_id(path):
+    """Identifica o volume de um caminho (mesmo volume = mesmo espaço livre)."""
+    return os.stat(existing_parent(path)).st_dev
+
+
+def check_free_space(requirements):
+    """
+    Confere se cada volume tem espaço para o que será escrito nele.
+
+    Args:
+        requirements (list): Pares (caminho, bytes a escrever nesse caminho)
+
+    Returns:
+        dict: Volume -> {'path', 'required', 'free'} em bytes
+
+    Raises:
+        IOError: Se algum volume não tiver o espaço necessário (com folga)
+    """
+    volumes = {}
+    for path, size in requirements:
+        if size <= 0:
+            continue
+        volume = volumes.setdefault(volume_id(path), {"path": existing_parent(path), "required": 0})
+        volume["required"] += size
+    for volume in volumes.values():
+        volume["required"] = int(volume["required"] * DISK_MARGIN)
+        volume["free"] = shutil.disk_usage(volume["path"]).free
+        if volume["free"] < volume["required"]:
+            raise IOError(f"Espaço em disco insuficiente em {volume['path']}: "
+                          f"{volume['free'] / (1024 * 1024):.0f} MB livres, "
+                          f"{volume['required'] / (1024 * 1024):.0f} MB necessários")
+    return volumes
+
+
+class ResourceMonitor:
+    """
+    Acompanha, em uma thread, o espaço usado nos volumes da instalação.
+
+    O pico de disco temporário é o quanto o uso chegou acima do uso final
+    (downloads parciais, arquivos temporários, pasta de preparação).
+    """
+
+    def __init__(self, paths, interval=MONITOR_INTERVAL):
+        """
+        Args:
+            paths (list): Pastas cujos volumes são acompanhados (destino, cache)
+            interval (float): Intervalo entre as amostras (segundos)
+        """
+        self.paths = {}
+        for path in paths:
+            self.paths.setdefault(volume_id(path), existing_parent(path))
+        self.interval = interval
+        self._start = self._used()
+        self._peak = dict(self._start)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+
+    def _used(self):
+        return {volume: shutil.disk_usage(path).used for volume, path in self.paths.items()}
+
+    def _sample(self):
+        for volume, used in self._used().items():
+            self._peak[volume] = max(self._peak[volume], used)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Encerra o acompanhamento.
+
+        Returns:
+            dict: peak_rss_mb, disk_peak_mb (acima do início), disk_final_mb
+                  (acima do início) e temp_disk_mb (pico - final)
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._sample()
+        final = self._used()
+        mb = 1024 * 1024
+        peak = sum(self._peak[v] - self._start[v] for v in self.paths)
+        grown = sum(final[v] - self._start[v] for v in self.paths)
+        rss = peak_rss_bytes()
+        return {
+            "peak_rss_mb": round(rss / mb, 1) if rss is not None else None,
+            "disk_peak_mb": round(peak / mb, 1),
+            "disk_final_mb": round(grown / mb, 1),
+            "temp_disk_mb": round(max(0, peak - max(grown, 0)) / mb, 1),
+        }
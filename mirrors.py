@@ -0,0 +1,328 @@
+"""
+Download a Partir de Vários Mirrors
+===================================
+
+Quando o mesmo arquivo está publicado em mais de um servidor, o download é
+dividido entre eles de acordo com a velocidade de cada um:
+
+1. Todos os mirrors são sondados em paralelo com uma faixa pequena do início
+   do arquivo, medindo latência (tempo até o cabeçalho) e vazão
+2. Os bytes que faltam são repartidos proporcionalmente à vazão medida, assim
+   como as conexões simultâneas (no mínimo uma por mirror)
+3. Durante o download a vazão de cada mirror é reavaliada a cada faixa; um
+   mirror que termina sua parte pega as faixas ainda não iniciadas do mirror
+   que mais demoraria para terminar
+4. Uma faixa que trava (nenhum byte dentro do timeout de leitura, ou vazão muito
+   abaixo da dos outros mirrors) é abortada e o restante dela é reatribuído a
+   outro mirror; depois de várias falhas o mirror é descartado
+
+O arquivo é escrito no mesmo '.part' e com o mesmo DownloadState do
+ChunkedDownloader, então retomada, hash em streaming e o pipeline de extração
+funcionam igual.
+"""
+
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import urllib3
+
+from downloader import DEFAULT_WORKERS, IDENTITY_HEADERS, MIN_RANGE_SIZE, ChunkedDownloader
+from http_session import get_session
+
+PROBE_BYTES = 256 * 1024              # Faixa baixada de cada mirror para medir a vazão
+STALL_SECONDS = 10                    # Sem nenhum byte por esse tempo: faixa travada
+STALL_RATIO = 0.1                     # Vazão abaixo de 10% do melhor mirror: faixa travada
+MAX_MIRROR_FAILURES = 3               # Falhas até o mirror ser descartado
+MIRROR_TIMEOUT = (5, STALL_SECONDS)   # (conexão, leitura) em segundos
+THROUGHPUT_WEIGHT = 0.5               # Peso da medição mais recente na média móvel
+
+
+class MirrorStalled(IOError):
+    """A faixa está chegando lenta demais em comparação com os outros mirrors."""
+
+
+class Mirror:
+    """
+    Medições e fila de faixas de um mirror.
+    """
+
+    def __init__(self, url):
+        """
+        Args:
+            url (str): URL do arquivo neste mirror
+        """
+        self.url = url
+        self.info = None          # Tamanho e validadores informados por este servidor
+        self.latency = None       # Segundos até o cabeçalho da resposta
+        self.throughput = 0.0     # Bytes por segundo (média móvel)
+        self.failures = 0
+        self.healthy = True
+        self.queue = collections.deque()  # Faixas (início, fim) atribuídas
+
+    def record(self, size, seconds):
+        """Atualiza a vazão com uma faixa concluída."""
+        measured = size / max(seconds, 1e-3)
+        if self.throughput:
+            measured = THROUGHPUT_WEIGHT * measured + (1 - THROUGHPUT_WEIGHT) * self.throughput
+        self.throughput = measured
+
+    def remaining_seconds(self):
+        """Tempo estimado para baixar as faixas ainda na fila."""
+        pending = sum(end - start for start, end in self.queue)
+        return pending / max(self.throughput, 1.0)
+
+
+def probe_mirror(mirror):
+    """
+    Mede latência e vazão de um mirror baixando os primeiros PROBE_BYTES.
+
+    Mirrors que falham ou não aceitam faixas são marcados como indisponíveis.
+
+    Args:
+        mirror (Mirror): Mirror a sondar (atualizado no lugar)
+    """
+    headers = dict(IDENTITY_HEADERS, Range=f"bytes=0-{PROBE_BYTES - 1}")
+    started = time.perf_counter()
+    try:
+        # Sem repetições: um mirror fora do ar não deve atrasar o início do download.
+        # stream=True: get() retorna assim que o cabeçalho chega
+        with get_session(max_retries=0).get(mirror.url, headers=headers, stream=True, timeout=MIRROR_TIMEOUT) as response:
+            response.raise_for_status()
+            mirror.latency = time.perf_counter() - started
+            total = response.headers.get('content-range', '').rsplit('/', 1)[-1]
+            if response.status_code != 206 or not total.isdigit():
+                print(f"Mirror sem suporte a faixas, ignorado: {mirror.url}")
+                mirror.healthy = False
+                return
+
+            received = sum(len(block) for block in response.iter_content(64 * 1024))
+            # Inclui a latência: reflete o custo real de cada nova faixa pedida
+            mirror.throughput = received / max(time.perf_counter() - started, 1e-3)
+            mirror.info = ChunkedDownloader._remote_info(response, int(total))
+            mirror.info["accepts_ranges"] = True
+    except requests.RequestException as e:
+        print(f"Mirror indisponível: {mirror.url} ({e})")
+        mirror.healthy = False
+
+
+class MirrorDownloader(ChunkedDownloader):
+    """
+    ChunkedDownloader que distribui as faixas entre vários mirrors.
+    """
+
+    def __init__(self, mirrors, workers=DEFAULT_WORKERS, min_range_size=MIN_RANGE_SIZE, preallocate=True):
+        """
+        Args:
+            mirrors (list): URLs do mesmo arquivo em servidores diferentes
+            workers (int): Total de conexões simultâneas (somando todos os mirrors)
+            min_range_size (int): Tamanho das faixas distribuídas entre os mirrors
+            preallocate (bool): Ver ChunkedDownloader
+        """
+        super().__init__(workers, min_range_size, preallocate)
+        self.mirrors = [Mirror(url) for url in dict.fromkeys(mirrors)]
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._last_error = None
+
+    # ==========================================
+    # SONDAGEM
+    # ==========================================
+
+    def probe(self, url):
+        """
+        Sonda todos os mirrors e retorna as informações do arquivo.
+
+        Se nenhum mirror aceitar faixas, recai no probe normal da URL principal
+        (e portanto no download em stream único).
+        """
+        with ThreadPoolExecutor(max_workers=len(self.mirrors)) as pool:
+            list(pool.map(probe_mirror, self.mirrors))
+
+        ranged = [m for m in self.mirrors if m.healthy]
+        if not ranged:
+            return super().probe(url)
+
+        # Mirrors com tamanho diferente da maioria estão servindo outro arquivo
+        size = collections.Counter(m.info["size"] for m in ranged).most_common(1)[0][0]
+        for mirror in ranged:
+            if mirror.info["size"] != size:
+                print(f"Mirror com tamanho divergente, ignorado: {mirror.url}")
+                mirror.healthy = False
+
+        for mirror in self.mirrors:
+            if mirror.healthy:
+                print(f"Mirror {mirror.url}: latência {mirror.latency * 1000:.0f} ms, "
+                      f"{mirror.throughput / (1024 * 1024):.1f} MB/s")
+
+        # Validadores da URL principal (usados pelo cache) quando ela respondeu
+        primary = next((m for m in self.mirrors if m.url == url and m.healthy), None)
+        primary = primary or max(self.healthy_mirrors(), key=lambda m: m.throughput)
+        return dict(primary.info)
+
+    def healthy_mirrors(self):
+        """Retorna os mirrors ainda em uso."""
+        return [m for m in self.mirrors if m.healthy]
+
+    # ==========================================
+    # DISTRIBUIÇÃO DAS FAIXAS
+    # ==========================================
+
+    def assign(self, gaps, mirrors):
+        """
+        Reparte as faixas pendentes entre os mirrors na proporção da vazão.
+
+        O mirror mais rápido recebe o início do arquivo (útil para o pipeline de
+        extração e para o hash em streaming) e cada parte é dividida em faixas
+        de min_range_size, que é a unidade reatribuída entre mirrors.
+
+        Args:
+            gaps (list): Faixas semiabertas (início, fim) que faltam baixar
+            mirrors (list): Mirrors disponíveis
+        """
+        mirrors = sorted(mirrors, key=lambda m: m.throughput, reverse=True)
+        total = sum(end - start for start, end in gaps)
+        speed = sum(max(m.throughput, 1.0) for m in mirrors)
+        pending = collections.deque(gaps)
+
+        for index, mirror in enumerate(mirrors):
+            mirror.queue.clear()
+            last = index == len(mirrors) - 1
+            quota = total if last else round(total * max(mirror.throughput, 1.0) / speed)
+            while quota > 0 and pending:
+                start, end = pending.popleft()
+                cut = min(end, start + quota)
+                for piece in range(start, cut, self.min_range_size):
+                    mirror.queue.append((piece, min(piece + self.min_range_size, cut)))
+                quota -= cut - start
+                if cut < end:
+                    pending.appendleft((cut, end))
+
+    def allocate_connections(self, mirrors):
+        """
+        Distribui as conexões entre os mirrors na proporção da vazão.
+
+        Returns:
+            dict: Mirror -> número de conexões (no mínimo 1 por mirror com faixas)
+        """
+        speed = sum(max(m.throughput, 1.0) for m in mirrors)
+        return {
+            mirror: min(len(mirror.queue), max(1, round(self.workers * max(mirror.throughput, 1.0) / speed)))
+            for mirror in mirrors if mirror.queue
+        }
+
+    # ==========================================
+    # DOWNLOAD
+    # ==========================================
+
+    def fetch_ranges(self, url, state, gaps, progress_callback=None):
+        """
+        Baixa as faixas informadas usando todos os mirrors disponíveis.
+
+        Raises:
+            IOError: Se todos os mirrors falharem antes de completar as faixas
+        """
+        if not gaps:
+            return
+        mirrors = self.healthy_mirrors()
+        if not mirrors:
+            raise IOError("Nenhum mirror disponível para o download")
+
+        self.assign(gaps, mirrors)
+        connections = self.allocate_connections(mirrors)
+        self._inflight = 0
+        with ThreadPoolExecutor(max_workers=sum(connections.values())) as pool:
+            futures = [
+                pool.submit(self._mirror_worker, mirror, state, progress_callback)
+                for mirror, count in connections.items() for _ in range(count)
+            ]
+            for future in futures:
+                future.result()
+
+        for start, end in gaps:
+            if state.missing(end, start):
+                raise IOError(f"Todos os mirrors falharam; último erro: {self._last_error}")
+
+    def _mirror_worker(self, mirror, state, progress_callback):
+        """Baixa faixas para um mirror até não restar trabalho para ele."""
+        while True:
+            piece = self._next_piece(mirror)
+            if piece is None:
+                return
+            start, end = piece
+            try:
+                self._fetch_piece(mirror, state, start, end, progress_callback)
+            # IOError inclui as exceções do requests e MirrorStalled; o readinto da
+            # resposta crua lança as do urllib3 (timeout de leitura, conexão caída)
+            except (IOError, urllib3.exceptions.HTTPError) as e:
+                self._piece_failed(mirror, state, start, end, e)
+            finally:
+                with self._cond:
+                    self._inflight -= 1
+                    self._cond.notify_all()
+
+    def _next_piece(self, mirror):
+        """
+        Retorna a próxima faixa do mirror ou, se a fila dele acabou, uma faixa
+        ainda não iniciada do mirror que mais demoraria para terminar.
+
+        Returns:
+            tuple: Faixa (início, fim), ou None quando não há mais trabalho
+        """
+        with self._cond:
+            while mirror.healthy:
+                if mirror.queue:
+                    piece = mirror.queue.popleft()
+                else:
+                    others = [m for m in self.mirrors if m.queue]
+                    if not others:
+                        if self._inflight == 0:
+                            return None
+                        # Uma faixa em andamento ainda pode falhar e voltar para a fila
+                        self._cond.wait()
+                        continue
+                    victim = max(others, key=lambda m: m.remaining_seconds() if m.healthy else float('inf'))
+                    piece = victim.queue.pop()  # Pega do fim: o dono segue pelo começo
+                self._inflight += 1
+                return piece
+            return None
+
+    def _fetch_piece(self, mirror, state, start, end, progress_callback):
+        """Baixa uma faixa de um mirror, abortando-a se ficar lenta demais."""
+        started = time.perf_counter()
+        received = 0
+        others = [m.throughput for m in self.mirrors if m.healthy and m is not mirror]
+        floor = STALL_RATIO * max(others) if others else 0
+
+        def watch(size):
+            nonlocal received
+            received += size
+            elapsed = time.perf_counter() - started
+            if floor and elapsed >= STALL_SECONDS and received / elapsed < floor:
+                raise MirrorStalled(f"{mirror.url} a {received / elapsed / 1024:.0f} KB/s")
+
+        self._download_range(mirror.url, state.part_path, start, end, state.info["size"], state,
+                             progress_callback, info=mirror.info, chunk_hook=watch, timeout=MIRROR_TIMEOUT)
+        with self._cond:
+            mirror.record(end - start, time.perf_counter() - started)
+
+    def _piece_failed(self, mirror, state, start, end, error):
+        """Reatribui o que faltou da faixa a outro mirror e penaliza o que falhou."""
+        print(f"Falha no mirror {mirror.url}: {error}")
+        with self._cond:
+            self._last_error = error
+            mirror.failures += 1
+            if mirror.failures >= MAX_MIRROR_FAILURES or isinstance(error, MirrorStalled):
+                mirror.healthy = False
+                print(f"Mirror descartado: {mirror.url}")
+
+            healthy = self.healthy_mirrors()
+            if healthy:
+                # O restante vai para o mirror mais rápido, de preferência outro
+                candidates = [m for m in healthy if m is not mirror] or healthy
+                target = max(candidates, key=lambda m: m.throughput)
+                for gap in reversed(state.missing(end, start)):
+                    target.queue.appendleft(gap)
+            self._cond.notify_all()
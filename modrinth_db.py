@@ -0,0 +1,166 @@
+"""
+Banco de Dados do Modrinth App (app.db)
+=======================================
+
+O Modrinth App guarda os perfis (instâncias) em uma tabela 'profiles' do
+SQLite, e o banco pode estar aberto pelo próprio App durante a instalação.
+Este módulo grava os perfis de forma segura e rápida:
+
+- Modo WAL: leitores (o App) não bloqueiam a escrita do instalador
+- busy timeout + novas tentativas: espera o App liberar o banco em vez de
+  falhar com 'database is locked'
+- Uma única transação curta 'BEGIN IMMEDIATE' com um upsert
+  ('INSERT ... ON CONFLICT(path) DO UPDATE') por perfil, em vez de SELECT
+  seguido de UPDATE ou INSERT; a instalação em lote grava todos os perfis
+  na mesma transação
+- As colunas da tabela são lidas com 'PRAGMA table_info' e guardadas em cache
+  (invalidado pelo 'PRAGMA schema_version'): campos que não existem mais são
+  ignorados e colunas novas obrigatórias recebem um valor neutro, então uma
+  atualização do App que mude o esquema não quebra o instalador
+"""
+
+import sqlite3
+import threading
+import time
+
+BUSY_TIMEOUT = 5.0      # Espera do SQLite por um banco travado (segundos)
+LOCK_RETRIES = 5        # Novas tentativas se o banco continuar travado
+RETRY_DELAY = 0.5       # Espera entre as tentativas (multiplicada a cada tentativa)
+
+PROFILES_TABLE = "profiles"
+
+# Valor usado em colunas obrigatórias (NOT NULL sem padrão) que o instalador não
+# conhece, pelas regras de afinidade de tipo do SQLite (as demais são NUMERIC: 0)
+NEUTRAL_VALUES = {"INT": 0, "CHAR": "", "CLOB": "", "TEXT": "", "BLOB": b"",
+                  "REAL": 0.0, "FLOA": 0.0, "DOUB": 0.0}
+
+_schema_cache = {}      # (banco, tabela) -> (schema_version, colunas)
+_schema_lock = threading.Lock()
+
+
+def is_lock_error(error):
+    """Verifica se o erro do SQLite é de banco travado por outro processo."""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class ModrinthDatabase:
+    """
+    Acesso à tabela de perfis do app.db do Modrinth App.
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path (str): Caminho do app.db
+        """
+        self.db_path = db_path
+
+    def connect(self):
+        """
+        Abre o banco com busy timeout e modo WAL.
+
+        Returns:
+            sqlite3.Connection: Conexão em modo autocommit (transações explícitas)
+        """
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+        if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+            try:
+                conn.execute("PRAGMA journal_mode = WAL")
+            except sqlite3.OperationalError as e:
+                # A troca exige o banco livre; sem ela a gravação continua funcionando
+                print(f"Não foi possível ativar o modo WAL no banco do Modrinth: {e}")
+        return conn
+
+    def columns(self, conn, table=PROFILES_TABLE):
+        """
+        Retorna as colunas da tabela (em cache enquanto o esquema não mudar).
+
+        Returns:
+            dict: Nome -> (tipo declarado, NOT NULL sem valor padrão)
+        """
+        key = (self.db_path, table)
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        with _schema_lock:
+            cached = _schema_cache.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+        columns = {}
+        for _, name, declared_type, notnull, default, pk in conn.execute(f"PRAGMA table_info({table})"):
+            columns[name] = ((declared_type or "").upper(), bool(notnull) and default is None and not pk)
+        if not columns:
+            raise sqlite3.OperationalError(f"Tabela '{table}' não encontrada no banco do Modrinth")
+        with _schema_lock:
+            _schema_cache[key] = (version, columns)
+        return columns
+
+    def _row(self, profile, columns):
+        """Adapta os valores de um perfil às colunas existentes na tabela."""
+        row = {name: value for name, value in profile.items() if name in columns}
+        for name, (declared_type, required) in columns.items():
+            if required and name not in row:
+                row[name] = next((value for type_name, value in NEUTRAL_VALUES.items()
+                                  if type_name in declared_type), 0)
+        return row
+
+    def upsert_profiles(self, profiles, update_fields=("modified",)):
+        """
+        Cria os perfis ou, se já existirem, atualiza apenas update_fields.
+
+        Todos os perfis são gravados em uma única transação; se o banco estiver
+        travado pelo App, espera e tenta de novo.
+
+        Args:
+            profiles (list): Dicionários coluna -> valor (precisam ter 'path')
+            update_fields (tuple): Colunas atualizadas em perfis já existentes
+
+        Returns:
+            int: Quantidade de perfis gravados
+
+        Raises:
+            sqlite3.Error: Se o banco continuar travado após as tentativas
+        """
+        if not profiles:
+            return 0
+        delay = RETRY_DELAY
+        for attempt in range(LOCK_RETRIES + 1):
+            conn = None
+            try:
+                conn = self.connect()
+                # IMMEDIATE reserva a escrita já no início: um conflito com o App
+                # aparece aqui (e é esperado) em vez de no meio da transação
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    columns = self.columns(conn)
+                    ignored = sorted({name for profile in profiles for name in profile} - set(columns))
+                    if ignored:
+                        print(f"Colunas ausentes no banco do Modrinth (ignoradas): {', '.join(ignored)}")
+                    for profile in profiles:
+                        self._upsert(conn, self._row(profile, columns), update_fields)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+                return len(profiles)
+            except sqlite3.OperationalError as e:
+                if attempt == LOCK_RETRIES or not is_lock_error(e):
+                    raise
+                print(f"Banco do Modrinth em uso; tentando novamente em {delay:.1f}s")
+            finally:
+                if conn is not None:
+                    conn.close()
+            time.sleep(delay)
+            delay *= 2
+
+    @staticmethod
+    def _upsert(conn, row, update_fields):
+        names = list(row)
+        updates = [name for name in update_fields if name in row] or ["path"]
+        conn.execute(
+            f"INSERT INTO {PROFILES_TABLE} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT(path) DO UPDATE SET {', '.join(f'{name} = excluded.{name}' for name in updates)}",
+            [row[name] for name in names]
+        )
@@ -0,0 +1,189 @@
+"""
+Instalação em Pipeline (Download + Extração Simultâneos)
+========================================================
+
+Na instalação limpa, em vez de esperar o ZIP inteiro chegar ao disco para só
+então extraí-lo, o download e a extração acontecem ao mesmo tempo:
+
+1. O final do arquivo (EOCD + diretório central) é baixado primeiro via Range
+2. Com o diretório central em mãos, cada membro tem seu trecho de bytes conhecido
+   (do seu cabeçalho local até o cabeçalho do membro seguinte)
+3. O restante do arquivo é baixado em faixas paralelas; sempre que uma faixa é
+   concluída, os membros totalmente cobertos são enviados às threads de extração
+
+O tempo total passa a ser próximo de max(download, extração), e não a soma.
+Servidores sem suporte a Range continuam usando o fluxo sequencial.
+"""
+
+import bisect
+import struct
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from archive_cache import verify_checksum
+from downloader import ChunkedDownloader
+from extractor import BATCH_MAX_FILES, ParallelExtractor
+
+# O EOCD tem 22 bytes + comentário de até 64KB; baixa um pouco mais para já
+# trazer o diretório central junto na maioria dos casos
+TAIL_FETCH_SIZE = 1024 * 1024
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+
+
+def find_central_directory(tail, tail_start):
+    """
+    Localiza o diretório central a partir do final do arquivo.
+
+    Args:
+        tail (bytes): Últimos bytes do arquivo
+        tail_start (int): Offset absoluto de tail[0]
+
+    Returns:
+        int: Offset absoluto onde começam as estruturas finais do ZIP
+             (diretório central e, se houver, registros ZIP64)
+    """
+    eocd_pos = tail.rfind(EOCD_SIGNATURE)
+    if eocd_pos < 0 or len(tail) - eocd_pos < EOCD_STRUCT.size:
+        raise zipfile.BadZipFile("Fim do diretório central não encontrado")
+    cd_offset = EOCD_STRUCT.unpack_from(tail, eocd_pos)[6]
+
+    # ZIP64: o offset real está no registro apontado pelo localizador
+    locator_pos = eocd_pos - ZIP64_LOCATOR_STRUCT.size
+    if locator_pos >= 0 and tail[locator_pos:locator_pos + 4] == ZIP64_LOCATOR_SIGNATURE:
+        zip64_eocd_offset = ZIP64_LOCATOR_STRUCT.unpack_from(tail, locator_pos)[2]
+        relative = zip64_eocd_offset - tail_start
+        if 0 <= relative <= len(tail) - ZIP64_EOCD_STRUCT.size:
+            cd_offset = ZIP64_EOCD_STRUCT.unpack_from(tail, relative)[9]
+        return min(cd_offset, zip64_eocd_offset)
+
+    return cd_offset
+
+
+class PipelinedInstall:
+    """
+    Baixa o ZIP e extrai seus membros à medida que os bytes chegam.
+    """
+
+    def __init__(self, downloader=None, extractor=None):
+        """
+        Args:
+            downloader (ChunkedDownloader): Motor de download em faixas
+            extractor (ParallelExtractor): Motor de extração
+        """
+        self.downloader = downloader or ChunkedDownloader()
+        self.extractor = extractor or ParallelExtractor()
+        self._dispatch_lock = threading.Lock()
+        self._pending = []
+        self._futures = []
+        self.files_extracted = 0  # Arquivos extraídos pela última execução de run()
+
+    def run(self, url, cache, target_dir, download_callback=None, extract_callback=None,
+            expected_sha256=None):
+        """
+        Executa o download e a extração em pipeline.
+
+        Args:
+            url (str): URL do ZIP
+            cache (ArchiveCache): Cache onde o ZIP completo é guardado ao final
+            target_dir (str): Diretório de instalação
+            download_callback (callable): Função chamada com (bytes baixados, total)
+            extract_callback (callable): Função chamada com (extraídos, total, nome)
+            expected_sha256 (str): Checksum publicado que o ZIP deve ter
+
+        Returns:
+            str: Caminho do ZIP no cache, ou None se o servidor não aceita faixas
+                 (nada foi extraído e o chamador deve usar o fluxo sequencial)
+
+        Raises:
+            IOError: Se o ZIP completo não corresponder ao checksum (como a
+                     extração já aconteceu, o chamador deve descartar o destino)
+        """
+        incoming_path = cache.incoming_path(url)
+        state = self.downloader.prepare(url, incoming_path)
+        if state is None:
+            return None
+
+        total_size = state.info["size"]
+
+        # 1. Diretório central primeiro
+        tail_start = max(0, total_size - TAIL_FETCH_SIZE)
+        self.downloader.fetch_ranges(url, state, state.missing(total_size, tail_start), download_callback)
+        with open(state.part_path, 'rb') as f:
+            f.seek(tail_start)
+            central_start = find_central_directory(f.read(), tail_start)
+        if central_start < tail_start:
+            self.downloader.fetch_ranges(url, state, state.missing(tail_start, central_start),
+                                         download_callback)
+
+        with zipfile.ZipFile(state.part_path, 'r') as zip_ref:
+            infos = zip_ref.infolist()
+
+        # 2. Trecho de bytes de cada membro: do seu cabeçalho até o próximo
+        files = self.extractor.prepare(infos, target_dir)
+        offsets = sorted({info.header_offset for info in infos} | {central_start})
+        self._pending = sorted(
+            ((info.header_offset, offsets[bisect.bisect_right(offsets, info.header_offset)], info, dest)
+             for info, dest in files),
+            key=lambda item: item[0]
+        )
+        self._futures = []
+        total_files = len(files)
+        self.files_extracted = 0
+
+        # 3. Baixa o restante e extrai os membros à medida que ficam completos
+        store = self.extractor.store
+        if store is not None:
+            store.defer_refs()  # As origens só valem com o ZIP já no cache
+        try:
+            with ThreadPoolExecutor(max_workers=self.extractor.workers) as pool:
+                state.on_change = lambda: self._dispatch(pool, state, total_files, extract_callback)
+                try:
+                    self._dispatch(pool, state, total_files, extract_callback)  # Já baixados (retomada)
+                    self.downloader.fetch_ranges(url, state, state.missing(total_size), download_callback)
+                    self._dispatch(pool, state, total_files, extract_callback)
+                    for future in list(self._futures):
+                        future.result()
+                finally:
+                    state.on_change = None
+                    pool.shutdown(wait=True)
+                    # Os handles precisam estar fechados antes de renomear o arquivo
+                    self.extractor.close()
+
+            if self._pending:
+                raise IOError(f"{len(self._pending)} arquivo(s) não puderam ser extraídos")
+            self.files_extracted = total_files
+
+            self.downloader.finish(state, incoming_path)
+            verify_checksum(incoming_path, self.downloader.sha256, expected_sha256)
+            path = cache.add(url, incoming_path, self.downloader.remote_info, sha256=self.downloader.sha256)
+        except BaseException:
+            if store is not None:
+                store.discard_refs()
+            raise
+        if store is not None:
+            store.commit_refs(path)
+        return path
+
+    def _dispatch(self, pool, state, total_files, extract_callback):
+        """Envia para extração os membros cujos bytes já foram todos baixados."""
+        with self._dispatch_lock:
+            ready = []
+            remaining = []
+            for item in self._pending:
+                start, end, info, dest = item
+                if state.covers(start, end):
+                    ready.append((info, dest))
+                else:
+                    remaining.append(item)
+            self._pending = remaining
+
+            for index in range(0, len(ready), BATCH_MAX_FILES):
+                batch = ready[index:index + BATCH_MAX_FILES]
+                self._futures.append(pool.submit(self.extractor.extract_batch, state.part_path,
+                                                 batch, total_files, extract_callback))
@@ -0,0 +1,337 @@
+"""
+Fechamento de Processos Conflitantes
+====================================
+
+Launchers e o Minecraft abertos travam arquivos da instância durante a
+instalação. Este módulo:
+
+- Lista os processos do sistema uma única vez e filtra pelos nomes alvo
+- Encerra todos os encontrados de uma vez (sem esperar um para matar o próximo)
+- Espera pela saída real de cada processo (handle no Windows, pidfd no Linux),
+  com timeout, em vez de dormir um tempo fixo; se nada estava aberto, não espera
+
+Implementações:
+- WindowsProcessManager: Toolhelp32 + TerminateProcess via ctypes
+- LinuxProcessManager: /proc + kill, com espera por pidfd (ou varredura do /proc)
+"""
+
+import os
+import re
+import select
+import signal
+import time
+
+CLOSE_TIMEOUT = 10      # Espera máxima pela saída dos processos (segundos)
+POLL_INTERVAL = 0.05    # Intervalo da varredura quando não há espera por evento
+
+
+def normalize_name(name):
+    """Nome do executável sem diretório, em minúsculas (comparação no estilo do Windows)."""
+    return re.split(r"[\\/]", name)[-1].strip().lower()
+
+
+class ProcessManager:
+    """
+    Base das implementações por sistema operacional.
+
+    As subclasses implementam list_processes, terminate e wait.
+    """
+
+    def list_processes(self):
+        """
+        Lista os processos em execução.
+
+        Returns:
+            list: Tuplas (pid, nomes), onde nomes é um conjunto de nomes normalizados
+        """
+        raise NotImplementedError
+
+    def terminate(self, pid):
+        """
+        Encerra um processo à força.
+
+        Returns:
+            object: Handle usado por wait, ou None se o processo já tinha saído
+
+        Raises:
+            OSError: Sem permissão para encerrar o processo
+        """
+        raise NotImplementedError
+
+    def wait(self, handles, timeout):
+        """
+        Espera os processos encerrados saírem.
+
+        Args:
+            handles (dict): pid -> handle retornado por terminate
+            timeout (float): Espera máxima em segundos
+
+        Returns:
+            list: PIDs que ainda estavam em execução ao fim do timeout
+        """
+        raise NotImplementedError
+
+    def find(self, names):
+        """
+        Procura processos por nome de executável (sem diferenciar maiúsculas).
+
+        Args:
+            names (list): Nomes alvo (ex: 'javaw.exe')
+
+        Returns:
+            list: Tuplas (pid, nome alvo encontrado)
+        """
+        targets = {normalize_name(name): name for name in names}
+        own_pid = os.getpid()
+        found = []
+        for pid, process_names in self.list_processes():
+            if pid == own_pid:
+                continue
+            match = next((targets[n] for n in process_names if n in targets), None)
+            if match:
+                found.append((pid, match))
+        return found
+
+    def close(self, names, timeout=CLOSE_TIMEOUT):
+        """
+        Encerra os processos com os nomes informados e espera sua saída.
+
+        Args:
+            names (list): Nomes dos executáveis alvo
+            timeout (float): Espera máxima pela saída (segundos)
+
+        Returns:
+            dict: 'found' (nomes encontrados), 'closed' (quantidade encerrada)
+                  e 'remaining' (PIDs que não saíram ou não puderam ser encerrados)
+        """
+        found = self.find(names)
+        handles = {}
+        failed = []
+        for pid, name in found:
+            try:
+                handle = self.terminate(pid)
+            except OSError as e:
+                print(f"Não foi possível fechar {name} (PID {pid}): {e}")
+                failed.append(pid)
+                continue
+            if handle is not None:
+                handles[pid] = handle
+
+        remaining = self.wait(handles, timeout) if handles else []
+        if remaining:
+            print(f"Processos ainda em execução após {timeout}s: {remaining}")
+        return {
+            "found": sorted({name for _, name in found}),
+            "closed": len(found) - len(failed) - len(remaining),
+            "remaining": failed + remaining,
+        }
+
+
+class LinuxProcessManager(ProcessManager):
+    """
+    Implementação baseada no /proc (Linux, incluindo programas rodando no Wine).
+    """
+
+    def __init__(self, proc_dir="/proc"):
+        self.proc_dir = proc_dir
+
+    def list_processes(self):
+        processes = []
+        for entry in os.listdir(self.proc_dir):
+            if not entry.isdigit():
+                continue
+            try:
+                comm, state = self._read_stat(entry)
+                if state == "Z":
+                    continue  # Zumbi: já saiu, só aguarda o processo pai
+                # 'comm' é truncado em 15 caracteres; o argv[0] traz o nome completo
+                names = {normalize_name(comm)}
+                with open(os.path.join(self.proc_dir, entry, "cmdline"), "rb") as f:
+                    argv0 = f.read().split(b"\0", 1)[0]
+                if argv0:
+                    names.add(normalize_name(argv0.decode("utf-8", "replace")))
+            except (OSError, ValueError, IndexError):
+                continue  # Processo saiu durante a listagem
+            processes.append((int(entry), names))
+        return processes
+
+    def terminate(self, pid):
+        # O pidfd é aberto antes do sinal para não confundir o PID com um processo
+        # reaproveitado; -1 indica kernel sem pidfd (espera pela varredura do /proc)
+        handle = -1
+        if hasattr(os, "pidfd_open"):
+            try:
+                handle = os.pidfd_open(pid)
+            except ProcessLookupError:
+                return None
+            except OSError:
+                pass
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass  # Já saiu; o pidfd ainda indica a saída
+        except OSError:
+            if handle >= 0:
+                os.close(handle)
+            raise
+        return handle
+
+    def wait(self, handles, timeout):
+        deadline = time.monotonic() + timeout
+        pidfds = {handle: pid for pid, handle in handles.items() if handle >= 0}
+        polled = {pid for pid, handle in handles.items() if handle < 0}
+        poller = select.poll()
+        for fd in pidfds:
+            poller.register(fd, select.POLLIN)
+        try:
+            while pidfds or polled:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if pidfds:
+                    # O pidfd fica legível quando o processo sai
+                    wait_ms = POLL_INTERVAL if polled else remaining
+                    for fd, _ in poller.poll(int(wait_ms * 1000) + 1):
+                        poller.unregister(fd)
+                        os.close(fd)
+                        del pidfds[fd]
+                else:
+                    time.sleep(min(POLL_INTERVAL, remaining))
+                polled = {pid for pid in polled if self._is_running(pid)}
+        finally:
+            for fd in pidfds:
+                os.close(fd)
+        return sorted(list(pidfds.values()) + list(polled))
+
+    def _read_stat(self, pid):
+        """
+        Lê nome (comm) e estado do processo em /proc/<pid>/stat.
+
+        Raises:
+            OSError: Se o processo não existe mais
+        """
+        with open(os.path.join(self.proc_dir, str(pid), "stat"), encoding="utf-8",
+                  errors="replace") as f:
+            data = f.read()
+        # Formato: 'pid (comm) estado ...'; o comm pode conter ')'
+        head, tail = data.rsplit(")", 1)
+        return head.split("(", 1)[1], tail.split()[0]
+
+    def _is_running(self, pid):
+        """Processo ainda existe e não é um zumbi (já saiu, aguardando o pai)."""
+        try:
+            return self._read_stat(pid)[1] != "Z"
+        except (OSError, ValueError, IndexError):
+            return False
+
+
+class WindowsProcessManager(ProcessManager):
+    """
+    Implementação com a API do Windows via ctypes (sem abrir 'taskkill' por processo).
+    """
+
+    TH32CS_SNAPPROCESS = 0x00000002
+    PROCESS_TERMINATE = 0x0001
+    SYNCHRONIZE = 0x00100000
+    WAIT_OBJECT_0 = 0
+    ERROR_INVALID_PARAMETER = 87  # OpenProcess: o PID não existe mais
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", ctypes.c_long),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", ctypes.c_wchar * 260),
+            ]
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.Process32FirstW.restype = wintypes.BOOL
+        kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.Process32NextW.restype = wintypes.BOOL
+        kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        kernel32.TerminateProcess.argtypes = [wintypes.HANDLE, wintypes.UINT]
+        kernel32.TerminateProcess.restype = wintypes.BOOL
+        kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        kernel32.WaitForSingleObject.restype = wintypes.DWORD
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.restype = wintypes.BOOL
+
+        self._ctypes = ctypes
+        self._kernel32 = kernel32
+        self._entry_class = PROCESSENTRY32W
+        self._invalid_handle = ctypes.c_void_p(-1).value
+
+    def list_processes(self):
+        ctypes = self._ctypes
+        kernel32 = self._kernel32
+        snapshot = kernel32.CreateToolhelp32Snapshot(self.TH32CS_SNAPPROCESS, 0)
+        if snapshot == self._invalid_handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+        processes = []
+        try:
+            entry = self._entry_class()
+            entry.dwSize = ctypes.sizeof(entry)
+            ok = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while ok:
+                processes.append((entry.th32ProcessID, {normalize_name(entry.szExeFile)}))
+                ok = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+        return processes
+
+    def terminate(self, pid):
+        ctypes = self._ctypes
+        kernel32 = self._kernel32
+        handle = kernel32.OpenProcess(self.PROCESS_TERMINATE | self.SYNCHRONIZE, False, pid)
+        if not handle:
+            error = ctypes.get_last_error()
+            if error == self.ERROR_INVALID_PARAMETER:
+                return None
+            raise ctypes.WinError(error)
+        if not kernel32.TerminateProcess(handle, 1):
+            error = ctypes.get_last_error()
+            # Falha também quando o processo já está saindo: a espera decide
+            if kernel32.WaitForSingleObject(handle, 0) != self.WAIT_OBJECT_0:
+                kernel32.CloseHandle(handle)
+                raise ctypes.WinError(error)
+        return handle
+
+    def wait(self, handles, timeout):
+        kernel32 = self._kernel32
+        deadline = time.monotonic() + timeout
+        remaining = []
+        for pid, handle in handles.items():
+            # O handle do processo é sinalizado quando ele termina
+            wait_ms = max(0, int((deadline - time.monotonic()) * 1000))
+            if kernel32.WaitForSingleObject(handle, wait_ms) != self.WAIT_OBJECT_0:
+                remaining.append(pid)
+            kernel32.CloseHandle(handle)
+        return remaining
+
+
+def get_process_manager():
+    """
+    Retorna a implementação para o sistema atual.
+
+    Returns:
+        ProcessManager: Gerenciador, ou None se o sistema não for suportado
+    """
+    if os.name == "nt":
+        return WindowsProcessManager()
+    if os.path.isdir("/proc/self"):
+        return LinuxProcessManager()
+    return None
@@ -0,0 +1,126 @@
+"""
+Arquivo de Perfis do Launcher (launcher_profiles.json)
+======================================================
+
+O SKLauncher (e o launcher oficial) guardam todos os perfis do usuário em um
+único JSON, que em usuários com centenas de perfis passa de vários MB. Este
+módulo atualiza o arquivo em uma única passada de leitura-alteração-escrita:
+
+- O arquivo é lido de uma vez e decodificado pelo decodificador em C do módulo
+  json; a saída é serializada inteira em memória e escrita com uma única
+  chamada, em vez de milhares de pequenas escritas do 'json.dump'
+- Vários perfis (ex: Full, Intermediate e Lightweight de uma instalação em
+  lote) são aplicados na mesma passada
+- Se nenhum perfil mudou (reinstalação da mesma versão), nada é escrito
+- A escrita vai para um arquivo temporário ao lado, que substitui o original
+  com 'os.replace': uma queda no meio nunca corrompe os perfis do usuário
+"""
+
+import json
+import os
+
+PROFILES_FILE_NAME = "launcher_profiles.json"
+
+# Campos de data do perfil: atualizados na escrita, mas ignorados para decidir
+# se o perfil mudou (senão toda reinstalação reescreveria o arquivo)
+TIMESTAMP_FIELDS = ("created", "lastUsed")
+
+
+class ProfileStore:
+    """
+    Leitura e gravação atômica do launcher_profiles.json.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Caminho do launcher_profiles.json
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Lê o arquivo de perfis.
+
+        Um arquivo ilegível é preservado como '.corrupted' antes de ser
+        substituído, para que os perfis do usuário possam ser recuperados.
+
+        Returns:
+            dict: Conteúdo do arquivo (sempre com a chave 'profiles')
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            print(f"Arquivo {PROFILES_FILE_NAME} não encontrado. Criando um novo.")
+            return {"profiles": {}}
+
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            print(f"Arquivo {PROFILES_FILE_NAME} inválido ({e}); cópia guardada em .corrupted")
+            os.replace(self.path, self.path + ".corrupted")
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        if not isinstance(data.get("profiles"), dict):
+            data["profiles"] = {}
+        return data
+
+    def save(self, data):
+        """
+        Grava o arquivo através de um temporário + 'os.replace'.
+
+        Args:
+            data (dict): Conteúdo completo do arquivo
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        payload = json.dumps(data, indent=2).encode("utf-8")
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _same_profile(current, profile):
+        """Verifica se o perfil atual já tem os valores do novo (ignorando as datas)."""
+        if not isinstance(current, dict):
+            return False
+        return all(current.get(key) == value for key, value in profile.items() if key not in TIMESTAMP_FIELDS)
+
+    def upsert(self, profiles):
+        """
+        Cria ou atualiza vários perfis em uma única passada.
+
+        Perfis já existentes mantêm a data de criação original e os campos
+        adicionados pelo launcher (ícone, argumentos da JVM...).
+
+        Args:
+            profiles (dict): ID do perfil -> perfil
+
+        Returns:
+            list: IDs dos perfis criados ou alterados (vazia se o arquivo não foi escrito)
+        """
+        data = self.load()
+        existing = data["profiles"]
+        changed = []
+        for profile_id, profile in profiles.items():
+            current = existing.get(profile_id)
+            if self._same_profile(current, profile) and os.path.exists(self.path):
+                continue
+            merged = dict(current) if isinstance(current, dict) else {}
+            merged.update(profile)
+            if isinstance(current, dict) and "created" in current:
+                merged["created"] = current["created"]
+            existing[profile_id] = merged
+            changed.append(profile_id)
+
+        if changed:
+            self.save(data)
+        return changed
@@ -0,0 +1,79 @@
+"""
+Canal de Progresso entre a Instalação e a Interface
+===================================================
+
+A instalação roda em uma thread separada e o Tkinter não pode ser chamado
+fora da thread principal. O ProgressBus resolve isso:
+
+- A thread de trabalho apenas publica o último status (texto + porcentagem),
+  uma atribuição de tupla que é atômica no CPython, sem locks no laço quente
+- A interface consulta o canal com 'after()' em uma taxa fixa (20 Hz) e
+  desenha apenas o status mais recente, descartando os intermediários
+- Ações pontuais que precisam da thread principal (mensagens de erro, tela
+  final) são enfileiradas e executadas pela própria consulta
+"""
+
+import itertools
+import queue
+
+PROGRESS_FPS = 20
+
+
+class ProgressBus:
+    """
+    Canal de progresso thread-safe com coalescência de atualizações.
+    """
+
+    def __init__(self):
+        self._status = ("", 0, 0)        # (texto, valor 0-100, sequência)
+        self._sequence = itertools.count(1)  # next() é atômico no CPython
+        self._rendered_seq = 0
+        self._calls = queue.SimpleQueue()
+        self.closed = False
+
+    def publish(self, text, value):
+        """
+        Publica o status atual (chamado pela thread de trabalho).
+
+        Args:
+            text (str): Texto descritivo do status
+            value (float): Valor da barra de progresso (0-100)
+        """
+        self._status = (text, value, next(self._sequence))
+
+    def call(self, func, *args, **kwargs):
+        """Agenda func(*args, **kwargs) para rodar na thread da interface."""
+        self._calls.put((func, args, kwargs))
+
+    def close(self):
+        """Indica que não haverá mais atualizações após as já agendadas."""
+        self._calls.put(None)
+
+    def poll(self, render):
+        """
+        Entrega o status mais recente e executa as chamadas pendentes
+        (chamado pela thread da interface).
+
+        Args:
+            render (callable): Função chamada com (texto, valor) se houve mudança
+
+        Returns:
+            bool: False quando o canal foi fechado e não é mais preciso consultar
+        """
+        text, value, seq = self._status
+        if seq != self._rendered_seq:
+            self._rendered_seq = seq
+            render(text, value)
+
+        while True:
+            try:
+                item = self._calls.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.closed = True
+                continue
+            func, args, kwargs = item
+            func(*args, **kwargs)
+
+        return not self.closed
@@ -0,0 +1,323 @@
+"""
+Instalação Transacional (Pasta Temporária + Troca por Renomeação)
+=================================================================
+
+Em vez de alterar a instância no lugar, a instalação é feita em uma pasta
+de preparação ao lado dela e só entra em uso no final, com renomeações:
+
+    .<nome>.staging   ->  nova geração sendo instalada
+    <nome>            ->  instância em uso
+    .<nome>.previous  ->  geração anterior (para desfazer na hora)
+
+A geração é apenas o conteúdo do modpack: as pastas e arquivos da raiz
+gerenciados pela atualização (delta_update.MANAGED_FOLDERS e
+MANAGED_FILE_PATTERNS) e o índice do instalador. Mundos, prints, logs e
+demais arquivos do usuário nunca passam pela preparação e ficam onde estão,
+mesmo com uma '.minecraft' inteira como destino.
+
+1. begin: a preparação recebe as entradas gerenciadas da instância como
+   hardlinks (só metadados, sem copiar dados); o índice é copiado. Sem
+   hardlinks (FAT32/exFAT), a transação é dispensada em vez de copiar tudo
+2. A instalação/atualização escreve na preparação; como cada escrita usa um
+   nome temporário + 'os.replace', os links dos arquivos alterados são
+   substituídos e a instância em uso nunca é tocada
+3. commit: cada entrada gerenciada da instância vai para a geração anterior
+   e a da preparação toma o seu lugar (uma renomeação por entrada; um diário
+   permite desfazer uma troca interrompida)
+4. abort: a preparação é descartada; a instância em uso continua intacta
+
+Uma falha no meio (ZIP corrompido, disco cheio) nunca deixa a instância pela
+metade, e 'rollback' volta para a geração anterior sem baixar nada.
+
+Se o sistema não deixar renomear alguma entrada (ex: pasta aberta no
+Explorer), o commit sincroniza as entradas da preparação sobre a instância
+arquivo por arquivo (file_sync).
+"""
+
+import json
+import os
+import shutil
+
+from delta_update import MANAGED_FOLDERS, is_managed_path
+from file_sync import sync_directory, sync_file
+from install_trace import TRACE_FILE_NAME
+from instance_index import INDEX_FILE_NAME
+
+# Arquivos do instalador que são copiados (e não ligados) para a preparação:
+# são alterados no lugar e não podem ser compartilhados com a geração anterior
+COPIED_FILES = {INDEX_FILE_NAME}
+# Arquivos do instalador que acompanham a geração, mas não são levados para a
+# preparação (um diário do SQLite só vale para o índice ao lado dele)
+SKIPPED_FILES = {INDEX_FILE_NAME + "-journal", INDEX_FILE_NAME + "-wal", INDEX_FILE_NAME + "-shm"}
+
+
+def generation_paths(target_dir):
+    """
+    Retorna os caminhos das gerações de uma instância.
+
+    Returns:
+        tuple: (preparação, anterior, descarte)
+    """
+    parent, name = os.path.split(os.path.normpath(target_dir))
+    return tuple(os.path.join(parent, f".{name}.{suffix}") for suffix in ("staging", "previous", "trash"))
+
+
+def journal_path(target_dir):
+    """Caminho do diário das renomeações de uma troca em andamento."""
+    parent, name = os.path.split(os.path.normpath(target_dir))
+    return os.path.join(parent, f".{name}.journal")
+
+
+def is_generation_entry(name):
+    """
+    Verifica se uma entrada da raiz da instância faz parte da geração.
+
+    Args:
+        name (str): Nome do arquivo ou pasta na raiz da instância
+
+    Returns:
+        bool: True para as entradas gerenciadas e o índice do instalador
+    """
+    return (name in MANAGED_FOLDERS or name in COPIED_FILES or name in SKIPPED_FILES
+            or (name != TRACE_FILE_NAME and is_managed_path(name)))
+
+
+def generation_entries(path):
+    """Entradas da geração presentes na raiz de uma pasta (vazio se ela não existe)."""
+    try:
+        return {name for name in os.listdir(path) if is_generation_entry(name)}
+    except FileNotFoundError:
+        return set()
+
+
+def remove_tree(path):
+    """Remove uma pasta inteira, se existir (ignorando arquivos travados)."""
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_entry(path):
+    """Remove um arquivo, link ou pasta da raiz da instância."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def undo_journal(target_dir):
+    """
+    Desfaz as renomeações registradas no diário (troca interrompida).
+
+    Cada renomeação é registrada antes de acontecer, então a última pode não
+    ter ocorrido: só é desfeita se o destino existe e a origem não.
+    """
+    path = journal_path(target_dir)
+    try:
+        with open(path, encoding='utf-8') as f:
+            moves = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return
+    except ValueError:
+        moves = []  # Última linha incompleta: a renomeação dela não chegou a acontecer
+    for src, dst in reversed(moves):
+        if os.path.lexists(dst) and not os.path.lexists(src):
+            os.rename(dst, src)
+    os.remove(path)
+
+
+def swap_entries(names, source_dir, target_dir, trash_dir):
+    """
+    Move as entradas da instância para o descarte e as de source_dir para a instância.
+
+    Em caso de erro, as renomeações já feitas são desfeitas.
+
+    Args:
+        names (set): Entradas da raiz a trocar
+        source_dir (str): Pasta com a geração que entra em uso
+        target_dir (str): Diretório da instância
+        trash_dir (str): Pasta que recebe a geração que sai de uso
+    """
+    # O diário vem antes do descarte: um descarte sem diário é sempre uma troca concluída
+    with open(journal_path(target_dir), 'w', encoding='utf-8') as journal:
+        try:
+            os.makedirs(trash_dir, exist_ok=True)
+            for name in sorted(names):
+                for src, dst in ((os.path.join(target_dir, name), os.path.join(trash_dir, name)),
+                                 (os.path.join(source_dir, name), os.path.join(target_dir, name))):
+                    if not os.path.lexists(src):
+                        continue
+                    journal.write(json.dumps([src, dst]) + "\n")
+                    journal.flush()
+                    os.rename(src, dst)
+        except OSError:
+            journal.close()
+            undo_journal(target_dir)
+            remove_tree(trash_dir)
+            raise
+    os.remove(journal_path(target_dir))
+
+
+def rollback(target_dir):
+    """
+    Troca a instância pela geração anterior (a atual passa a ser a anterior,
+    então chamar de novo desfaz o rollback).
+
+    Args:
+        target_dir (str): Diretório da instância
+
+    Raises:
+        FileNotFoundError: Se não houver geração anterior
+    """
+    _, previous_dir, trash_dir = generation_paths(target_dir)
+    if not os.path.isdir(previous_dir):
+        raise FileNotFoundError(f"Nenhuma geração anterior de {target_dir} para restaurar")
+    if not os.path.isdir(target_dir):
+        os.rename(previous_dir, target_dir)
+        return
+    StagedInstall(target_dir).recover()
+    swap_entries(generation_entries(previous_dir) | generation_entries(target_dir),
+                 previous_dir, target_dir, trash_dir)
+    remove_tree(previous_dir)  # Sobras que não são da geração (ex: cópia completa antiga)
+    os.rename(trash_dir, previous_dir)
+
+
+class StagedInstall:
+    """
+    Transação de instalação de uma instância.
+    """
+
+    def __init__(self, target_dir):
+        """
+        Args:
+            target_dir (str): Diretório final da instância
+        """
+        self.target_dir = os.path.normpath(target_dir)
+        self.staging_dir, self.previous_dir, self.trash_dir = generation_paths(self.target_dir)
+        self.stats = {"linked": 0, "copied": 0}
+
+    def recover(self):
+        """
+        Conserta uma troca interrompida: desfaz as renomeações do diário (a
+        instância volta à geração em uso antes da troca) e completa a troca
+        da geração anterior pelo descarte.
+        """
+        if os.path.exists(journal_path(self.target_dir)):
+            print(f"Troca de pastas interrompida: restaurando {self.target_dir}")
+            undo_journal(self.target_dir)
+        elif os.path.isdir(self.trash_dir):
+            # Troca concluída, interrompida ao guardar a geração que saiu de uso
+            remove_tree(self.previous_dir)
+            os.rename(self.trash_dir, self.previous_dir)
+        remove_tree(self.trash_dir)
+
+    def begin(self):
+        """
+        Cria a pasta de preparação com as entradas gerenciadas da instância.
+
+        Returns:
+            str: Pasta onde a instalação deve ser feita, ou None se o sistema de
+                 arquivos não tiver hardlinks (instalar direto na instância)
+        """
+        self.recover()
+        remove_tree(self.staging_dir)  # Sobra de uma instalação que falhou
+        os.makedirs(self.staging_dir)
+        names = generation_entries(self.target_dir) - SKIPPED_FILES
+        if names and not self._hardlinks_supported():
+            # Sistema de arquivos sem hardlink (ex: FAT32): copiar o modpack inteiro
+            # a cada atualização custaria mais do que a transação vale
+            remove_tree(self.staging_dir)
+            return None
+        try:
+            for name in sorted(names):
+                self._link_entry(os.path.join(self.target_dir, name), os.path.join(self.staging_dir, name))
+        except BaseException:
+            remove_tree(self.staging_dir)
+            raise
+        return self.staging_dir
+
+    def _hardlinks_supported(self):
+        """Testa um hardlink da instância para a pasta de preparação."""
+        probe = os.path.join(self.target_dir, ".link-probe")
+        link = os.path.join(self.staging_dir, ".link-probe")
+        try:
+            with open(probe, 'wb'):
+                pass
+            os.link(probe, link)
+        except OSError as e:
+            self.stats["unavailable"] = str(e)
+            return False
+        finally:
+            for path in (probe, link):
+                if os.path.exists(path):
+                    os.remove(path)
+        return True
+
+    def _link_entry(self, src, dst):
+        """Replica um arquivo ou pasta da instância com hardlinks (índice copiado)."""
+        if os.path.islink(src):
+            os.symlink(os.readlink(src), dst)
+            return
+        if not os.path.isdir(src):
+            if os.path.basename(src) in COPIED_FILES and os.path.dirname(dst) == self.staging_dir:
+                shutil.copy2(src, dst)
+                self.stats["copied"] += 1
+            else:
+                os.link(src, dst)
+                self.stats["linked"] += 1
+            return
+        for root, dirs, files in os.walk(src):
+            dest_root = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+            os.makedirs(dest_root, exist_ok=True)
+            for name in files:
+                self._link_entry(os.path.join(root, name), os.path.join(dest_root, name))
+            # Links simbólicos para pastas são recriados, não percorridos
+            for name in list(dirs):
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    os.symlink(os.readlink(path), os.path.join(dest_root, name))
+                    dirs.remove(name)
+
+    def commit(self):
+        """
+        Coloca a preparação em uso e guarda as entradas substituídas como geração anterior.
+
+        Returns:
+            str: 'swap' (renomeações) ou 'sync' (alternativa arquivo por arquivo)
+        """
+        if not os.path.isdir(self.target_dir):
+            os.rename(self.staging_dir, self.target_dir)
+            return "swap"
+
+        # Tudo o que foi instalado, mais as entradas gerenciadas que a instalação removeu
+        names = set(os.listdir(self.staging_dir)) | generation_entries(self.target_dir)
+        remove_tree(self.trash_dir)
+        try:
+            swap_entries(names, self.staging_dir, self.target_dir, self.trash_dir)
+        except OSError as e:
+            # Entrada da instância travada: aplica a preparação sobre ela no lugar
+            print(f"Não foi possível trocar as pastas ({e}); sincronizando arquivo por arquivo")
+            remove_tree(self.trash_dir)
+            self._sync_entries(names)
+            remove_tree(self.staging_dir)
+            return "sync"
+        # A geração que saiu de uso (no descarte) passa a ser a anterior
+        remove_tree(self.previous_dir)
+        os.rename(self.trash_dir, self.previous_dir)
+        remove_tree(self.staging_dir)
+        return "swap"
+
+    def _sync_entries(self, names):
+        """Aplica as entradas da preparação sobre a instância, escrevendo só o que mudou."""
+        for name in sorted(names):
+            src = os.path.join(self.staging_dir, name)
+            dst = os.path.join(self.target_dir, name)
+            if os.path.isdir(src):
+                sync_directory(src, dst)
+            elif os.path.lexists(src):
+                sync_file(src, dst)
+            else:
+                remove_entry(dst)
+
+    def abort(self):
+        """Descarta a preparação; a instância em uso não foi alterada."""
+        remove_tree(self.staging_dir)